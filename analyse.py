@@ -0,0 +1,161 @@
+from loeser import Loeser, Loesung, Ergebnis
+from loesungsspeicher import LoesungsSpeicher, SPEICHER_PFAD
+from stellung import Stellung
+from spiel import Spiel, Zug
+from argparse import ArgumentParser
+from multiprocessing import Pool
+from json import dumps
+from time import perf_counter
+import csv
+import os
+import sys
+
+FELDER = ("nummer", "ergebnis", "zuege", "knoten", "sekunden", "prozess", "loesung")
+
+
+def spiel_analysieren(nummer: int, max_knoten: int = 100000, max_sekunden: float = None,
+                      umdrehen: bool = True) -> dict:
+    """
+    Löst das Spiel mit der Nummer `nummer` und gibt das Ergebnis als `dict` mit den
+    Schlüsseln aus `FELDER` zurück.
+
+    nummer - `int` die Nummer des Spiels
+    max_knoten - `int` die maximale Anzahl an Stellungen die untersucht werden
+                 Default: 100000
+    max_sekunden - `float` die maximale Dauer der Suche oder `None` für unbegrenzt
+                   Default: None
+    umdrehen - `bool` ob der Löser den Ablagestapel umdrehen darf, bei `False` bedeutet
+               `verloren` nur dass das Spiel in einem Durchgang nicht gewonnen werden kann
+               Default: True
+    """
+    loesung = Loeser(max_knoten, max_sekunden, umdrehen).loesen(Spiel(nummer))
+    return _ergebnis(nummer, loesung, os.getpid())
+
+
+def _ergebnis(nummer: int, loesung: Loesung, prozess: int) -> dict:
+    return {"nummer": nummer,
+            "ergebnis": loesung.ergebnis.value,
+            "zuege": len(loesung.zuege),
+            "knoten": loesung.knoten,
+            "sekunden": round(loesung.sekunden, 4),
+            "prozess": prozess,
+            "loesung": " ".join([str(z) for z in loesung.zuege])}
+
+
+def _loesung(ergebnis: dict) -> Loesung:
+    return Loesung(Ergebnis(ergebnis["ergebnis"]), [Zug.aus_text(z) for z in ergebnis["loesung"].split()],
+                   ergebnis["knoten"], ergebnis["sekunden"])
+
+
+def _analysieren(args: tuple) -> dict:
+    return spiel_analysieren(*args)
+
+
+class Ausgabe(object):
+    def __init__(self, datei, format: str) -> None:
+        """
+        Schreibt die Ergebnisse zeilenweise als CSV oder NDJSON.
+
+        datei - die Datei in die geschrieben wird
+        format - `str` "csv" oder "ndjson"
+        """
+        self.datei = datei
+        self.format = format
+        if format == "csv":
+            self.writer = csv.DictWriter(datei, fieldnames=FELDER)
+            self.writer.writeheader()
+        elif format != "ndjson":
+            raise ValueError(f"Unbekanntes Format {format}")
+
+    def schreiben(self, ergebnis: dict):
+        """
+        Schreibt ein Ergebnis und gibt es sofort aus.
+        """
+        if self.format == "csv":
+            self.writer.writerow(ergebnis)
+        else:
+            self.datei.write(dumps(ergebnis) + "\n")
+        self.datei.flush()
+
+
+def analysieren(von: int, bis: int, ausgabe: Ausgabe, prozesse: int = None,
+                max_knoten: int = 100000, max_sekunden: float = None,
+                umdrehen: bool = True, speicher: LoesungsSpeicher = None) -> dict[int, list]:
+    """
+    Löst die Spiele mit den Nummern `von` bis einschließlich `bis` mit `prozesse` Prozessen
+    und schreibt jedes Ergebnis sobald es vorliegt. Ergebnisse aus dem `speicher` werden
+    sofort geschrieben, neue Ergebnisse werden darin gespeichert.
+    Gibt je Prozess die Anzahl der Spiele, Knoten und Sekunden als `dict[int, list]` zurück,
+    die Ergebnisse aus dem Speicher stehen unter dem Prozess `None`.
+    """
+    statistik = {}
+    auftraege = []
+    schluessel = {}
+    loeser = Loeser(max_knoten, max_sekunden, umdrehen)
+    for n in range(von, bis+1):
+        if speicher is not None:
+            schluessel[n] = loeser.schluessel(Stellung.aus_spiel(Spiel(n)))
+            loesung = speicher.lesen(schluessel[n], max_knoten)
+            if loesung is not None:
+                ausgabe.schreiben(_ergebnis(n, loesung, None))
+                statistik.setdefault(None, [0, 0, 0.0])[0] += 1
+                continue
+        auftraege.append((n, max_knoten, max_sekunden, umdrehen))
+    if not auftraege:
+        return statistik
+    with Pool(prozesse) as pool:
+        for ergebnis in pool.imap_unordered(_analysieren, auftraege):
+            ausgabe.schreiben(ergebnis)
+            if speicher is not None:
+                speicher.schreiben(schluessel[ergebnis["nummer"]], _loesung(ergebnis))
+            s = statistik.setdefault(ergebnis["prozess"], [0, 0, 0.0])
+            s[0] += 1
+            s[1] += ergebnis["knoten"]
+            s[2] += ergebnis["sekunden"]
+    return statistik
+
+
+def main(argv: list[str] = None):
+    parser = ArgumentParser(description="Prüft welche Spiele gewonnen werden können.")
+    parser.add_argument("von", type=int, help="Nummer des ersten Spiels")
+    parser.add_argument("bis", type=int, help="Nummer des letzten Spiels")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    parser.add_argument("--ausgabe", help="Datei für die Ergebnisse, Default: stdout")
+    parser.add_argument("--prozesse", type=int, default=os.cpu_count())
+    parser.add_argument("--max-knoten", type=int, default=100000)
+    parser.add_argument("--max-sekunden", type=float)
+    parser.add_argument("--ein-durchgang", action="store_true",
+                        help="der Löser darf den Ablagestapel nicht umdrehen, verloren heißt dann "
+                             "nur in einem Durchgang nicht zu gewinnen")
+    parser.add_argument("--speicher", default=str(SPEICHER_PFAD),
+                        help="Datenbank mit bekannten Ergebnissen, Default: %(default)s")
+    parser.add_argument("--ohne-speicher", action="store_true",
+                        help="bekannte Ergebnisse weder lesen noch speichern")
+    args = parser.parse_args(argv)
+
+    datei = open(args.ausgabe, mode="w", encoding="utf-8", newline="") if args.ausgabe else sys.stdout
+    speicher = None if args.ohne_speicher else LoesungsSpeicher(args.speicher)
+    try:
+        start = perf_counter()
+        statistik = analysieren(args.von, args.bis, Ausgabe(datei, args.format), args.prozesse,
+                                args.max_knoten, args.max_sekunden, not args.ein_durchgang, speicher)
+        dauer = perf_counter() - start
+    finally:
+        if args.ausgabe:
+            datei.close()
+        if speicher is not None:
+            speicher.schliessen()
+
+    gespeichert = statistik.pop(None, [0])[0]
+    if gespeichert > 0:
+        print(f"Aus dem Speicher: {gespeichert} Spiele", file=sys.stderr)
+    for prozess, (spiele, knoten, sekunden) in sorted(statistik.items()):
+        print(f"Prozess {prozess}: {spiele} Spiele, {knoten} Knoten, "
+              f"{knoten / sekunden if sekunden > 0 else 0:.0f} Knoten/s", file=sys.stderr)
+    spiele = gespeichert + sum([s[0] for s in statistik.values()])
+    print(f"{spiele} Spiele in {dauer:.1f}s, {spiele / dauer if dauer > 0 else 0:.1f} Spiele/s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
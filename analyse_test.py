@@ -0,0 +1,51 @@
+import unittest
+import io
+import json
+import tempfile
+from pathlib import Path
+from analyse import spiel_analysieren, Ausgabe, main, FELDER
+
+
+class AnalyseTest(unittest.TestCase):
+
+    def test_spiel_analysieren(self):
+        e1 = spiel_analysieren(17, max_knoten=500)
+        e2 = spiel_analysieren(17, max_knoten=500)
+        self.assertEqual(set(FELDER), set(e1.keys()))
+        for feld in ("nummer", "ergebnis", "zuege", "knoten", "loesung"):
+            self.assertEqual(e1[feld], e2[feld])
+
+    def test_ein_durchgang(self):
+        self.assertEqual("verloren", spiel_analysieren(2, umdrehen=False)["ergebnis"])
+        self.assertEqual("gewonnen", spiel_analysieren(2, max_knoten=50000)["ergebnis"])
+
+    def test_ausgabe(self):
+        ergebnis = spiel_analysieren(1, max_knoten=50)
+        datei = io.StringIO()
+        Ausgabe(datei, "ndjson").schreiben(ergebnis)
+        self.assertEqual(ergebnis, json.loads(datei.getvalue()))
+        datei = io.StringIO()
+        Ausgabe(datei, "csv").schreiben(ergebnis)
+        zeilen = datei.getvalue().splitlines()
+        self.assertEqual(",".join(FELDER), zeilen[0])
+        self.assertEqual(2, len(zeilen))
+        self.assertRaises(ValueError, Ausgabe, datei, "xml")
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as verzeichnis:
+            pfad = Path(verzeichnis, "ergebnis.ndjson")
+            argv = ["1", "4", "--format", "ndjson", "--ausgabe", str(pfad), "--prozesse", "2",
+                    "--max-knoten", "50", "--speicher", str(Path(verzeichnis, "speicher.sqlite"))]
+            main(argv)
+            ergebnisse = [json.loads(z) for z in pfad.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual([1, 2, 3, 4], sorted([e["nummer"] for e in ergebnisse]))
+            main(argv)
+            gespeichert = [json.loads(z) for z in pfad.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([1, 2, 3, 4], [e["nummer"] for e in gespeichert])
+        self.assertEqual([None] * 4, [e["prozess"] for e in gespeichert])
+        for e in gespeichert:
+            self.assertIn(e["loesung"], [a["loesung"] for a in ergebnisse if a["nummer"] == e["nummer"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
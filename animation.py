@@ -0,0 +1,87 @@
+from ascii import AsciiScreen
+from tastatur import Tastatur
+from time import perf_counter
+from math import floor
+
+
+class Bewegung(object):
+    def __init__(self, zeilen: tuple[str], start: tuple[int, int], ziel: tuple[int, int], dauer: float) -> None:
+        """
+        Beschreibt die Bewegung einer Figur, z.B. einer Karte, in gerader Linie über den
+        Bildschirm.
+
+        zeilen - `tuple[str]` die Zeilen der Figur, z.B. aus `karten_zeilen()`
+        start - `tuple[int, int]` die Position x,y am Anfang
+        ziel - `tuple[int, int]` die Position x,y am Ende
+        dauer - `float` die Dauer der Bewegung in Sekunden
+        """
+        self.zeilen = zeilen
+        self.start = start
+        self.ziel = ziel
+        self.dauer = dauer
+
+    def position(self, zeit: float) -> tuple[int, int]:
+        """
+        Gibt die Position der Figur `zeit` Sekunden nach dem Start zurück.
+        """
+        anteil = 1.0 if self.dauer <= 0 else min(1.0, max(0.0, zeit / self.dauer))
+        return (round(self.start[0] + (self.ziel[0] - self.start[0]) * anteil),
+                round(self.start[1] + (self.ziel[1] - self.start[1]) * anteil))
+
+
+class Animator(object):
+    """
+    Spielt Bewegungen mit einer festen Bildrate im Overlay des `AsciiScreen` ab.
+
+    Die Bilder werden nach der Uhr und nicht nach einer festen Pause gezeichnet, so dass
+    eine Bewegung unabhängig von der Dauer des Zeichnens die vorgegebene Zeit dauert.
+    Zwischen zwei Bildern wird auf einen Tastendruck gewartet, jede Taste überspringt den
+    Rest der Animation. Hintergrund und Spielfeld bleiben unverändert, je Bild wird nur das
+    Overlay neu geschrieben.
+    """
+
+    def __init__(self, screen: AsciiScreen, tastatur: Tastatur = None, fps: int = 30) -> None:
+        """
+        Erstellt einen Animator.
+
+        screen - `AsciiScreen` auf dem die Bewegungen gezeichnet werden
+        tastatur - `Tastatur` mit der Tastendrücke erkannt werden oder `None` für eine neue `Tastatur`
+                   Default: None
+        fps - `int` die Anzahl der Bilder pro Sekunde
+              Default: 30
+        """
+        self.screen = screen
+        self.tastatur = tastatur if tastatur is not None else Tastatur()
+        self.fps = fps
+        self.bilder = 0
+
+    def _bild(self, bewegungen: list[Bewegung], zeit: float):
+        self.screen.clear_screen(AsciiScreen.OVERLAY)
+        for b in bewegungen:
+            x, y = b.position(zeit)
+            self.screen.write_to_screen(b.zeilen, x, y, AsciiScreen.OVERLAY)
+        self.screen.print()
+        self.bilder += 1
+
+    def abspielen(self, bewegungen: list[Bewegung]) -> bool:
+        """
+        Spielt die Bewegungen gleichzeitig ab und entfernt sie danach wieder aus dem Overlay.
+        Gibt `True` zurück wenn die Animation bis zum Ende lief und `False` wenn sie durch
+        einen Tastendruck abgebrochen wurde.
+
+        bewegungen - `list[Bewegung]` die Bewegungen
+        """
+        dauer = max([b.dauer for b in bewegungen], default=0.0)
+        start = perf_counter()
+        try:
+            with self.tastatur:
+                while True:
+                    zeit = perf_counter() - start
+                    self._bild(bewegungen, min(zeit, dauer))
+                    if zeit >= dauer:
+                        return True
+                    naechstes = min((floor(zeit * self.fps) + 1) / self.fps, dauer)
+                    if self.tastatur.warten(naechstes - (perf_counter() - start)) is not None:
+                        return False
+        finally:
+            self.screen.clear_screen(AsciiScreen.OVERLAY)
@@ -0,0 +1,55 @@
+import unittest
+import io
+from animation import Animator, Bewegung
+from ascii import AsciiScreen
+
+
+class Tasten(object):
+    """
+    Tastatur für die Tests, die beim `n`-ten Warten eine Taste liefert.
+    """
+
+    def __init__(self, n: int = None) -> None:
+        self.n = n
+        self.gewartet = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def warten(self, sekunden: float) -> str:
+        self.gewartet += 1
+        return "x" if self.gewartet == self.n else None
+
+
+class AnimationTest(unittest.TestCase):
+
+    def test_position(self):
+        b = Bewegung(("#",), (10, 20), (0, 0), 1.0)
+        self.assertEqual((10, 20), b.position(0))
+        self.assertEqual((5, 10), b.position(0.5))
+        self.assertEqual((0, 0), b.position(2.0))
+        self.assertEqual((0, 0), Bewegung(("#",), (10, 20), (0, 0), 0).position(0))
+
+    def test_abspielen(self):
+        screen = AsciiScreen(width=4, height=4, ausgabe=io.StringIO())
+        screen.write_to_screen("....", 0, 0, AsciiScreen.HINTERGRUND)
+        animator = Animator(screen, Tasten(), fps=100)
+        self.assertTrue(animator.abspielen([Bewegung(("#",), (0, 3), (3, 0), 0.05)]))
+        self.assertGreater(animator.bilder, 1)
+        self.assertIn("#", screen.ausgabe.getvalue())
+        self.assertTrue(screen.ebene_leer(AsciiScreen.OVERLAY))
+        self.assertEqual("....\n    \n    \n    \n", screen.render())
+
+    def test_abbrechen(self):
+        screen = AsciiScreen(width=4, height=4, ausgabe=io.StringIO())
+        animator = Animator(screen, Tasten(1), fps=10)
+        self.assertFalse(animator.abspielen([Bewegung(("#",), (0, 3), (3, 0), 10.0)]))
+        self.assertEqual(1, animator.bilder)
+        self.assertTrue(screen.ebene_leer(AsciiScreen.OVERLAY))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
-from cards import Karte, Farbe, KartenTyp, Stapel
+from cards import Karte, Farbe, KartenTyp, Stapel, KARTE_FARBE, KARTE_TYP, ANZAHL_KARTEN
 from time import sleep
+import sys
 
 
 class AsciiScreen(object):
@@ -7,9 +8,26 @@ class AsciiScreen(object):
     Die Klasse definiert einen zeichenbaren Bildschirm im Terminal. 
     Der Bildschirm kann dann vorbereitet werden und mittels `print()` 
     im Terminal ausgegeben werden. 
+    `print()` merkt sich das zuletzt ausgegebene Bild und schreibt nur die geänderten
+    Zeichen mit ANSI Steuerzeichen an ihre Position.
+    Der Bildschirm besteht aus den Ebenen `HINTERGRUND`, `SPIELFELD` und `OVERLAY` mit je
+    einem Zeichenpuffer pro Zeile. Eine höhere Ebene verdeckt die darunter liegenden nur
+    an den Stellen an die sie beschrieben wurde. Schreiben und Löschen markiert die Zeilen
+    nur als geändert, der Text einer Zeile wird erst bei `render()` bzw. `print()` aus den
+    Ebenen zusammengesetzt. So kann z.B. ein Overlay entfernt werden ohne die anderen Ebenen
+    neu zu zeichnen.
     """
 
-    def __init__(self, width: int = 90, height: int = 35):
+    # Ebene für unveränderliche Teile wie das Menü
+    HINTERGRUND = "hintergrund"
+    # Ebene für den Inhalt der sich mit jedem Zug ändert
+    SPIELFELD = "spielfeld"
+    # Ebene für vorübergehende Inhalte wie Dialoge, Animationen und Statustexte
+    OVERLAY = "overlay"
+    # die Ebenen von unten nach oben
+    EBENEN = (HINTERGRUND, SPIELFELD, OVERLAY)
+
+    def __init__(self, width: int = 90, height: int = 35, ausgabe=None):
         """
         Erstellt einen AsciiScreen mit der Breite `width` und der Höhe `height`
 
@@ -17,76 +35,170 @@ class AsciiScreen(object):
                   Default: 90
         height  - `int` die Höhe des Bildschirms
                   Default: 35
+        ausgabe - die Datei in die gezeichnet wird oder `None` für `sys.stdout`
+                  Default: None
         """
         self.width = width
         self.height = height
-        self.screen = [" " for t in range(0, width*height)]
-        self.buffer = ""
+        self.ausgabe = ausgabe
+        self.previous = None
+        self.ebenen = {e: [[None] * width for y in range(height)] for e in AsciiScreen.EBENEN}
+        self._belegt = {e: set() for e in AsciiScreen.EBENEN}
+        self._text = [" " * width] * height
+        self._geaendert = set()
+
+    def _zeilen(self) -> list[str]:
+        """
+        Setzt die geänderten Zeilen aus den Ebenen zusammen und gibt alle Zeilen des
+        Bildschirms zurück.
+        """
+        for y in self._geaendert:
+            zeile = [" "] * self.width
+            for e in AsciiScreen.EBENEN:
+                if y in self._belegt[e]:
+                    zeile = [z if c is None else c for c, z in zip(self.ebenen[e][y], zeile)]
+            self._text[y] = "".join(zeile)
+        self._geaendert.clear()
+        return self._text
+
+    def render(self) -> str:
+        """
+        Gibt den aktuellen Inhalt des Bildschirms als `str` zurück, jede Zeile endet mit "\\n".
+        """
+        return "\n".join(self._zeilen()) + "\n"
+
+    @property
+    def buffer(self) -> str:
+        """
+        Der Inhalt des Bildschirms als `str`, siehe `render()`.
+        """
+        return self.render()
+
+    def clear_screen(self, ebene: str = None):
+        """
+        Löscht den Inhalt der Ebene `ebene` oder aller Ebenen, so dass an diesen Stellen
+        die darunter liegenden Ebenen bzw. ' ' zu sehen sind.
 
-    def _update_buffer(self) -> str:
+        ebene - `str` die Ebene die gelöscht wird oder `None` für alle Ebenen
+                Default: None
         """
-        Beschreibt den internen Puffer mit dem aktuellen Inhalt des Bildschirms
-        Gibt den internen Puffer als `str` zurück. 
+        for e in AsciiScreen.EBENEN if ebene is None else (ebene,):
+            zeilen = self.ebenen[e]
+            for y in self._belegt[e]:
+                zeilen[y] = [None] * self.width
+            self._geaendert |= self._belegt[e]
+            self._belegt[e] = set()
+
+    def bereich_loeschen(self, x: int, y: int, breite: int, hoehe: int, ebene: str = SPIELFELD):
+        """
+        Löscht das Rechteck mit der linken oberen Ecke x,y in der Ebene `ebene`, so dass dort
+        die darunter liegenden Ebenen zu sehen sind. Was über den Rand hinaus geht wird ignoriert.
+
+             x - `int` x-Koordinate der linken oberen Ecke
+             y - `int` y-Koordinate der linken oberen Ecke
+        breite - `int` die Breite des Rechtecks
+         hoehe - `int` die Höhe des Rechtecks
+         ebene - `str` die Ebene in der gelöscht wird
+                 Default: SPIELFELD
         """
-        result = ""
-        for y in range(self.height):
-            for x in range(self.width):
-                result += self.screen[self.width*y+x]
-            result += "\n"
-        self.buffer = result
-        return result
+        zeilen = self.ebenen[ebene]
+        belegt = self._belegt[ebene]
+        ende = min(x + breite, self.width)
+        for _y in range(max(y, 0), min(y + hoehe, self.height)):
+            if _y not in belegt or ende <= x:
+                continue
+            zeilen[_y][x:ende] = [None] * (ende - x)
+            self._geaendert.add(_y)
+            if all(c is None for c in zeilen[_y]):
+                belegt.discard(_y)
 
-    def clear_screen(self):
+    def ebene_leer(self, ebene: str) -> bool:
         """
-        Löscht den Inhalt des Bildschirms in dem alle Zeichen mit ' ' ersetzt werden.
+        Gibt `True` zurück wenn seit dem letzten Löschen nicht in die Ebene `ebene`
+        geschrieben wurde ansonsten `False`.
         """
-        self.screen = [" " for t in range(0, self.width*self.height)]
+        return len(self._belegt[ebene]) == 0
 
-    def write_to_screen(self, text: str, x: int = 0, y: int = 0):
+    def write_to_screen(self, text: str, x: int = 0, y: int = 0, ebene: str = SPIELFELD):
         """
         Schreibt den Text `text` an die Stelle x,y in den internen Puffer. 
         Zum anzeigen des textes muss `self.print()` aufgerufen werden. 
-        Die Zeichen werden mittels `for ch in text` in den internen Puffer übertragen 
-        und daher werden nur einzeln kodierte Zeichen unterstützt. 
+        Jedes Zeichen des Textes belegt eine Stelle im Puffer, daher werden nur einzeln
+        kodierte Zeichen unterstützt. Was über den rechten Rand hinaus geht wird abgeschnitten.
 
-         text - `str` Der auszugebende Text 
+         text - `str` Der auszugebende Text oder die bereits getrennten Zeilen, z.B. aus `karten_zeilen()`
             x - `int` x-Koordinate wo der Text dargestellt wird
             y - `int` y-Koordinate wo der Text dargestellt wird
+        ebene - `str` die Ebene in die geschrieben wird
+                Default: SPIELFELD
         """
         if x not in range(0, self.width):
             raise ValueError(f"x ist nicht im Bereich [{0},{self.width}[")
         if y not in range(0, self.height):
             raise ValueError(f"y ist nicht im Bereich [{0},{self.height}[")
-        # initialize start coordinates
-        _x = x
-        _y = y
-        # split text into lines
-        lines = text.splitlines()
-        for line in lines:
-            # go character by character
-            for ch in line:
-                if self.width*_y+_x < len(self.screen):
-                    self.screen[self.width*_y+_x] = ch
-                _x += 1
-            _x = x
-            _y += 1
-            if _y >= self.height:
-                # stop if we have reached bottom of screen
-                break
-
-        self._update_buffer()
+        platz = self.width - x
+        zeilen = self.ebenen[ebene]
+        belegt = self._belegt[ebene]
+        lines = text.splitlines() if isinstance(text, str) else text
+        for _y, line in enumerate(lines[:self.height-y], y):
+            if len(line) > platz:
+                line = line[:platz]
+            zeilen[_y][x:x+len(line)] = line
+            belegt.add(_y)
+            self._geaendert.add(_y)
+
+    def invalidate(self):
+        """
+        Vergisst das zuletzt ausgegebene Bild, so dass der nächste Aufruf von `print()` das
+        Terminal löscht und den ganzen Bildschirm neu zeichnet. Das ist nötig wenn etwas
+        anderes in das Terminal geschrieben hat.
+        """
+        self.previous = None
+
+    def _diff(self, rows: list[str]) -> str:
+        """
+        Gibt die ANSI Ausgabe zurück, die das zuletzt ausgegebene Bild in das Bild `rows`
+        überführt. Je geänderter Zeile wird nur der Bereich vom ersten bis zum letzten
+        geänderten Zeichen geschrieben. Danach steht der Cursor unter dem Bildschirm und der
+        Rest des Terminals ist gelöscht.
+        """
+        out = []
+        previous = self.previous
+        if previous is None:
+            out.append("\x1b[H\x1b[2J")
+            previous = [" " * self.width] * self.height
+        for y, row in enumerate(rows):
+            alt = previous[y]
+            if row == alt:
+                continue
+            start = 0
+            while row[start] == alt[start]:
+                start += 1
+            ende = len(row)
+            while row[ende-1] == alt[ende-1]:
+                ende -= 1
+            out.append(f"\x1b[{y+1};{start+1}H{row[start:ende]}")
+        out.append(f"\x1b[{self.height+1};1H\x1b[J")
+        return "".join(out)
 
     def print(self):
         """
-        Zeichnet den Bildschirm auf Terminal mittels print()
+        Zeichnet den Bildschirm ins Terminal. Es werden nur die Zeichen geschrieben die sich
+        seit dem letzten Aufruf geändert haben, alles in einem einzigen `write`.
         """
-        print(self.buffer)
+        rows = list(self._zeilen())
+        ausgabe = self.ausgabe if self.ausgabe is not None else sys.stdout
+        ausgabe.write(self._diff(rows))
+        ausgabe.flush()
+        self.previous = rows
 
 
 class AsciiStapel(object):
     """
     Die Klasse definiert Methoden mit denen ein Stapel auf einem 
     Terminal gezeichnet werden können.
+    Die gefächerte Darstellung wird zwischengespeichert und nur neu erzeugt wenn sich die
+    `Stapel.version()` geändert hat.
     """
     def __init__(self, stapel: Stapel):
         """
@@ -95,6 +207,8 @@ class AsciiStapel(object):
         stapel - `Stapel` der Stapel der dekoriert werden soll
         """
         self.stapel = stapel
+        self._version = None
+        self._zeilen = ()
         
     def __repr__(self) -> str:
         return f"AsciiStapel({repr(self.stapel)})"
@@ -131,31 +245,36 @@ class AsciiStapel(object):
 
     def printFanned(self) -> str:
         """
-        Gibt den Stapel als str in gefächerter Darstellung zurück. 
+        Gibt den Stapel als str in gefächerter Darstellung zurück, siehe `zeilen()`.
+        """
+        return "\n".join(self.zeilen())
+
+    def zeilen(self) -> tuple[str]:
+        """
+        Gibt den Stapel in gefächerter Darstellung als Tupel der Zeilen zurück. 
         Der Stapel wird in die aufgedeckten und verdeckten Karten gesplitet. 
         Für jede Karte bis auf die oberste werden die oberen 2 Zeilen der Karten Darstellung gezeichnet
         Die oberste Karte wird komplett dargestellt. 
-        Ist die Karte verdeckt wird `AsciiKarte.back()` aufgerufen für aufgedeckte Karten wird `AsciiKarte.front()` 
-        aufgerufen.
+        Die Zeilen der Karten kommen aus den vorab erzeugten Darstellungen `RUECKSEITE_ZEILEN`
+        und `VORDERSEITE_ZEILEN`.
         """
-        card_top = rueckseite().splitlines(keepends=True)[0]
-        result = ""
-        hidden = [k for k in self.stapel.karten if not k.aufgedeckt()]
-        shown = [k for k in self.stapel.karten if k.aufgedeckt()]
-
-        if len(hidden) == 0 and len(shown) == 0:
-            return leer()
-
-        for k in enumerate(hidden):
-            result += card_top
-
-        for idx, k in enumerate(shown):
-            if idx < len(shown)-1:
-                result += "".join(vorderseite(
-                    k).splitlines(keepends=True)[:2])
-            else:
-                result += vorderseite(k)
-        return result
+        version = self.stapel.version()
+        if version == self._version:
+            return self._zeilen
+        karten = self.stapel.karten
+        if len(karten) == 0:
+            zeilen = LEER_ZEILEN
+        else:
+            card_top = RUECKSEITE_ZEILEN[0]
+            zeilen = [card_top for k in karten if not k.visible]
+            shown = [k for k in karten if k.visible]
+            for k in shown[:-1]:
+                zeilen.extend(VORDERSEITE_ZEILEN[k.code][:2])
+            if shown:
+                zeilen.extend(VORDERSEITE_ZEILEN[shown[-1].code])
+            zeilen = tuple(zeilen)
+        self._version, self._zeilen = version, zeilen
+        return zeilen
 
 
 def karten_breite():
@@ -170,44 +289,56 @@ def karten_hoehe():
     """
     return 6
 
+_VORDERSEITE_VORLAGE = """┌────────┐
+│ {0:<2s}   {1} │
+│        │
+│        │
+│ {1}   {0:>2s} │
+└────────┘"""
+
+# Die Darstellungen werden einmal erzeugt, je Karte als Tupel der Zeilen und als `str`
+VORDERSEITE_ZEILEN = tuple(tuple(_VORDERSEITE_VORLAGE.format(KARTE_TYP[c].blatt, KARTE_FARBE[c].blatt).splitlines())
+                           for c in range(ANZAHL_KARTEN))
+VORDERSEITE = tuple("\n".join(z) for z in VORDERSEITE_ZEILEN)
+
+RUECKSEITE = """┌────────┐
+│\u2588\u2588\u2588\u2588\u2588\u2588\u2588\u2588│
+│\u2588\u2588\u2588\u2588\u2588\u2588\u2588\u2588│
+│\u2588\u2588\u2588\u2588\u2588\u2588\u2588\u2588│
+│\u2588\u2588\u2588\u2588\u2588\u2588\u2588\u2588│
+└────────┘
+"""
+RUECKSEITE_ZEILEN = tuple(RUECKSEITE.splitlines())
+
+LEER = """┌────────┐
+│        │
+│   \\/   │
+│   /\\   │
+│        │
+└────────┘
+"""
+LEER_ZEILEN = tuple(LEER.splitlines())
+
+
 def vorderseite(karte: Karte) -> str:
     """
     Gibt Vorderseite der Karte `karte` als `str` zurück.
     
     karte - Karte die darzustellende Karte
     """
-    typ = karte.typ.blatt
-    farbe = karte.farbe.blatt
-    return """┌────────┐
-│ {0:<2s}   {1} │
-│        │
-│        │
-│ {1}   {0:>2s} │
-└────────┘""".format(typ, farbe)
+    return VORDERSEITE[karte.code]
 
 def rueckseite() -> str:
     """
     Gibt die Rückseite einer Karte als `str` zurück.
     """
-    return """┌────────┐
-│\u2588\u2588\u2588\u2588\u2588\u2588\u2588\u2588│
-│\u2588\u2588\u2588\u2588\u2588\u2588\u2588\u2588│
-│\u2588\u2588\u2588\u2588\u2588\u2588\u2588\u2588│
-│\u2588\u2588\u2588\u2588\u2588\u2588\u2588\u2588│
-└────────┘
-"""    
+    return RUECKSEITE
 
 def leer() -> str:
     """
     Gibt die Darstellung eines leeren Stapels zurück.
     """
-    return """┌────────┐
-│        │
-│   \/   │
-│   /\   │
-│        │
-└────────┘
-"""        
+    return LEER
     
 def str_karte(karte: Karte) -> str:
     """
@@ -217,15 +348,24 @@ def str_karte(karte: Karte) -> str:
     
     karte - Karte die darzustellende Karte
     """
-    blatt = ""
     if karte is None:
-        blatt = leer()
+        return LEER
     elif karte.aufgedeckt():
-        blatt = vorderseite(karte)
-    else:
-        blatt = rueckseite()
-    return blatt
+        return VORDERSEITE[karte.code]
+    return RUECKSEITE
+
+def karten_zeilen(karte: Karte) -> tuple[str]:
+    """
+    Gibt die Karte `karte` wie `str_karte()` zurück, aber als Tupel der Zeilen. Das Tupel
+    kann direkt an `AsciiScreen.write_to_screen()` übergeben werden.
 
+    karte - Karte die darzustellende Karte
+    """
+    if karte is None:
+        return LEER_ZEILEN
+    elif karte.visible:
+        return VORDERSEITE_ZEILEN[karte.code]
+    return RUECKSEITE_ZEILEN
 
 if __name__ == "__main__":
     screen = AsciiScreen(height=20, width=22)
@@ -1,5 +1,7 @@
 import unittest
-from ascii import AsciiScreen
+import io
+from ascii import AsciiScreen, AsciiStapel, karten_zeilen, str_karte, vorderseite
+from cards import Karte, Farbe, KartenTyp, Stapel
 
 
 class AsciiScreenTest(unittest.TestCase):
@@ -12,6 +14,97 @@ class AsciiScreenTest(unittest.TestCase):
         self.assertRaises(ValueError, lambda: s.write_to_screen("t", 2, 0))
         self.assertRaises(ValueError, lambda: s.write_to_screen("t", 0, 2))
 
+    def test_render(self):
+        s = AsciiScreen(width=5, height=3)
+        self.assertEqual("     \n" * 3, s.render())
+        s.write_to_screen("abcdefg\nxy\nuvw", 2, 1)
+        self.assertEqual("     \n  abc\n  xy \n", s.render())
+        self.assertEqual(s.render(), s.buffer)
+        s.clear_screen()
+        self.assertEqual("     \n" * 3, s.render())
+
+    def test_ebenen(self):
+        s = AsciiScreen(width=4, height=2)
+        self.assertTrue(s.ebene_leer(AsciiScreen.HINTERGRUND))
+        s.write_to_screen("....\n....", 0, 0, AsciiScreen.HINTERGRUND)
+        s.write_to_screen("ab", 1, 0)
+        s.write_to_screen(" x", 2, 0, AsciiScreen.OVERLAY)
+        self.assertFalse(s.ebene_leer(AsciiScreen.HINTERGRUND))
+        self.assertEqual(".a x\n....\n", s.render())
+        s.clear_screen(AsciiScreen.OVERLAY)
+        self.assertEqual(".ab.\n....\n", s.render())
+        s.clear_screen(AsciiScreen.SPIELFELD)
+        self.assertEqual("....\n....\n", s.render())
+        s.write_to_screen("z", 0, 1)
+        s.clear_screen()
+        self.assertTrue(s.ebene_leer(AsciiScreen.HINTERGRUND))
+        self.assertEqual("    \n    \n", s.render())
+
+    def test_bereich_loeschen(self):
+        s = AsciiScreen(width=4, height=3)
+        s.write_to_screen("....\n....\n....", 0, 0, AsciiScreen.HINTERGRUND)
+        s.write_to_screen("abcd\nefgh", 0, 1)
+        s.bereich_loeschen(1, 1, 2, 1)
+        self.assertEqual("....\na..d\nefgh\n", s.render())
+        s.bereich_loeschen(0, 1, 4, 5)
+        self.assertEqual("....\n....\n....\n", s.render())
+        self.assertTrue(s.ebene_leer(AsciiScreen.SPIELFELD))
+        self.assertFalse(s.ebene_leer(AsciiScreen.HINTERGRUND))
+
+    def test_print_schreibt_nur_aenderungen(self):
+        ausgabe = io.StringIO()
+        s = AsciiScreen(width=4, height=3, ausgabe=ausgabe)
+        s.write_to_screen("ab", 1, 1)
+        s.print()
+        self.assertEqual("\x1b[H\x1b[2J\x1b[2;2Hab\x1b[4;1H\x1b[J", ausgabe.getvalue())
+
+        ausgabe.truncate(0)
+        ausgabe.seek(0)
+        s.print()
+        self.assertEqual("\x1b[4;1H\x1b[J", ausgabe.getvalue())
+
+        ausgabe.truncate(0)
+        ausgabe.seek(0)
+        s.write_to_screen("xbcd", 0, 1)
+        s.write_to_screen("z", 3, 2)
+        s.print()
+        self.assertEqual("\x1b[2;1Hxbcd\x1b[3;4Hz\x1b[4;1H\x1b[J", ausgabe.getvalue())
+
+        ausgabe.truncate(0)
+        ausgabe.seek(0)
+        s.invalidate()
+        s.print()
+        self.assertTrue(ausgabe.getvalue().startswith("\x1b[H\x1b[2J"))
+
+
+class AsciiKarteTest(unittest.TestCase):
+    def test_karten_zeilen(self):
+        k = Karte(farbe=Farbe.HERZ, typ=KartenTyp.ZEHN, visible=True)
+        self.assertIs(vorderseite(k), vorderseite(Karte(farbe=Farbe.HERZ, typ=KartenTyp.ZEHN)))
+        self.assertEqual("│ 10   ♥ │", karten_zeilen(k)[1])
+        for karte in (k, Karte(farbe=Farbe.PIK, typ=KartenTyp.AS), None):
+            self.assertEqual(tuple(str_karte(karte).splitlines()), karten_zeilen(karte))
+
+    def test_printFanned(self):
+        stapel = AsciiStapel(Stapel(karten=[Karte(farbe=Farbe.PIK, typ=KartenTyp.ZWEI),
+                                            Karte(farbe=Farbe.KARO, typ=KartenTyp.VIER, visible=True),
+                                            Karte(farbe=Farbe.KREUZ, typ=KartenTyp.DREI, visible=True)]))
+        zeilen = stapel.printFanned().splitlines()
+        self.assertEqual(1 + 2 + 6, len(zeilen))
+        self.assertEqual(karten_zeilen(None)[0], zeilen[0])
+        self.assertEqual(list(karten_zeilen(stapel.stapel.top())), zeilen[3:])
+        self.assertEqual(str_karte(None).splitlines(), AsciiStapel(Stapel()).printFanned().splitlines())
+
+    def test_zeilen_zwischengespeichert(self):
+        stapel = AsciiStapel(Stapel(karten=[Karte(farbe=Farbe.PIK, typ=KartenTyp.ZWEI)]))
+        zeilen = stapel.zeilen()
+        self.assertIs(zeilen, stapel.zeilen())
+        stapel.stapel.aufdecken()
+        self.assertIsNot(zeilen, stapel.zeilen())
+        self.assertEqual(karten_zeilen(stapel.stapel.top()), stapel.zeilen())
+        stapel.stapel.ziehen()
+        self.assertEqual(karten_zeilen(None), stapel.zeilen())
+
 
 if __name__ == "__main__":
     unittest.main()
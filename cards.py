@@ -1,5 +1,5 @@
 from enum import Enum
-from random import shuffle
+from random import shuffle, Random
 
 
 class Constants(Enum):
@@ -61,7 +61,59 @@ class KartenTyp(Enum):
     KOENIG = "K"
 
 
+# Anzahl der Karten je Farbe und im ganzen Spiel
+KARTEN_PRO_FARBE = len(KartenTyp)
+ANZAHL_KARTEN = len(Farbe) * KARTEN_PRO_FARBE
+
+# Jede Karte hat einen Code 0-51 = (Farbe.value-1) * 13 + (KartenTyp.value-1).
+# Die folgenden Tabellen liefern zu jedem Code die Farbe, den Typ, ob die Karte
+# rot ist und den Wert 1-13 der Karte ohne dass gerechnet werden muss.
+KARTE_FARBE = tuple(f for f in Farbe for t in KartenTyp)
+KARTE_TYP = tuple(t for f in Farbe for t in KartenTyp)
+KARTE_ROT = tuple(f.farbe == Constants.ROT for f in Farbe for t in KartenTyp)
+KARTE_WERT = tuple(t.value for f in Farbe for t in KartenTyp)
+
+# Regeltabellen für `anlegbar`:
+# ANLEGBAR_AUF[code] ist eine Bitmaske aller Karten die auf die Karte `code` angelegt
+#   werden dürfen (andere Farbe rot/schwarz und um eins niedriger).
+# ANLEGBAR_LEER ist die Bitmaske aller Karten die an einen leeren Anlagestapel dürfen (Könige).
+# NACHFOLGER[code] ist die Karte die auf einem Ablagestapel auf `code` folgt, -1 nach dem König.
+# ABLAGE_ANFANG[Farbe.value-1] ist die Karte die auf einen leeren Ablagestapel darf (das As).
+ANLEGBAR_AUF = tuple(sum(1 << k for k in range(ANZAHL_KARTEN)
+                         if KARTE_ROT[k] != KARTE_ROT[o] and KARTE_WERT[k] == KARTE_WERT[o]-1)
+                     for o in range(ANZAHL_KARTEN))
+ANLEGBAR_LEER = sum(1 << k for k in range(ANZAHL_KARTEN)
+                    if KARTE_WERT[k] == KartenTyp.KOENIG.value)
+NACHFOLGER = tuple(k+1 if KARTE_WERT[k] < KARTEN_PRO_FARBE else -1
+                   for k in range(ANZAHL_KARTEN))
+ABLAGE_ANFANG = tuple((f.value-1) * KARTEN_PRO_FARBE for f in Farbe)
+
+# Zobrist Schlüssel: ZOBRIST[tiefe][code*2+aufgedeckt] ist eine feste 64 bit Zufallszahl
+# für eine Karte an Position `tiefe` in einem Stapel. Der Hash eines Stapels ist das XOR
+# der Schlüssel aller seiner Karten und kann daher bei jeder Änderung nachgeführt werden.
+_zobrist_zufall = Random(1923)
+ZOBRIST = tuple(tuple(_zobrist_zufall.getrandbits(64) for i in range(ANZAHL_KARTEN*2))
+                for tiefe in range(ANZAHL_KARTEN))
+
+
+def karten_code(farbe: Farbe, typ: KartenTyp) -> int:
+    """
+    Gibt den Code 0-51 der Karte mit der Farbe `farbe` und dem Typ `typ` zurück.
+
+    farbe - `Farbe` die Farbe der Karte
+    typ - `KartenTyp` der Wert der Karte
+    """
+    return (farbe.value-1) * KARTEN_PRO_FARBE + typ.value-1
+
+
 class Karte(object):
+    """
+    Eine Spielkarte. Die Karte speichert nur ihren Code 0-51 und ob sie aufgedeckt ist.
+    Farbe und Typ werden über die Tabellen `KARTE_FARBE` und `KARTE_TYP` nachgeschlagen,
+    die von allen Karten geteilt werden.
+    """
+    __slots__ = ("code", "visible")
+
     def __init__(self, farbe: Farbe, typ: KartenTyp, visible: bool = False) -> None:
         """
         Erstellt eine Spielkarte mit der angegebenen Frabe und dem angegebenen Kartentyp 
@@ -71,10 +123,36 @@ class Karte(object):
         typ - `KartenTyp` der Wert der Karte
         visible - `bool` Ob die Karte offen oder zugedeckt ist
         """
-        self.farbe = farbe
-        self.typ = typ
+        self.code = karten_code(farbe, typ)
         self.visible = visible
 
+    @classmethod
+    def aus_code(cls, code: int, visible: bool = False):
+        """
+        Erstellt die Spielkarte mit dem Code `code`.
+
+        code - `int` der Code 0-51 der Karte
+        visible - `bool` Ob die Karte offen oder zugedeckt ist
+        """
+        karte = cls.__new__(cls)
+        karte.code = code
+        karte.visible = visible
+        return karte
+
+    @property
+    def farbe(self) -> Farbe:
+        return KARTE_FARBE[self.code]
+
+    @property
+    def typ(self) -> KartenTyp:
+        return KARTE_TYP[self.code]
+
+    def __copy__(self):
+        return Karte.aus_code(self.code, self.visible)
+
+    def __deepcopy__(self, memo):
+        return Karte.aus_code(self.code, self.visible)
+
     def __repr__(self) -> str:
         """
         strukturelle Darstellung der Klasse
@@ -87,6 +165,9 @@ class Karte(object):
         """
         return f"{'' if self.visible else '-'}{self.farbe.blatt}{self.typ.blatt}"
 
+    def __hash__(self) -> int:
+        return self.code
+
     def __eq__(self, other: object) -> bool:
         """
         Gibt `True` zurück wenn diese Karte gleich ist wie 
@@ -97,7 +178,7 @@ class Karte(object):
         other - `object` das Objekt mit dem verglichen wird 
         """
         if type(other) == Karte:
-            return self.farbe == other.farbe and self.typ == other.typ
+            return self.code == other.code
         return False
 
     def __lt__(self, other: object) -> bool:
@@ -107,9 +188,7 @@ class Karte(object):
 
         other - `object` das Objekt mit dem verglichen wird
         """
-        if self.farbe == other.farbe:
-            return self.typ.value < other.typ.value
-        return self.farbe.value < other.farbe.value
+        return self.code < other.code
 
     def __le__(self, other: object) -> bool:
         """
@@ -118,9 +197,7 @@ class Karte(object):
 
         other - `object` das Objekt mit dem verglichen wird
         """
-        if self.farbe == other.farbe:
-            return self.typ.value <= other.typ.value
-        return self.farbe.value <= other.farbe.value
+        return self.code <= other.code
 
     def __gt__(self, other: object) -> bool:
         """
@@ -129,9 +206,7 @@ class Karte(object):
 
         other - `object` das Objekt mit dem verglichen wird
         """
-        if self.farbe == other.farbe:
-            return self.typ.value > other.typ.value
-        return self.farbe.value > other.farbe.value
+        return self.code > other.code
 
     def __ge__(self, other: object) -> bool:
         """
@@ -140,9 +215,7 @@ class Karte(object):
 
         other - `object` das Objekt mit dem verglichen wird
         """
-        if self.farbe == other.farbe:
-            return self.typ.value >= other.typ.value
-        return self.farbe.value >= other.farbe.value
+        return self.code >= other.code
 
     def __ne__(self, other: object) -> bool:
         """
@@ -184,6 +257,95 @@ class Stapel(object):
                  Default: []
         """
         self.karten = karten.copy()
+
+    @property
+    def karten(self) -> list[Karte]:
+        """
+        Die Karten auf dem Stapel, die oberste Karte ist die letzte.
+        Änderungen sollten über die Methoden des Stapels oder durch Zuweisen einer neuen
+        Liste erfolgen, damit der Hash, die Zähler und die Version des Stapels aktuell bleiben.
+        """
+        return self._karten
+
+    @karten.setter
+    def karten(self, karten: list[Karte]):
+        self._karten = karten
+        self._version = getattr(self, "_version", 0) + 1
+        self._zobrist = 0
+        self._verdeckt = 0
+        self._offen = 0
+        for tiefe, k in enumerate(karten):
+            self._zobrist ^= ZOBRIST[tiefe][k.code*2+k.visible]
+            self._verdeckt += not k.visible
+            if not k.visible:
+                self._offen = tiefe+1
+
+    def zobrist(self) -> int:
+        """
+        Gibt den Zobrist Hash des Stapels als `int` zurück. Der Hash hängt von den Karten,
+        ihrer Reihenfolge und davon ab ob sie aufgedeckt sind.
+        """
+        return self._zobrist
+
+    def verdeckt_anzahl(self) -> int:
+        """
+        Gibt die Anzahl der verdeckten Karten auf dem Stapel zurück. Der Wert wird bei jeder
+        Änderung nachgeführt und muss nicht gezählt werden.
+        """
+        return self._verdeckt
+
+    def offen_ab(self) -> int:
+        """
+        Gibt den Index der untersten Karte der obersten aufgedeckten Kartenfolge zurück.
+        Liegt oben eine verdeckte Karte oder ist der Stapel leer, ist das die Anzahl der Karten.
+        Der Wert wird wie `verdeckt_anzahl()` bei jeder Änderung nachgeführt.
+        """
+        return self._offen
+
+    def version(self) -> int:
+        """
+        Gibt die Version des Stapels zurück. Jede Änderung der Karten oder ihrer Seite erhöht
+        die Version, so dass z.B. eine Darstellung nur neu erzeugt werden muss wenn sich die
+        Version geändert hat.
+        """
+        return self._version
+
+    def auflegen(self, karten: list[Karte]):
+        """
+        Legt die Karten `karten` ohne Prüfung der Anlegeregeln auf den Stapel.
+
+        karten - `list[Karte]` die Karten, die letzte Karte liegt danach oben
+        """
+        self._version += 1
+        tiefe = len(self._karten)
+        for k in karten:
+            self._zobrist ^= ZOBRIST[tiefe][k.code*2+k.visible]
+            tiefe += 1
+            if not k.visible:
+                self._verdeckt += 1
+                self._offen = tiefe
+        self._karten.extend(karten)
+
+    def abheben(self, anzahl: int) -> list[Karte]:
+        """
+        Nimmt die obersten `anzahl` Karten vom Stapel und gibt sie in ihrer Reihenfolge
+        zurück.
+
+        anzahl - `int` die Anzahl der Karten
+        """
+        self._version += 1
+        start = len(self._karten)-anzahl
+        karten = self._karten[start:]
+        for tiefe, k in enumerate(karten, start):
+            self._zobrist ^= ZOBRIST[tiefe][k.code*2+k.visible]
+            self._verdeckt -= not k.visible
+        del self._karten[start:]
+        if self._offen > start:
+            self._offen = start
+            while self._offen > 0 and self._karten[self._offen-1].visible:
+                self._offen -= 1
+        return karten
+
     def _karten_str(self) -> str:
         return f"[{','.join([str(k) for k in self.karten])}]"
     
@@ -215,17 +377,36 @@ class Stapel(object):
         Deckt die oberste Karte des Stapels auf, falls der Stapel nicht leer ist. 
         """
         k = self.top()
-        if k:
+        if k and not k.visible:
+            tiefe = ZOBRIST[len(self._karten)-1]
+            self._zobrist ^= tiefe[k.code*2] ^ tiefe[k.code*2+1]
+            self._version += 1
+            self._verdeckt -= 1
             k.aufdecken()
+            self._offen -= 1
+            while self._offen > 0 and self._karten[self._offen-1].visible:
+                self._offen -= 1
+
+    def zudecken(self):
+        """
+        Deckt die oberste Karte des Stapels zu, falls der Stapel nicht leer ist.
+        """
+        k = self.top()
+        if k and k.visible:
+            tiefe = ZOBRIST[len(self._karten)-1]
+            self._zobrist ^= tiefe[k.code*2] ^ tiefe[k.code*2+1]
+            self._version += 1
+            self._verdeckt += 1
+            k.zudecken()
+            self._offen = len(self._karten)
 
     def ziehen(self) -> Karte:
         """
         Entfernt die oberste Karte vom Stapel und gibt sie zurück. Wenn der Stapel 
         leer ist wird `None` zurück gegeben. 
         """
-        if len(self.karten) > 0:
-            k = self.karten.pop()
-            return k
+        if len(self._karten) > 0:
+            return self.abheben(1)[0]
         return None
 
     def anlegen(self, karte: Karte) -> None:
@@ -238,7 +419,7 @@ class Stapel(object):
         if not self.anlegbar(karte):
             raise ValueError(
                 f"Karte {karte} kann nicht auf dem Stapel {self} abgelegt werden!")
-        self.karten.append(karte)
+        self.auflegen([karte])
 
     def anlegbar(self, karte: Karte) -> bool:
         """
@@ -249,12 +430,20 @@ class Stapel(object):
         """
         return True
 
-    def shuffle(self):
+    def shuffle(self, zufall: Random = None):
         """
         Mischt diesen Stapel.
         Gibt den Stapel selbst zurück.
+
+        zufall - `Random` der Zufallsgenerator mit dem gemischt wird oder `None` für den
+                 globalen Zufallsgenerator
+                 Default: None
         """
-        shuffle(self.karten)
+        if zufall is None:
+            shuffle(self._karten)
+        else:
+            zufall.shuffle(self._karten)
+        self.karten = self._karten
         return self
 
     def leer(self) -> bool:
@@ -297,22 +486,15 @@ class AblageStapel(Stapel):
 
         karte - `Karte` die Karte die geprüft wird.
         """
-        if karte.farbe != self.farbe:
-            return False
         if len(self.karten) <= 0:
-            nextKarte = Karte(farbe=self.farbe, typ=KartenTyp.AS)
-        elif self.karten[-1].typ.value >= len(list(KartenTyp)):
-            return False
-        else:
-            next_idx = self.karten[-1].typ.value
-            nextKarte = Karte(farbe=self.farbe, typ=list(KartenTyp)[next_idx])
-        return karte == nextKarte
+            return karte.code == ABLAGE_ANFANG[self.farbe.value-1]
+        return karte.code == NACHFOLGER[self.karten[-1].code]
 
     def komplett(self) -> bool:
         """
         Gibt `True` zurück wenn der AblageStapel komplett ist ansonsten `False`
         """
-        return len(self.karten) == len(list(KartenTyp))
+        return len(self.karten) == KARTEN_PRO_FARBE
 
 
 class AnlageStapel(Stapel):
@@ -342,37 +524,50 @@ class AnlageStapel(Stapel):
         karte - `Karte` die zuprüfende Karte
         """
         if len(self.karten) <= 0:
-            if karte.typ != KartenTyp.KOENIG:
-                return False
-        else:
-            oberste_karte = self.karten[-1]
-            if oberste_karte.farbe.farbe == karte.farbe.farbe:
-                return False
-            elif karte.typ.value >= oberste_karte.typ.value or karte.typ.value < oberste_karte.typ.value-1:
-                return False
-        return True
+            return ANLEGBAR_LEER >> karte.code & 1 == 1
+        return ANLEGBAR_AUF[self.karten[-1].code] >> karte.code & 1 == 1
 
-    def verschieben_nach(self, zu) -> bool:
+    def verschieben_nach(self, zu, ab: int = None) -> bool:
         """
         Verschiebt die aufgedeckten Karten von diesem Stapel zum Stapel `zu` wenn die Karten anlegbar sind. 
         Zum ermitteln der zu verschiebenden Karten wird folgender Algorithmus verwendet:
-            Der Stapel wird von unten nach oben Karte um Karte durchlaufen wenn die Karte aufgedeckt 
-            und anlegbar ist werden die Karte und alle folgenden Karten auf den `zu` Stapel verschoben.
+            Die oberste aufgedeckte Kartenfolge (ab `offen_ab()`) wird von unten nach oben Karte um
+            Karte durchlaufen, ist die Karte anlegbar werden die Karte und alle folgenden Karten
+            auf den `zu` Stapel verschoben.
             Wird keine Karte gefunden die anlegbar ist werden keine Karten verschoben.
+        Mit `ab` wird die unterste zu verschiebende Karte vorgegeben.
         Gibt `True` zurück wenn Karten verschoben wurden ansonsten `False`.
 
         zu - `AnlageStapel` auf den die Karten verschoben werden sollen 
-        """
-        for idx, s in enumerate(self.karten):
-            if s.aufgedeckt() and zu.anlegbar(s):
-                zuverschieben = self.karten[idx:]
-                behalten = self.karten[0:idx].copy()
-                zu.karten += zuverschieben
-                self.karten = behalten
-                self.aufdecken()
-                return True
+        ab - `int` der Index der untersten zu verschiebenden Karte oder `None` für die erste anlegbare Karte
+             Default: None
+        """
+        anzahl = self.verschiebbar_nach(zu, ab)
+        if anzahl > 0:
+            zu.auflegen(self.abheben(anzahl))
+            self.aufdecken()
+            return True
         return False
 
+    def verschiebbar_nach(self, zu, ab: int = None) -> int:
+        """
+        Gibt die Anzahl der Karten zurück die `verschieben_nach(zu, ab)` verschieben würde,
+        0 wenn keine Karte anlegbar ist.
+
+        zu - `AnlageStapel` auf den die Karten verschoben werden sollen
+        ab - `int` der Index der untersten zu verschiebenden Karte oder `None` für die erste anlegbare Karte
+             Default: None
+        """
+        karten = self._karten
+        if ab is not None:
+            if self._offen <= ab < len(karten) and zu.anlegbar(karten[ab]):
+                return len(karten)-ab
+            return 0
+        for idx in range(self._offen, len(karten)):
+            if zu.anlegbar(karten[idx]):
+                return len(karten)-idx
+        return 0
+
 
 if __name__ == "__main__":
     """
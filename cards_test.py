@@ -1,5 +1,6 @@
 import unittest
-from cards import Stapel, AblageStapel, Farbe, Karte, KartenTyp, AnlageStapel
+from copy import deepcopy
+from cards import Stapel, AblageStapel, Farbe, Karte, KartenTyp, AnlageStapel, ANZAHL_KARTEN, ANLEGBAR_AUF
 
 
 class TestKarte(unittest.TestCase):
@@ -41,6 +42,48 @@ class TestKarte(unittest.TestCase):
         k.aufdecken()
         self.assertTrue(k.aufgedeckt())
 
+    def test_code(self):
+        karten = [Karte(farbe=f, typ=t) for f in list(Farbe)
+                  for t in list(KartenTyp)]
+        self.assertEqual(list(range(ANZAHL_KARTEN)), [k.code for k in karten])
+        for k in karten:
+            with self.subTest(karte=k):
+                kopie = Karte.aus_code(k.code, visible=True)
+                self.assertEqual(k, kopie)
+                self.assertEqual(k.farbe, kopie.farbe)
+                self.assertEqual(k.typ, kopie.typ)
+                self.assertEqual(hash(k), hash(kopie))
+                self.assertTrue(kopie.aufgedeckt())
+
+    def test_deepcopy(self):
+        k = Karte(farbe=Farbe.PIK, typ=KartenTyp.DAME, visible=True)
+        kopie = deepcopy(k)
+        self.assertIsNot(k, kopie)
+        self.assertEqual(k, kopie)
+        self.assertTrue(kopie.aufgedeckt())
+        kopie.zudecken()
+        self.assertTrue(k.aufgedeckt())
+
+
+class TestRegeltabellen(unittest.TestCase):
+    def test_anlegbar_auf(self):
+        karten = [Karte(farbe=f, typ=t, visible=True) for f in list(Farbe)
+                  for t in list(KartenTyp)]
+        for o in karten:
+            for k in karten:
+                erwartet = o.farbe.farbe != k.farbe.farbe and k.typ.value == o.typ.value-1
+                self.assertEqual(erwartet, ANLEGBAR_AUF[o.code] >> k.code & 1 == 1,
+                                 msg=f"{k} auf {o}")
+                self.assertEqual(erwartet, AnlageStapel(karten=[o]).anlegbar(k),
+                                 msg=f"{k} auf {o}")
+
+    def test_ablage_nach_koenig(self):
+        for f in list(Farbe):
+            karten = [Karte(farbe=f, typ=t) for t in list(KartenTyp)]
+            stapel = AblageStapel(f, karten)
+            for k in karten:
+                self.assertFalse(stapel.anlegbar(k))
+
 
 class TestAblageStapel(unittest.TestCase):
     def test_nicht_anlegbar(self):
@@ -148,6 +191,99 @@ class TestStapel(unittest.TestCase):
         s.aufdecken()
         self.assertTrue(s.top().aufgedeckt())
 
+    def test_zobrist(self):
+        karten = [Karte(farbe=f, typ=t) for f in list(Farbe)
+                  for t in list(KartenTyp)]
+        s = Stapel(deepcopy(karten[:10]))
+        self.assertNotEqual(0, s.zobrist())
+        s.anlegen(karten[20])
+        s.ziehen()
+        self.assertEqual(Stapel(karten[:10]).zobrist(), s.zobrist())
+        s.aufdecken()
+        self.assertNotEqual(Stapel(karten[:10]).zobrist(), s.zobrist())
+        self.assertEqual(Stapel(s.karten).zobrist(), s.zobrist())
+        self.assertEqual(0, Stapel().zobrist())
+
+    def test_zobrist_verschieben(self):
+        von = AnlageStapel(karten=[Karte(farbe=Farbe.HERZ, typ=KartenTyp.VIER),
+                                   Karte(farbe=Farbe.PIK, typ=KartenTyp.ACHT, visible=True),
+                                   Karte(farbe=Farbe.HERZ, typ=KartenTyp.SIEBEN, visible=True)])
+        zu = AnlageStapel(karten=[Karte(farbe=Farbe.KARO, typ=KartenTyp.NEUN, visible=True)])
+        self.assertTrue(von.verschieben_nach(zu))
+        self.assertEqual(AnlageStapel(von.karten).zobrist(), von.zobrist())
+        self.assertEqual(AnlageStapel(zu.karten).zobrist(), zu.zobrist())
+
+    def test_verdeckt_anzahl(self):
+        s = Stapel(karten=[Karte(farbe=Farbe.HERZ, typ=KartenTyp.VIER),
+                           Karte(farbe=Farbe.PIK, typ=KartenTyp.ACHT)])
+        self.assertEqual(2, s.verdeckt_anzahl())
+        s.aufdecken()
+        self.assertEqual(1, s.verdeckt_anzahl())
+        s.auflegen([Karte(farbe=Farbe.KARO, typ=KartenTyp.AS), Karte(farbe=Farbe.KARO, typ=KartenTyp.ZWEI, visible=True)])
+        self.assertEqual(2, s.verdeckt_anzahl())
+        s.abheben(3)
+        self.assertEqual(1, s.verdeckt_anzahl())
+        s.zudecken()
+        self.assertEqual(1, s.verdeckt_anzahl())
+        s.ziehen()
+        self.assertEqual(0, s.verdeckt_anzahl())
+
+    def test_version(self):
+        s = AnlageStapel(karten=[Karte(farbe=Farbe.HERZ, typ=KartenTyp.ACHT)])
+        zu = AnlageStapel(karten=[Karte(farbe=Farbe.PIK, typ=KartenTyp.NEUN, visible=True)])
+        versionen = [s.version()]
+        s.aufdecken()
+        versionen.append(s.version())
+        s.aufdecken()
+        self.assertEqual(versionen[-1], s.version())
+        s.zudecken()
+        versionen.append(s.version())
+        s.aufdecken()
+        versionen.append(s.version())
+        s.verschieben_nach(zu)
+        versionen.append(s.version())
+        self.assertNotEqual(1, zu.version())
+        s.auflegen([zu.ziehen()])
+        versionen.append(s.version())
+        s.karten = []
+        versionen.append(s.version())
+        self.assertEqual(sorted(set(versionen)), versionen)
+
+    def test_offen_ab(self):
+        s = AnlageStapel(karten=[Karte(farbe=Farbe.HERZ, typ=KartenTyp.VIER),
+                                 Karte(farbe=Farbe.PIK, typ=KartenTyp.ACHT)])
+        self.assertEqual(2, s.offen_ab())
+        s.aufdecken()
+        self.assertEqual(1, s.offen_ab())
+        s.auflegen([Karte(farbe=Farbe.HERZ, typ=KartenTyp.SIEBEN, visible=True)])
+        self.assertEqual(1, s.offen_ab())
+        s.auflegen([Karte(farbe=Farbe.KARO, typ=KartenTyp.AS)])
+        self.assertEqual(4, s.offen_ab())
+        s.abheben(2)
+        self.assertEqual(1, s.offen_ab())
+        s.zudecken()
+        self.assertEqual(2, s.offen_ab())
+        s.abheben(2)
+        self.assertEqual(0, s.offen_ab())
+        self.assertEqual(0, AnlageStapel().offen_ab())
+
+    def test_verschieben_nach_ab(self):
+        von = AnlageStapel(karten=[Karte(farbe=Farbe.HERZ, typ=KartenTyp.VIER),
+                                   Karte(farbe=Farbe.PIK, typ=KartenTyp.ACHT, visible=True),
+                                   Karte(farbe=Farbe.HERZ, typ=KartenTyp.SIEBEN, visible=True),
+                                   Karte(farbe=Farbe.KREUZ, typ=KartenTyp.SECHS, visible=True)])
+        zu = AnlageStapel(karten=[Karte(farbe=Farbe.KARO, typ=KartenTyp.SIEBEN, visible=True)])
+        self.assertEqual(0, von.verschiebbar_nach(zu, 0))
+        self.assertEqual(0, von.verschiebbar_nach(zu, 1))
+        self.assertEqual(0, von.verschiebbar_nach(zu, 4))
+        self.assertFalse(von.verschieben_nach(zu, 1))
+        self.assertEqual(1, von.verschiebbar_nach(zu, 3))
+        self.assertTrue(von.verschieben_nach(zu, 3))
+        self.assertEqual(3, von.karten_anzahl())
+        self.assertEqual(Karte(farbe=Farbe.KREUZ, typ=KartenTyp.SECHS), zu.top())
+        self.assertEqual(AnlageStapel(von.karten).zobrist(), von.zobrist())
+        self.assertEqual(AnlageStapel(zu.karten).zobrist(), zu.zobrist())
+
     def test_eq_empty(self):
         s1 = Stapel()
         s2 = Stapel()
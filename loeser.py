@@ -0,0 +1,228 @@
+from __future__ import annotations
+from stellung import Stellung
+from spielstand import HASH_MASKE
+from cards import KARTE_ROT, KARTEN_PRO_FARBE
+from spiel import Spiel, Zug, ZugTyp
+from enum import Enum
+from time import perf_counter
+import logging
+
+LOG = logging.getLogger("solitair")
+
+# Version der Regeln und des Löser. Muss erhöht werden wenn sich die Spielregeln oder die
+# Suche so ändern, dass gespeicherte Ergebnisse (siehe `LoesungsSpeicher`) ungültig werden.
+REGEL_VERSION = 2
+
+
+class Ergebnis(Enum):
+    """
+    Enum für das Ergebnis einer Suche.
+    Jeder Enum beinhaltet den Text der bei der Auswertung ausgegeben wird.
+    """
+    GEWONNEN = "gewonnen"
+    VERLOREN = "verloren"
+    ABGEBROCHEN = "abgebrochen"
+
+
+class Loesung(object):
+    def __init__(self, ergebnis: Ergebnis, zuege: list[Zug], knoten: int, sekunden: float) -> None:
+        """
+        Das Ergebnis einer Suche des `Loeser`.
+
+        ergebnis - `Ergebnis` ob das Spiel gewonnen werden kann
+        zuege - `list[Zug]` die Züge bis zum Sieg, leer wenn nicht gewonnen
+        knoten - `int` die Anzahl der untersuchten Stellungen
+        sekunden - `float` die Dauer der Suche
+        """
+        self.ergebnis = ergebnis
+        self.zuege = zuege
+        self.knoten = knoten
+        self.sekunden = sekunden
+
+    def __repr__(self) -> str:
+        return f"Loesung({self.ergebnis},{len(self.zuege)} Züge,{self.knoten} Knoten,{self.sekunden:.3f}s)"
+
+    def knoten_pro_sekunde(self) -> float:
+        """
+        Gibt die Anzahl der untersuchten Stellungen pro Sekunde zurück.
+        """
+        return self.knoten / self.sekunden if self.sekunden > 0 else float(self.knoten)
+
+
+class Loeser(object):
+    """
+    Sucht mit einer Tiefensuche eine Zugfolge die das Spiel gewinnt.
+
+    Bereits untersuchte Stellungen werden über ihren Zobrist Hash in einer Transpositions-
+    tabelle vermerkt und nicht erneut durchsucht. Die Züge werden so sortiert, dass
+    aussichtsreiche Züge (Ablegen, Aufdecken) zuerst probiert werden. Die Suche bricht ab
+    wenn die Anzahl der Knoten oder die Zeit überschritten wird.
+    Sichere Ablagen werden ohne Alternative gespielt und Verschiebungen die weder eine Karte
+    aufdecken noch eine Karte zum Ablegen oder Anlegen frei machen werden zuletzt probiert.
+    Nur das Verschieben eines ganzen Stapels auf einen leeren Stapel wird ausgelassen.
+    Umdrehen mischt mit dem Zufallsgenerator der Stellung, die gefundenen Züge sind daher auf
+    dem `Spiel` genau nachspielbar. Da jedes Umdrehen neu mischt, endet eine Suche mit Umdrehen
+    meist mit `ABGEBROCHEN` statt `VERLOREN`. Mit `umdrehen=False` wird nur ein Durchgang durch
+    den Ziehstapel gesucht, `VERLOREN` bedeutet dann nur dass das Spiel in einem Durchgang
+    nicht gewonnen werden kann.
+    """
+
+    # Prüfe die Zeit nur alle so viele Knoten
+    ZEIT_INTERVALL = 1024
+
+    def __init__(self, max_knoten: int = 1000000, max_sekunden: float = None,
+                 umdrehen: bool = True, speicher=None) -> None:
+        """
+        Erstellt einen Löser.
+
+        max_knoten - `int` die maximale Anzahl an Stellungen die untersucht werden
+                     Default: 1000000
+        max_sekunden - `float` die maximale Dauer der Suche oder `None` für unbegrenzt
+                       Default: None
+        umdrehen - `bool` ob der Ablagestapel umgedreht werden darf
+                   Default: True
+        speicher - `LoesungsSpeicher` in dem Ergebnisse vor der Suche nachgeschlagen und nach
+                   der Suche gespeichert werden oder `None`
+                   Default: None
+        """
+        self.max_knoten = max_knoten
+        self.max_sekunden = max_sekunden
+        self.umdrehen = umdrehen
+        self.speicher = speicher
+
+    def schluessel(self, stellung: Stellung) -> str:
+        """
+        Gibt den Schlüssel zurück unter dem das Ergebnis der Stellung gespeichert wird oder
+        `None` wenn das Ergebnis nicht wiederholbar ist. Wird umgedreht, gehört der Zustand
+        des Zufallsgenerators dazu.
+
+        stellung - `Stellung` die gelöst wird
+        """
+        if not self.umdrehen:
+            return f"{stellung.zobrist():016x}"
+        if stellung.zufall is None:
+            return None
+        # nur die Zahlen des Zustands, der Hash von `None` ist nicht in jedem Prozess gleich
+        return f"{stellung.zobrist():016x}-{hash(stellung.zufall[1]) & HASH_MASKE:016x}"
+
+    @staticmethod
+    def _eintrag(stellung: Stellung) -> tuple:
+        """
+        Gibt den Eintrag der Stellung in der Transpositionstabelle zurück, wenn umgedreht wird
+        gehört wie beim `schluessel()` der Zustand des Zufallsgenerators dazu.
+        """
+        zufall = stellung.zufall
+        return stellung.zobrist(), hash(zufall[1]) if zufall is not None else None
+
+    @staticmethod
+    def _sicher(stellung: Stellung, c: int) -> bool:
+        """
+        Gibt `True` zurück wenn die Karte `c` ohne Nachteil abgelegt werden kann, weil sie
+        ein As oder eine Zwei ist oder beide Karten der anderen Farbe (rot, schwarz) die an
+        sie angelegt werden könnten bereits abgelegt sind.
+        """
+        farbe, hoehe = divmod(c >> 1, KARTEN_PRO_FARBE)
+        if hoehe <= 1:
+            return True
+        rot = KARTE_ROT[c >> 1]
+        return all(h >= hoehe for f, h in enumerate(stellung.ablagen)
+                   if KARTE_ROT[f * KARTEN_PRO_FARBE] != rot)
+
+    @staticmethod
+    def _rang(stellung: Stellung, zug: Zug, kind: Stellung) -> int:
+        """
+        Gibt den Rang des Zuges für die Sortierung zurück, kleinere Werte werden zuerst
+        probiert. Gibt `None` zurück wenn der Zug nicht probiert werden muss.
+        """
+        if zug.typ == ZugTyp.ABLEGEN:
+            return 0
+        elif zug.typ == ZugTyp.VERSCHIEBEN:
+            rest = len(kind.stapel[zug.von])
+            if rest == 0:
+                # ein ganzer Stapel auf einen leeren Stapel bringt nichts
+                return None if len(stellung.stapel[zug.zu]) == 0 else 1
+            c = stellung.stapel[zug.von][rest-1]
+            if not c & 1:
+                return 1
+            # kann die frei gewordene Karte abgelegt werden oder die Karte vom Ablagestapel
+            # aufnehmen lohnt sich der Zug eher, sonst wird er erst zum Schluss probiert
+            ablage = kind.stapel[Spiel.ABLAGE]
+            if kind.ablegbar(c) or (ablage and kind.anlegbar(zug.von, ablage[-1])):
+                return 4
+            return 6
+        elif zug.typ == ZugTyp.ANLEGEN:
+            return 2
+        elif zug.typ == ZugTyp.ZIEHEN:
+            return 3
+        elif zug.typ == ZugTyp.UMDREHEN:
+            return 5
+        return None
+
+    def kinder(self, stellung: Stellung) -> list[tuple[Zug, Stellung]]:
+        """
+        Gibt die Nachfolger der Stellung sortiert als `list[tuple[Zug, Stellung]]` zurück.
+        Kann eine Karte sicher abgelegt werden, ist das der einzige Nachfolger.
+        """
+        kinder = []
+        for zug in stellung.zuege():
+            if zug.typ == ZugTyp.UMDREHEN and not self.umdrehen:
+                continue
+            if zug.typ == ZugTyp.ABLEGEN and Loeser._sicher(stellung, stellung.stapel[zug.von][-1]):
+                return [(zug, stellung.ausfuehren(zug))]
+            kind = stellung.ausfuehren(zug)
+            rang = Loeser._rang(stellung, zug, kind)
+            if rang is not None:
+                kinder.append((rang, len(kinder), zug, kind))
+        kinder.sort()
+        return [(zug, kind) for _, _, zug, kind in kinder]
+
+    def loesen(self, spiel: Spiel) -> Loesung:
+        """
+        Sucht eine Zugfolge die das Spiel gewinnt und gibt das Ergebnis als `Loesung` zurück.
+        Die Züge können mit `Spiel.ausfuehren()` nachgespielt werden.
+
+        spiel - `Spiel`, `Spielstand` oder `Stellung` die gelöst wird
+        """
+        stellung = spiel if isinstance(spiel, Stellung) else Stellung.aus_spiel(spiel)
+        schluessel = self.schluessel(stellung) if self.speicher is not None else None
+        if schluessel is not None:
+            loesung = self.speicher.lesen(schluessel, self.max_knoten)
+            if loesung is not None:
+                LOG.info(f"Löser: {loesung.ergebnis.value} aus dem Speicher")
+                return loesung
+        start = perf_counter()
+        eintrag = self._eintrag if self.umdrehen else Stellung.zobrist
+        tabelle = {eintrag(stellung)}
+        knoten = 1
+        pfad = []
+        suche = [iter(self.kinder(stellung))]
+        ergebnis = Ergebnis.GEWONNEN if stellung.gewonnen() else Ergebnis.VERLOREN
+        while suche and ergebnis == Ergebnis.VERLOREN:
+            for zug, kind in suche[-1]:
+                if eintrag(kind) not in tabelle:
+                    break
+            else:
+                suche.pop()
+                if pfad:
+                    pfad.pop()
+                continue
+            tabelle.add(eintrag(kind))
+            knoten += 1
+            pfad.append(zug)
+            if kind.gewonnen():
+                ergebnis = Ergebnis.GEWONNEN
+            elif knoten >= self.max_knoten:
+                ergebnis = Ergebnis.ABGEBROCHEN
+            elif (self.max_sekunden is not None and knoten % Loeser.ZEIT_INTERVALL == 0 and
+                  perf_counter() - start > self.max_sekunden):
+                ergebnis = Ergebnis.ABGEBROCHEN
+            else:
+                suche.append(iter(self.kinder(kind)))
+
+        loesung = Loesung(ergebnis, pfad if ergebnis == Ergebnis.GEWONNEN else [],
+                          knoten, perf_counter() - start)
+        LOG.info(f"Löser: {loesung.ergebnis.value} nach {loesung.knoten} Knoten "
+                 f"({loesung.knoten_pro_sekunde():.0f} Knoten/s)")
+        if schluessel is not None:
+            self.speicher.schreiben(schluessel, loesung)
+        return loesung
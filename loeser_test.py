@@ -0,0 +1,83 @@
+import unittest
+from random import Random
+from loeser import Loeser, Ergebnis
+from stellung import Stellung
+from spiel import Spiel
+from cards import KARTEN_PRO_FARBE
+
+
+class LoeserTest(unittest.TestCase):
+
+    def _fast_gewonnen(self) -> Stellung:
+        herz_dame, herz_koenig = 11, 12
+        pik_koenig = 3 * KARTEN_PRO_FARBE + 12
+        stapel = ((herz_koenig*2, pik_koenig*2+1),) + ((),) * (Spiel.ANZAHL_ANLAGEN-1) + \
+            ((), (herz_dame*2,))
+        return Stellung(stapel, (11, 13, 13, 12))
+
+    def test_gewonnen(self):
+        st = self._fast_gewonnen()
+        loesung = Loeser().loesen(st)
+        self.assertEqual(Ergebnis.GEWONNEN, loesung.ergebnis)
+        self.assertEqual(4, len(loesung.zuege))
+        spiel = Spiel.aus_spielstand(st.spielstand())
+        for zug in loesung.zuege:
+            self.assertTrue(spiel.ausfuehren(zug))
+        self.assertTrue(spiel.gewonnen())
+
+    def test_verloren(self):
+        pik_koenig = 3 * KARTEN_PRO_FARBE + 12
+        stapel = ((pik_koenig*2+1,),) + ((),) * (Spiel.ANZAHL_ANLAGEN-1) + ((), ())
+        loesung = Loeser().loesen(Stellung(stapel, (13, 13, 13, 11)))
+        self.assertEqual(Ergebnis.VERLOREN, loesung.ergebnis)
+        self.assertEqual([], loesung.zuege)
+
+    def test_verschieben_ohne_aufdecken(self):
+        # der Herz König muss auf den leeren Stapel damit die Karo Dame den Pik Buben nimmt
+        b_karo, d_karo, k_karo, d_herz, k_herz = 10, 11, 12, 24, 25
+        z_pik, b_pik, d_pik, k_pik = 35, 36, 37, 38
+        stapel = ((k_karo*2, d_herz*2, d_karo*2+1, k_herz*2+1),
+                  (k_pik*2, d_pik*2, b_karo*2, z_pik*2, b_pik*2+1)) + \
+            ((),) * (Spiel.ANZAHL_ANLAGEN-2) + ((), ())
+        st = Stellung(stapel, (10, 11, 9, 13))
+        loesung = Loeser().loesen(st)
+        self.assertEqual(Ergebnis.GEWONNEN, loesung.ergebnis)
+        self.assertEqual("v13", str(loesung.zuege[0]))
+        spiel = Spiel.aus_spielstand(st.spielstand())
+        for zug in loesung.zuege:
+            self.assertTrue(spiel.ausfuehren(zug), msg=str(zug))
+        self.assertTrue(spiel.gewonnen())
+
+    def test_abgebrochen(self):
+        loesung = Loeser(max_knoten=2).loesen(Spiel())
+        self.assertEqual(Ergebnis.ABGEBROCHEN, loesung.ergebnis)
+        self.assertEqual(2, loesung.knoten)
+        self.assertGreater(loesung.knoten_pro_sekunde(), 0)
+
+    def test_zuege_nachspielen(self):
+        spiel = Spiel(nummer=17)
+        loesung = Loeser(max_knoten=20000).loesen(spiel)
+        self.assertEqual(Ergebnis.GEWONNEN, loesung.ergebnis)
+        for zug in loesung.zuege:
+            self.assertTrue(spiel.ausfuehren(zug), msg=str(zug))
+        self.assertTrue(spiel.gewonnen())
+
+    def test_umdrehen(self):
+        spiel = Spiel(nummer=2)
+        self.assertEqual(Ergebnis.VERLOREN, Loeser(umdrehen=False).loesen(spiel).ergebnis)
+        loesung = Loeser(max_knoten=50000).loesen(spiel)
+        self.assertEqual(Ergebnis.GEWONNEN, loesung.ergebnis)
+        self.assertIn("g", [str(z) for z in loesung.zuege])
+        for zug in loesung.zuege:
+            self.assertTrue(spiel.ausfuehren(zug), msg=str(zug))
+        self.assertTrue(spiel.gewonnen())
+
+    def test_tabelle_mit_zufall(self):
+        st = Stellung.aus_spiel(Spiel(nummer=2))
+        anders = Stellung(st.stapel, st.ablagen, st.punkte, Random(1).getstate())
+        self.assertEqual(st.zobrist(), anders.zobrist())
+        self.assertNotEqual(Loeser._eintrag(st), Loeser._eintrag(anders))
+
+
+if __name__ == "__main__":
+    unittest.main()
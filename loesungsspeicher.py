@@ -0,0 +1,112 @@
+from __future__ import annotations
+from loeser import Loesung, Ergebnis, REGEL_VERSION
+from spiel import Zug
+from pathlib import Path
+import sqlite3
+
+SPEICHER_PFAD = Path("~/.solitair/loesungen.sqlite")
+
+
+class LoesungsSpeicher(object):
+    """
+    Speichert die Ergebnisse des `Loeser` dauerhaft in einer sqlite Datenbank.
+
+    Die Ergebnisse werden unter einem Schlüssel (siehe `Loeser.schluessel()`) abgelegt.
+    Jedes Ergebnis wird mit `REGEL_VERSION` gespeichert, ändern sich die Regeln oder der
+    Löser werden alte Ergebnisse beim Öffnen gelöscht. Sind mehr als `max_eintraege`
+    gespeichert, werden die Einträge auf die am längsten nicht zugegriffen wurde gelöscht.
+    """
+
+    def __init__(self, pfad: Path = SPEICHER_PFAD, max_eintraege: int = 100000) -> None:
+        """
+        Öffnet den Speicher und legt die Datenbank an wenn sie noch nicht existiert.
+
+        pfad - `Path` die Datei der Datenbank oder ":memory:"
+               Default: ~/.solitair/loesungen.sqlite
+        max_eintraege - `int` die maximale Anzahl an gespeicherten Ergebnissen
+                        Default: 100000
+        """
+        if str(pfad) != ":memory:":
+            pfad = Path(pfad).expanduser()
+            pfad.parent.mkdir(parents=True, exist_ok=True)
+        self.max_eintraege = max_eintraege
+        self.db = sqlite3.connect(str(pfad))
+        self.db.execute("""CREATE TABLE IF NOT EXISTS loesungen (
+                               schluessel TEXT PRIMARY KEY,
+                               regeln INTEGER NOT NULL,
+                               ergebnis TEXT NOT NULL,
+                               zuege TEXT NOT NULL,
+                               knoten INTEGER NOT NULL,
+                               sekunden REAL NOT NULL,
+                               zugriff INTEGER NOT NULL)""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS loesungen_zugriff ON loesungen (zugriff)")
+        self.db.execute("DELETE FROM loesungen WHERE regeln != ?", (REGEL_VERSION,))
+        self.db.commit()
+        self._anzahl, self._zugriff = self.db.execute(
+            "SELECT COUNT(*), COALESCE(MAX(zugriff), 0) FROM loesungen").fetchone()
+
+    def _naechster_zugriff(self) -> int:
+        self._zugriff += 1
+        return self._zugriff
+
+    def __enter__(self) -> LoesungsSpeicher:
+        return self
+
+    def __exit__(self, *args):
+        self.schliessen()
+
+    def schliessen(self):
+        """
+        Schließt die Datenbank.
+        """
+        self.db.close()
+
+    def anzahl(self) -> int:
+        """
+        Gibt die Anzahl der gespeicherten Ergebnisse zurück.
+        """
+        return self._anzahl
+
+    def lesen(self, schluessel: str, max_knoten: int = None) -> Loesung:
+        """
+        Gibt das gespeicherte Ergebnis zum Schlüssel `schluessel` zurück oder `None`.
+        Ein abgebrochenes Ergebnis wird nur zurückgegeben wenn die Suche mindestens
+        `max_knoten` Knoten untersucht hat, ansonsten könnte eine größere Suche erfolgreich sein.
+
+        schluessel - `str` der Schlüssel der Stellung
+        max_knoten - `int` die Anzahl der Knoten die eine neue Suche untersuchen würde
+                     Default: None
+        """
+        zeile = self.db.execute("SELECT ergebnis, zuege, knoten, sekunden FROM loesungen "
+                                "WHERE schluessel = ?", (schluessel,)).fetchone()
+        if zeile is None:
+            return None
+        ergebnis = Ergebnis(zeile[0])
+        if ergebnis == Ergebnis.ABGEBROCHEN and (max_knoten is None or zeile[2] < max_knoten):
+            return None
+        self.db.execute("UPDATE loesungen SET zugriff = ? WHERE schluessel = ?",
+                        (self._naechster_zugriff(), schluessel))
+        self.db.commit()
+        return Loesung(ergebnis, [Zug.aus_text(z) for z in zeile[1].split()], zeile[2], zeile[3])
+
+    def schreiben(self, schluessel: str, loesung: Loesung):
+        """
+        Speichert das Ergebnis `loesung` unter dem Schlüssel `schluessel`.
+
+        schluessel - `str` der Schlüssel der Stellung
+        loesung - `Loesung` das Ergebnis des Löser
+        """
+        neu = self.db.execute("SELECT 1 FROM loesungen WHERE schluessel = ?",
+                              (schluessel,)).fetchone() is None
+        self.db.execute("INSERT OR REPLACE INTO loesungen VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (schluessel, REGEL_VERSION, loesung.ergebnis.value,
+                         " ".join([str(z) for z in loesung.zuege]), loesung.knoten,
+                         loesung.sekunden, self._naechster_zugriff()))
+        if neu:
+            self._anzahl += 1
+        if self._anzahl > self.max_eintraege:
+            self.db.execute("DELETE FROM loesungen WHERE schluessel IN (SELECT schluessel FROM "
+                            "loesungen ORDER BY zugriff LIMIT ?)",
+                            (self._anzahl - self.max_eintraege,))
+            self._anzahl = self.max_eintraege
+        self.db.commit()
@@ -0,0 +1,82 @@
+import unittest
+import tempfile
+from pathlib import Path
+from loesungsspeicher import LoesungsSpeicher
+from loeser import Loeser, Loesung, Ergebnis
+import loeser
+import loesungsspeicher
+from spiel import Spiel, Zug, ZugTyp
+from stellung import Stellung
+
+
+class LoesungsSpeicherTest(unittest.TestCase):
+
+    def _loesung(self, ergebnis: Ergebnis = Ergebnis.GEWONNEN, knoten: int = 10) -> Loesung:
+        return Loesung(ergebnis, [Zug(ZugTyp.ZIEHEN), Zug(ZugTyp.VERSCHIEBEN, von=1, zu=4)], knoten, 0.5)
+
+    def test_lesen_schreiben(self):
+        with LoesungsSpeicher(":memory:") as speicher:
+            self.assertIsNone(speicher.lesen("a"))
+            speicher.schreiben("a", self._loesung())
+            loesung = speicher.lesen("a")
+            self.assertEqual(Ergebnis.GEWONNEN, loesung.ergebnis)
+            self.assertEqual(["z", "v25"], [str(z) for z in loesung.zuege])
+            self.assertEqual(10, loesung.knoten)
+            speicher.schreiben("a", self._loesung(Ergebnis.VERLOREN))
+            self.assertEqual(Ergebnis.VERLOREN, speicher.lesen("a").ergebnis)
+            self.assertEqual(1, speicher.anzahl())
+
+    def test_abgebrochen(self):
+        with LoesungsSpeicher(":memory:") as speicher:
+            speicher.schreiben("a", self._loesung(Ergebnis.ABGEBROCHEN, knoten=100))
+            self.assertIsNone(speicher.lesen("a"))
+            self.assertIsNone(speicher.lesen("a", max_knoten=1000))
+            self.assertEqual(Ergebnis.ABGEBROCHEN, speicher.lesen("a", max_knoten=100).ergebnis)
+
+    def test_verdraengen(self):
+        with LoesungsSpeicher(":memory:", max_eintraege=2) as speicher:
+            speicher.schreiben("a", self._loesung())
+            speicher.schreiben("b", self._loesung())
+            speicher.lesen("a")
+            speicher.schreiben("c", self._loesung())
+            self.assertEqual(2, speicher.anzahl())
+            self.assertIsNone(speicher.lesen("b"))
+            self.assertIsNotNone(speicher.lesen("a"))
+            self.assertIsNotNone(speicher.lesen("c"))
+
+    def test_regel_version(self):
+        with tempfile.TemporaryDirectory() as verzeichnis:
+            pfad = Path(verzeichnis, "speicher.sqlite")
+            with LoesungsSpeicher(pfad) as speicher:
+                speicher.schreiben("a", self._loesung())
+            with LoesungsSpeicher(pfad) as speicher:
+                self.assertIsNotNone(speicher.lesen("a"))
+            version = loeser.REGEL_VERSION
+            loesungsspeicher.REGEL_VERSION = version + 1
+            try:
+                with LoesungsSpeicher(pfad) as speicher:
+                    self.assertEqual(0, speicher.anzahl())
+                    self.assertIsNone(speicher.lesen("a"))
+            finally:
+                loesungsspeicher.REGEL_VERSION = version
+
+    def test_loeser(self):
+        with LoesungsSpeicher(":memory:") as speicher:
+            l = Loeser(max_knoten=20000, speicher=speicher)
+            loesung = l.loesen(Spiel(nummer=17))
+            self.assertEqual(1, speicher.anzahl())
+            gespeichert = l.loesen(Spiel(nummer=17))
+            self.assertEqual(loesung.zuege, gespeichert.zuege)
+            self.assertEqual(1, speicher.anzahl())
+
+    def test_schluessel(self):
+        stellung = Stellung.aus_spiel(Spiel(nummer=1))
+        self.assertNotEqual(Loeser(umdrehen=False).schluessel(stellung), Loeser().schluessel(stellung))
+        self.assertEqual(Loeser(umdrehen=True).schluessel(stellung),
+                         Loeser(umdrehen=True).schluessel(Stellung.aus_spiel(Spiel(nummer=1))))
+        # ohne Zufallsgenerator ist das Umdrehen nicht wiederholbar
+        self.assertIsNone(Loeser(umdrehen=True).schluessel(Stellung.aus_spiel(stellung.spielstand())))
+
+
+if __name__ == "__main__":
+    unittest.main()
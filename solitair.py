@@ -1,14 +1,22 @@
-from time import sleep
-from cards import Karte, Stapel, AnlageStapel, AblageStapel, Farbe, KartenTyp
-from ascii import AsciiScreen, AsciiStapel, karten_breite, karten_hoehe, str_karte
-from collections import deque
+from cards import Karte, Stapel, AblageStapel
+from ascii import AsciiScreen, AsciiStapel, karten_breite, karten_hoehe, karten_zeilen
+from animation import Animator, Bewegung
+from tastatur import Tastatur
 import logging
 import re
+import sys
 from logging.config import dictConfig
 from json import load as jload
 from spielstand import Spielstand
+from spiel import Spiel, Zug, ZugTyp
+from tipp import TippGeber
+from stellung import Stellung
+from loesungsspeicher import LoesungsSpeicher, SPEICHER_PFAD
 from datetime import datetime
+from argparse import ArgumentParser
+from time import perf_counter
 from pathlib import Path
+from shutil import get_terminal_size
 
 LOG = logging.getLogger("solitair")
 
@@ -29,145 +37,253 @@ class Solitair(object):
         ╚══════╝ ╚═════╝ ╚══════╝╚═╝   ╚═╝   ╚═╝  ╚═╝╚═╝╚═╝  ╚═╝
                         (c) 2023 Stefan Langer"""
 
-    COMMANDS = {"z": {"text": "[z]iehen", "method": "self._ziehen()"},
-                "a": {"text": "[a]nlegen", "method": "self._anlegen()"},
-                "b": {"text": "a[b]legen", "method": "self._ablegen()"},
-                "v": {"text": "[v]erschieben", "method": "self._verschieben()"},
-                "u": {"text": "[u]ndo", "method": "self._undo()"},
-                "g": {"text": "neu [g]eben", "method": "self._umdrehen()"},
-                "m": {"text": "neu [m]ischen", "method": "self._neu_mischen()"},
-                "s": {"text": "[s]peichern", "method": "self._speichern()"},
-                "l": {"text": "[l]aden", "method": "self._laden()"},
-                "e": {"text": "be[e]nden", "method": "self._ende()"}, }
+    # Die Kommandos des Menüs: die Taste, der Text im Menü, der Name der Methode und ob das
+    # Kommando das Spiel verändert. Weitere Kommandos können mit `registrieren()` hinzugefügt werden.
+    COMMANDS = {"z": {"text": "[z]iehen", "method": "_ziehen", "veraendernd": True},
+                "a": {"text": "[a]nlegen", "method": "_anlegen", "veraendernd": True},
+                "b": {"text": "a[b]legen", "method": "_ablegen", "veraendernd": True},
+                "v": {"text": "[v]erschieben", "method": "_verschieben", "veraendernd": True},
+                "u": {"text": "[u]ndo", "method": "_undo", "veraendernd": True},
+                "r": {"text": "[r]edo", "method": "_redo", "veraendernd": True},
+                "t": {"text": "[t]ipp", "method": "_tipp", "veraendernd": False},
+                "g": {"text": "neu [g]eben", "method": "_umdrehen", "veraendernd": True},
+                "m": {"text": "neu [m]ischen", "method": "_neu_mischen", "veraendernd": True},
+                "s": {"text": "[s]peichern", "method": "_speichern", "veraendernd": False},
+                "l": {"text": "[l]aden", "method": "_laden", "veraendernd": True},
+                "e": {"text": "be[e]nden", "method": "_ende", "veraendernd": False}, }
+
+    # maximale Zeit in Sekunden die für einen Tipp gesucht wird
+    TIPP_SEKUNDEN = 0.2
+    # Dauer in Sekunden der Animation einer Karte zur Ablage
+    ANIMATION_DAUER = 0.15
+    # Bilder pro Sekunde der Animationen
+    ANIMATION_FPS = 30
+
+    # die Buchstaben der Züge die mit den Stapeln eingegeben werden können, z.B. `v25`
+    ZUEGE = [t.value for t in ZugTyp]
+    # Steuerfolgen wie Pfeiltasten, die bei der Eingabe einzelner Tasten entfernt werden
+    STEUERFOLGE = re.compile(r"\x1b(\[[0-?]*[ -/]*[@-~]|O.|.)?")
 
     DATEI_LISTE_WIDTH = 45
     DATEI_LISTE_HEIGHT = 23
 
-    MAX_UNDOS = 10
-
-    def __init__(self) -> None:
+    def __init__(self, nummer: int = None, animation: bool = True) -> None:
         '''
         Der Konstruktor für die Klasse Solitair. Im Konstruktor werden die verschiedenen Spielelemente
         erzeugt.
-        1. Der Stapel von dem Karten gezogen werden
-        2. Die Ablagestapel wo die Karten final abgelegt werden
-        3. Die 7 Anlagestapel wo die Karten während des Spiels sortiert werden
-        4. Der AsciiScreen auf den das Spielfeld dargestellt wird
-        5. Das Menü und die Navigationshilfen um das Spiel zu bedienen
+        1. Das `Spiel` mit den Stapeln und der Spiellogik und der `TippGeber`
+        2. Der AsciiScreen auf den das Spielfeld dargestellt wird
+        3. Das Menü und die Navigationshilfen um das Spiel zu bedienen
+
+        nummer - `int` die Nummer des Spiels, bei `None` wird eine zufällige Nummer gewählt
+                 Default: None
+        animation - `bool` ob das automatische Ablegen animiert wird
+                    Default: True
         '''
-        self.ziehStapel = Stapel(karten=[Karte(col, type) for col in list(Farbe)
-                                         for type in list(KartenTyp)])
-        self.ziehStapel.shuffle()
-        self.ablageStapel = Stapel()
-        self.ablagen = [AblageStapel(farbe=Farbe.HERZ),
-                        AblageStapel(farbe=Farbe.KARO),
-                        AblageStapel(farbe=Farbe.KREUZ),
-                        AblageStapel(farbe=Farbe.PIK)]
-        self.screen = AsciiScreen(width=74, height=karten_hoehe()*2 + 31)
+        self.spiel = Spiel(nummer)
+        self.tipp_geber = TippGeber(Solitair.TIPP_SEKUNDEN)
+        self.animation = animation
+        self.screen = AsciiScreen(width=74, height=karten_hoehe()*2 + 32)
+        self.tastatur = Tastatur()
+        # bereits gelesene Tasten die zum nächsten Kommando gehören
+        self._tasten_rest = ""
+        self.animator = Animator(self.screen, self.tastatur, Solitair.ANIMATION_FPS)
         self.navigation = False
         self.navigation_anlage = False
         self.navigation_ablage = False
         self.status_msg = ""
         self.datei_liste = ""
-        self.punkte = 0
-        self.anlageStapel = [AsciiStapel(AnlageStapel(karten=self._initAnlage(i+1)))
-                             for i in range(7)]
-        self.speicher = deque(maxlen=Solitair.MAX_UNDOS)
+        self._ascii_anlagen = []
+        self._hintergrund_nummer = None
+        # je Platz auf dem Spielfeld der zuletzt gezeichnete Stapel, siehe `_stapel_zeichnen()`
+        self._gezeichnet = {}
+        self._terminal_groesse = None
+        self._stellung = None
+        self.kommandos = {}
+        for taste, k in Solitair.COMMANDS.items():
+            self.registrieren(taste, k["text"], getattr(self, k["method"]), k["veraendernd"])
+
+    def registrieren(self, taste: str, text: str, handler, veraendernd: bool = True):
+        """
+        Registriert das Kommando `handler` unter der Taste `taste` im Menü. Damit können neue
+        Kommandos hinzugefügt oder bestehende ersetzt werden.
 
-    def _initAnlage(self, kartenZiehen: int) -> list[Karte]:
+        taste - `str` die Taste mit der das Kommando im Menü gewählt wird, ein einzelnes Zeichen
+        text - `str` der Text des Kommandos im Menü
+        handler - die Funktion oder gebundene Methode die ohne Parameter aufgerufen wird
+        veraendernd - `bool` ob das Kommando das Spiel verändert. Nur dann wird das Spielfeld
+                      neu gezeichnet und die Stellung für die Suche neu erzeugt.
+                      Default: True
         """
-        Hilfs methode um die Anlagestapel zu initialisieren.
-        Die methode zieht die angegebenen Anzahl von Karten vom Stapel und gibt sie als list[Karte] zurück.
+        self.kommandos[taste] = {"text": text, "handler": handler, "veraendernd": veraendernd}
+        self.screen.clear_screen(AsciiScreen.HINTERGRUND)
 
-        kartenZiehen - `int` die Anzahl der verdeckten Karten die zurückgegeben werden
+    def _stellung_erzeugen(self) -> Stellung:
         """
-        karten = []
-        for i in range(kartenZiehen):
-            karten.append(self.ziehStapel.ziehen())
-            if i == kartenZiehen-1:
-                karten[i].aufdecken()
-        return karten
+        Gibt die `Stellung` des Spiels für den `TippGeber` zurück. Die Stellung wird nur nach
+        einem verändernden Kommando neu erzeugt.
+        """
+        if self._stellung is None:
+            self._stellung = Stellung.aus_spiel(self.spiel)
+        return self._stellung
+
+    @property
+    def ziehStapel(self) -> Stapel:
+        return self.spiel.ziehStapel
+
+    @ziehStapel.setter
+    def ziehStapel(self, stapel: Stapel):
+        self.spiel.ziehStapel = stapel
+
+    @property
+    def ablageStapel(self) -> Stapel:
+        return self.spiel.ablageStapel
+
+    @ablageStapel.setter
+    def ablageStapel(self, stapel: Stapel):
+        self.spiel.ablageStapel = stapel
+
+    @property
+    def ablagen(self) -> list[AblageStapel]:
+        return self.spiel.ablagen
 
-    def _undo_speicher_str(self) -> str:
-        return f"[{','.join([str(s.id) for s in self.speicher])}]"
+    @ablagen.setter
+    def ablagen(self, ablagen: list[AblageStapel]):
+        self.spiel.ablagen = ablagen
+
+    @property
+    def punkte(self) -> int:
+        return self.spiel.punkte
+
+    @property
+    def anlageStapel(self) -> list[AsciiStapel]:
+        """
+        Gibt die Anlagestapel des Spiels als `AsciiStapel` zurück. Die Hüllen werden nur neu
+        erzeugt wenn das Spiel seine Anlagestapel ausgetauscht hat.
+        """
+        anlagen = self.spiel.anlageStapel
+        if len(anlagen) != len(self._ascii_anlagen) or any(
+                a.stapel is not s for a, s in zip(self._ascii_anlagen, anlagen)):
+            self._ascii_anlagen = [AsciiStapel(s) for s in anlagen]
+        return self._ascii_anlagen
 
     def _spielstand_erzeugen(self) -> Spielstand:
-        return Spielstand([s.stapel for s in self.anlageStapel], self.ziehStapel,
-                          self.ablageStapel, self.ablagen, self.punkte)
-
-    def _spielstand_sichern(self, spielstand: Spielstand):
-        letzter = self._letzter_gesicherter_spielstand()
-        if spielstand == letzter:
-            LOG.info("Letzer Spielstand %s == Spielstand %s! Spielstand %s nicht gesichert!",
-                     letzter.id, spielstand.id, spielstand.id)
-        else:
-            LOG.info("Spielstand %s gesichert!", spielstand.id)
-            LOG.debug("%s", spielstand)
-            self.speicher.append(spielstand)
-            LOG.debug("Undo Speicher %s", self._undo_speicher_str())
+        return self.spiel.spielstand()
 
     def _spielstand_herstellen(self, spielstand: Spielstand):
         LOG.info("Herstellen von Spielstand %s!", spielstand.id)
         LOG.debug("Spielstand: %s", spielstand)
-        self.ablagen = spielstand.ablagen
-        self.ablageStapel = spielstand.ablageStapel
-        self.anlageStapel = [AsciiStapel(s) for s in spielstand.anlageStapel]
-        self.ziehStapel = spielstand.ziehStapel
-        self.punkte = spielstand.punkte
+        self.spiel.herstellen(spielstand)
 
-    def _spielzug_zurueck_nehmen(self) -> Spielstand:
-        if len(self.speicher) > 0:
-            sp = self.speicher.pop()
-            LOG.info("Zug zurueck genommen! Spielstand %s", sp.id)
-            LOG.debug("Undo Speicher %s", self._undo_speicher_str())
-            return sp
-        return None
-
-    def _letzter_gesicherter_spielstand(self) -> Spielstand:
-        return self.speicher[-1] if len(self.speicher) > 0 else None
-
-    def _punkte_hinzufügen(self, punkte: int) -> int:
-        self.punkte += punkte
-        return self.punkte
+    def _hintergrund_zeichnen(self) -> None:
+        """
+        Schreibt die unveränderlichen Teile des Spielfelds in die Hintergrundebene: das Menü,
+        die Nummer des Spiels und die leeren Plätze der Stapel. Die Ebene wird nur neu
+        geschrieben wenn sie gelöscht wurde oder sich die Nummer des Spiels geändert hat.
+        """
+        if not self.screen.ebene_leer(AsciiScreen.HINTERGRUND) and self._hintergrund_nummer == self.spiel.nummer:
+            return
+        self._hintergrund_nummer = self.spiel.nummer
+        hintergrund = AsciiScreen.HINTERGRUND
+        self.screen.clear_screen(hintergrund)
+        if self.spiel.nummer is not None:
+            self.screen.write_to_screen(f"Spiel Nr. {self.spiel.nummer}", 2, 0, hintergrund)
+        for idx in range(len(self.ablagen)):
+            self.screen.write_to_screen(karten_zeilen(None), karten_breite()*idx+2, 1, hintergrund)
+        self.screen.write_to_screen(karten_zeilen(None), self.screen.width - karten_breite()*2-2, 1, hintergrund)
+        self.screen.write_to_screen(karten_zeilen(None), self.screen.width - karten_breite()-2, 1, hintergrund)
+        for idx in range(len(self.anlageStapel)):
+            self.screen.write_to_screen(karten_zeilen(None), karten_breite()*idx+2, karten_hoehe()+4, hintergrund)
+        self.screen.write_to_screen(self._menue(), 0, karten_hoehe()*2 + 28, hintergrund)
+
+    def _spielfeld_zeichnen(self) -> None:
+        """
+        Schreibt die Punkte und die Karten auf den Stapeln in die Ebene des Spielfelds. Es
+        werden nur die Stapel neu geschrieben die sich seit dem letzten Zeichnen geändert haben,
+        siehe `_stapel_zeichnen()`. Leere Stapel werden vom Hintergrund dargestellt.
+        """
+        if self.screen.ebene_leer(AsciiScreen.SPIELFELD):
+            self._gezeichnet = {}
+        if self._gezeichnet.get("punkte") != self.punkte:
+            self._gezeichnet["punkte"] = self.punkte
+            score_txt = f"Punkte: {self.punkte:>4}"
+            self.screen.write_to_screen(
+                score_txt, self.screen.width - len(score_txt) - 3)
+        for idx, a in enumerate(self.ablagen):
+            self._stapel_zeichnen(("ablage", idx), a, karten_breite()*idx+2, 1)
+        self._stapel_zeichnen("ablageStapel", self.ablageStapel,
+                              self.screen.width - karten_breite()*2-2, 1)
+        self._stapel_zeichnen("ziehStapel", self.ziehStapel,
+                              self.screen.width - karten_breite()-2, 1)
+        for idx, a in enumerate(self.anlageStapel):
+            self._stapel_zeichnen(("anlage", idx), a.stapel,
+                                  karten_breite()*idx+2, karten_hoehe()+4, a)
 
-    def _zeichnen(self) -> None:
+    def _stapel_zeichnen(self, schluessel, stapel: Stapel, x: int, y: int, ascii_stapel: AsciiStapel = None) -> None:
         """
-        Malt das Spielfeld in dem es die notwendigen Ascii zeichen auf den AsciiScreen schreibt und anschliessend
-        print aufruft.
+        Schreibt den Stapel an die Stelle x,y in die Ebene des Spielfelds wenn sich der Stapel
+        oder seine `Stapel.version()` seit dem letzten Zeichnen geändert hat. Vorher wird der
+        Bereich gelöscht den der Stapel zuletzt belegt hat.
 
-        Siehe auch self.write_to_screen()
+        schluessel - der Platz des Stapels, unter dem die gezeichnete Version gemerkt wird
+        stapel - `Stapel` der gezeichnet wird
+        x - `int` x-Koordinate des Stapels
+        y - `int` y-Koordinate des Stapels
+        ascii_stapel - `AsciiStapel` für gefächerte Stapel oder `None` um nur die oberste Karte zu zeichnen
+                       Default: None
         """
-        score_txt = f"Punkte: {self.punkte:>4}"
-        self.screen.write_to_screen(
-            score_txt, self.screen.width - len(score_txt) - 3)
-        for idx, a in enumerate(self.ablagen):
-            self.screen.write_to_screen(str_karte(a.top()),
-                                        karten_breite()*idx+2, 1)
+        alt = self._gezeichnet.get(schluessel)
+        version = stapel.version()
+        if alt is not None and alt[0] is stapel and alt[1] == version:
+            return
+        if alt is not None:
+            self.screen.bereich_loeschen(x, y, alt[2], alt[3])
+        zeilen = ()
+        if not stapel.leer():
+            zeilen = ascii_stapel.zeilen() if ascii_stapel is not None else karten_zeilen(stapel.top())
+            self.screen.write_to_screen(zeilen, x, y)
+        self._gezeichnet[schluessel] = (stapel, version, max([len(z) for z in zeilen], default=0), len(zeilen))
 
-        self.screen.write_to_screen(str_karte(self.ablageStapel.top()),
-                                    self.screen.width - karten_breite()*2-2, 1)
+    def _overlay_zeichnen(self) -> None:
+        """
+        Schreibt die vorübergehenden Inhalte neu in das Overlay: die Navigationshilfe, die
+        Statusnachricht und die Dateiauswahl.
+        """
+        overlay = AsciiScreen.OVERLAY
+        self.screen.clear_screen(overlay)
         if self.navigation_ablage:
             self.screen.write_to_screen(
-                f"[{len(self.anlageStapel)+1}]", self.screen.width - karten_breite()*2-1, karten_hoehe()+1)
-        self.screen.write_to_screen(str_karte(self.ziehStapel.top()),
-                                    self.screen.width - karten_breite()-2, 1)
-
-        for idx, a in enumerate(self.anlageStapel):
-            self.screen.write_to_screen(
-                a.printFanned(), karten_breite()*idx+2, karten_hoehe()+4)
-            if self.navigation_anlage:
+                f"[{len(self.anlageStapel)+1}]", self.screen.width - karten_breite()*2-1, karten_hoehe()+1, overlay)
+        if self.navigation_anlage:
+            for idx in range(len(self.anlageStapel)):
                 self.screen.write_to_screen(
-                    f"[{idx+1}]", karten_breite()*idx+3, karten_hoehe()+3)
-
-        self.screen.write_to_screen(
-            self._menue(), 0, karten_hoehe()*2 + 28)
-        self.screen.write_to_screen(
-            self.status_msg, 2, karten_hoehe()*2 + 26)
-
+                    f"[{idx+1}]", karten_breite()*idx+3, karten_hoehe()+3, overlay)
+        if self.status_msg:
+            self.screen.write_to_screen(
+                self.status_msg, 2, karten_hoehe()*2 + 26, overlay)
         if self.datei_liste:
             self.screen.write_to_screen(self.datei_liste, int(
-                self.screen.width/2-Solitair.DATEI_LISTE_WIDTH/2), int(self.screen.height/2-Solitair.DATEI_LISTE_HEIGHT/2)-4)
+                self.screen.width/2-Solitair.DATEI_LISTE_WIDTH/2), int(self.screen.height/2-Solitair.DATEI_LISTE_HEIGHT/2)-4, overlay)
+
+    def _zeichnen(self, spielfeld: bool = True) -> None:
+        """
+        Malt das Spielfeld in dem es die notwendigen Ascii zeichen auf die Ebenen des AsciiScreen schreibt und anschliessend
+        print aufruft. Der Hintergrund wird nur bei Bedarf neu geschrieben.
+
+        Siehe auch self.write_to_screen()
 
+        spielfeld - `bool` ob das Spielfeld neu geschrieben wird, bei `False` nur wenn es gelöscht wurde
+                    Default: True
+        """
+        groesse = get_terminal_size()
+        if groesse != self._terminal_groesse:
+            # nach einer Größenänderung stimmt das zuletzt ausgegebene Bild nicht mehr
+            self._terminal_groesse = groesse
+            self.screen.invalidate()
+        self._hintergrund_zeichnen()
+        if spielfeld or self.screen.ebene_leer(AsciiScreen.SPIELFELD):
+            self._spielfeld_zeichnen()
+        self._overlay_zeichnen()
         self.screen.print()
 
     def _zeichne_dateiauswahl(self, speicherDir: Path, laden: bool = False) -> Path:
@@ -208,32 +324,116 @@ class Solitair(object):
 
     def _menue(self) -> str:
         """
-        Generiert das Menü, dass in `Solitair.COMMANDS` definiert ist.
+        Generiert das Menü aus den registrierten Kommandos, siehe `registrieren()`.
         """
-        menu = "".join(["─" for i in range(self.screen.width)]) + "\n"
+        menu = "─" * self.screen.width + "\n"
         idx = 1
-        for cmd in [v["text"] for k, v in Solitair.COMMANDS.items()]:
+        for cmd in [v["text"] for k, v in self.kommandos.items()]:
             menu += f"{cmd:<15}"
             if idx % 5 == 0:
                 menu += "\n"
             idx += 1
         return menu
 
-    def _eingabe(self):
+    def _eingabe(self) -> bool:
         """
-        Verarbeitet die Menüeingaben. Die Eingabe wird gegen self.COMMANDOS geprüft. Wird das Kommando
-        gefunden wird die hinterlegte methode ausgeführt. Ansonsten wird eine Fehlermeldung ausgegeben.
+        Verarbeitet die Menüeingaben. Ein vollständiger Zug wie `v25`, `a3` oder `b8` wird direkt
+        ausgeführt, siehe `Zug.aus_text()`. Ansonsten wird die Eingabe gegen self.kommandos geprüft.
+        Wird das Kommando gefunden wird der hinterlegte handler ausgeführt, der z.B. nach den Stapeln fragt.
+        Ansonsten wird eine Fehlermeldung ausgegeben.
+        Gibt `True` zurück wenn die Eingabe das Spiel verändert haben kann ansonsten `False`.
         """
-        eingabe: str = input("Option: ").lower().strip()
-        if eingabe in Solitair.COMMANDS:
-            sp = self._spielstand_erzeugen()
-            LOG.info("Spielstand %s erzeugt!", sp.id)
-            exec(Solitair.COMMANDS[eingabe]["method"])
-            if eingabe.lower() != "u":
-                self._spielstand_sichern(sp)
-        else:
-            self._schreibe_status(
-                f"Ungültige eingabe: {eingabe}! Bitte wählen sie eine gültige Option.")
+        eingabe: str = self._befehl_lesen("Option: ").lower().strip()
+        if len(eingabe) > 1 and eingabe[0] in Solitair.ZUEGE:
+            try:
+                zug = Zug.aus_text(eingabe)
+            except ValueError:
+                self._schreibe_status(
+                    f"Ungültiger Zug: {eingabe}! Bitte geben sie z.B. v25 ein.")
+                return False
+            if not self.spiel.ausfuehren(zug):
+                self._schreibe_status(f"Der Zug {zug} ist nicht möglich!")
+                return False
+            return True
+        elif eingabe in self.kommandos:
+            kommando = self.kommandos[eingabe]
+            kommando["handler"]()
+            return kommando["veraendernd"]
+        self._schreibe_status(
+            f"Ungültige eingabe: {eingabe}! Bitte wählen sie eine gültige Option.")
+        return False
+
+    def _befehl_lesen(self, msg: str) -> str:
+        """
+        Liest ein Kommando. Im Terminal wird Taste für Taste gelesen und die Eingabe ohne Enter
+        beendet sobald sie ein vollständiger Zug oder ein Kommando ist, siehe `Zug.text_vollstaendig()`.
+        Mit Enter wird die Eingabe vorher beendet, z.B. nach `v` um die Stapel danach einzeln
+        auszuwählen. Werden mehrere Tasten auf einmal gelesen, bleiben die Tasten nach dem Ende
+        der Eingabe für den nächsten Aufruf erhalten. Ohne Terminal wird wie bei `_lesen()` eine
+        Zeile gelesen.
+
+        msg - `str` die Frage für die Eingabe
+        """
+        if not self.tastatur.interaktiv():
+            return self._lesen(msg)
+        text = ""
+        sys.stdout.write(msg)
+        sys.stdout.flush()
+        self.tipp_geber.nachdenken(self._stellung_erzeugen())
+        try:
+            with self.tastatur:
+                while not Zug.text_vollstaendig(text):
+                    if self._tasten_rest:
+                        taste, self._tasten_rest = self._tasten_rest, ""
+                    else:
+                        # Steuerfolgen wie Pfeiltasten werden ignoriert, die Tasten danach nicht
+                        taste = Solitair.STEUERFOLGE.sub("", self.tastatur.warten(None))
+                    for idx, ch in enumerate(taste):
+                        if ch in "\r\n":
+                            self._tasten_rest = taste[idx+1:].lstrip("\n")
+                            return text
+                        elif ch in "\x7f\b":
+                            if text:
+                                text = text[:-1]
+                                sys.stdout.write("\b \b")
+                        elif ch.isprintable():
+                            # wie bei `input()` zählen auch Großbuchstaben, z.B. mit Caps-Lock
+                            text += ch.lower()
+                            sys.stdout.write(ch)
+                        if Zug.text_vollstaendig(text):
+                            # schnell getippte Tasten gehören zum nächsten Kommando
+                            self._tasten_rest = taste[idx+1:]
+                            break
+                    sys.stdout.flush()
+        finally:
+            self.tipp_geber.anhalten()
+        return text
+
+    def _lesen(self, msg: str) -> str:
+        """
+        Liest eine Eingabe mit `input()`. Solange der Spieler überlegt, sucht der `TippGeber`
+        im Hintergrund nach dem besten Zug, so dass ein folgender Tipp sofort vorliegt.
+        Da `input()` am Bildschirm vorbei schreibt, wird der Bildschirm danach ganz neu gezeichnet.
+        Bereits mit dem letzten Kommando gelesene Tasten, siehe `_befehl_lesen()`, werden zuerst
+        verwendet. Enthalten sie eine ganze Zeile, wird nicht auf eine Eingabe gewartet.
+
+        msg - `str` die Frage für die Eingabe
+        """
+        rest, self._tasten_rest = self._tasten_rest, ""
+        ende = re.search(r"[\r\n]", rest)
+        if ende is not None:
+            # die Zeile wurde schon mit dem letzten Kommando getippt
+            self._tasten_rest = rest[ende.end():].lstrip("\n")
+            sys.stdout.write(f"{msg}{rest[:ende.start()]}\n")
+            self.screen.invalidate()
+            return rest[:ende.start()]
+        self.tipp_geber.nachdenken(self._stellung_erzeugen())
+        try:
+            return rest + input(msg + rest)
+        finally:
+            self.tipp_geber.anhalten()
+            # die Eingabe kann das Terminal verschoben haben
+            self.screen.invalidate()
 
     def _schreibe_status(self, text: str):
         """
@@ -254,7 +454,7 @@ class Solitair(object):
         """
         num = ""
         while True:
-            num = input(msg).strip()
+            num = self._lesen(msg).strip()
             if num.isdigit() and int(num) in range:
                 return int(num)
             else:
@@ -286,7 +486,7 @@ class Solitair(object):
         frage - `str` Die Ja-Nein-Frage die gestellt werden soll.
         """
         while True:
-            eingabe = input(f"{frage} (j/n)")
+            eingabe = self._lesen(f"{frage} (j/n)")
             if eingabe.lower() == "j":
                 return True
             elif eingabe.lower() == "n":
@@ -316,26 +516,43 @@ class Solitair(object):
         Zunächst wird gepräft ob der Ziehstapel leer ist und falls ja werden die Karten
         auf dem Ablagestapel neugemischt und verdeckt auf den Ziehstapel abgelegt.
         """
-        if self.ziehStapel.leer():
-            k = self.ablageStapel.ziehen()
-            while k:
-                self.ziehStapel.anlegen(k.zudecken())
-                k = self.ablageStapel.ziehen()
-            self.ziehStapel.shuffle()
-            self._punkte_hinzufügen(-20)
-            LOG.info("Ziehstapel neu gemischt!")
-        else:
+        if not self.spiel.umdrehen():
             self._schreibe_status(
                 "Umdrehen nicht möglich, es sind noch Karten auf dem Stapel!")
 
     def _undo(self):
         if self._ja_nein_frage("Wollen sie den Zug wirklich zurücknehmen?"):
-            sp = self._spielzug_zurueck_nehmen()
-            if sp:
-                self._spielstand_herstellen(sp)
-            else:
+            if not self.spiel.rueckgaengig():
                 self._schreibe_status("Sie können nicht weiter zurück gehen!")
 
+    def _redo(self):
+        if not self.spiel.wiederholen():
+            self._schreibe_status("Es gibt keinen Zug zum Wiederholen!")
+
+    def _tipp(self):
+        """
+        Sucht höchstens `TIPP_SEKUNDEN` lang nach dem besten Zug und zeigt ihn in der
+        Statuszeile an. Bekannte Lösungen aus dem `LoesungsSpeicher` und die Ergebnisse der
+        Suche während der letzten Eingabe werden genutzt. Der Speicher wird beim ersten Tipp
+        geöffnet und bleibt bis zum Ende des Spiels offen, siehe `_speicher_schliessen()`.
+        """
+        if self.tipp_geber.speicher is None and SPEICHER_PFAD.expanduser().exists():
+            self.tipp_geber.speicher = LoesungsSpeicher(SPEICHER_PFAD)
+        tipp = self.tipp_geber.tipp(self._stellung_erzeugen())
+        if tipp.zug() is None:
+            self._schreibe_status("Es gibt keinen sinnvollen Zug mehr!")
+        else:
+            self._schreibe_status(
+                f"Tipp: {tipp.zug()} ({tipp.knoten} Stellungen, Tiefe {tipp.tiefe})")
+
+    def _speicher_schliessen(self):
+        """
+        Schließt den `LoesungsSpeicher` des `TippGeber` falls er geöffnet wurde.
+        """
+        if self.tipp_geber.speicher is not None:
+            self.tipp_geber.speicher.schliessen()
+            self.tipp_geber.speicher = None
+
     def _speichern(self):
         speicherDir = Path("~/.solitair").expanduser()
         auswahl = self._zeichne_dateiauswahl(speicherDir)
@@ -376,10 +593,7 @@ class Solitair(object):
         Es wird eine Karte vom Stapel gezogen und auf den Ablagestapel gelegt.
         """
         LOG.info("Karte ziehen")
-        k = self.ziehStapel.ziehen()
-        if k:
-            LOG.debug("Karte %s gezogen und abgelegt", k)
-            self.ablageStapel.anlegen(k.aufdecken())
+        self.spiel.ziehen()
 
     def _ablegen(self):
         """
@@ -399,25 +613,10 @@ class Solitair(object):
             return
 
         idx = auswahl-1
-        if idx < len(self.anlageStapel):
-            stapel = self.anlageStapel[idx].stapel
-        elif idx == len(self.anlageStapel):
-            stapel = self.ablageStapel
-
-        k = stapel.top()
-        msg = ""
-        if k:
-            for s in self.ablagen:
-                if k.farbe == s.farbe:
-                    if s.anlegbar(k):
-                        s.anlegen(stapel.ziehen())
-                        stapel.aufdecken()
-                        self._punkte_hinzufügen(10)
-                        LOG.info(f"Karte {str(k)} abgelegt!")
-                        break
-                    else:
-                        msg = f"Karte {str(k)} kann nicht abgelegt werden!"
-            self._schreibe_status(msg)
+        k = self.spiel.von_stapel(idx).top()
+        if k and not self.spiel.ablegen(idx):
+            self._schreibe_status(
+                f"Karte {str(k)} kann nicht abgelegt werden!")
 
     def _anlegen(self):
         """
@@ -438,15 +637,9 @@ class Solitair(object):
             if auswahl == 0:
                 return
             idx = auswahl-1
-            stapel = self.anlageStapel[idx].stapel
-
-            if stapel.anlegbar(k):
-                stapel.anlegen(self.ablageStapel.ziehen())
-                self._punkte_hinzufügen(2)
-                LOG.info(f"Karte {str(k)} an Stapel {str(stapel)} angelegt!")
-            else:
+            if not self.spiel.anlegen(idx):
                 self._schreibe_status(
-                    f"Karte {str(k)} kann nicht an Stapel [{auswahl}] {str(stapel.top())} angelegt werden!")
+                    f"Karte {str(k)} kann nicht an Stapel [{auswahl}] {str(self.spiel.anlageStapel[idx].top())} angelegt werden!")
 
     def _verschieben(self):
         """
@@ -467,7 +660,6 @@ class Solitair(object):
             return
 
         von = auswahlVon-1
-        vonStapel = self.anlageStapel[von].stapel
         self._schreibe_status(f"Verschieben von Stapel {von}")
         self._zeichnen()
         auswahlZu = self._lese_nummer(f"Zu welchem Stapel wollen sie die Karten verschieben? (Drücke 0 zum abbrechen) ",
@@ -477,34 +669,19 @@ class Solitair(object):
             return
 
         zu = auswahlZu-1
-        zuStapel = self.anlageStapel[zu].stapel
         self._verstecke_navihilfe()
-        if vonStapel.verschieben_nach(zuStapel):
+        if self.spiel.verschieben(von, zu):
             self._schreibe_status("")
-            LOG.info(
-                f"Karten von Stapel {str(vonStapel)} zu {str(zuStapel)} verschoben!")
         else:
             self._schreibe_status(
-                f"Verschieben von Stapel {auswahlVon} auf Stapel {auswahlZu} ({str(zuStapel.top())}) nicht möglich!")
+                f"Verschieben von Stapel {auswahlVon} auf Stapel {auswahlZu} ({str(self.spiel.anlageStapel[zu].top())}) nicht möglich!")
 
     def _neu_mischen(self):
         """
         Mischt alle Karten auf dem Spielfeld neu durch.
         """
         if self._ja_nein_frage("Wollen sie die Karten wirklich neu mischen?"):
-            auswahl = [a.stapel for a in self.anlageStapel] + \
-                [self.ablageStapel]
-            for a in auswahl:
-                while not a.leer():
-                    k = a.ziehen()
-                    k.zudecken()
-                    self.ziehStapel.anlegen(k)
-
-            self.ziehStapel.shuffle()
-            self.anlageStapel = [AsciiStapel(AnlageStapel(karten=self._initAnlage(i+1)))
-                                 for i in range(7) if self.ziehStapel.karten_anzahl() > i]
-            self._punkte_hinzufügen(-100)
-            LOG.info(f"Spielfeld neu ausgelegt!")
+            self.spiel.neu_mischen()
 
     def _willkommen(self):
         """
@@ -546,58 +723,51 @@ class Solitair(object):
         Überprüft ob das Spiel gewonnen ist.
         Wenn alle Ablagestapel komplett sind wird `True` zurückgegeben ansonsten `False`.
         """
-        return all([a.komplett() for a in self.ablagen])
-
-    def _auto_karte_zeichnen(self, karte: Karte, start_idx: int, stop_idx: int, anzahl_karten: int):
-        x = karten_breite()*start_idx+2
-        y = karten_hoehe()+2*anzahl_karten+6
-        end_x = karten_breite()*stop_idx+2
-        end_y = 1
-
-        steps = 3
-        x_step = max(1, int(abs(x-end_x) / steps))
-        delta_y = -(max(1, int(abs(y-end_y) / steps)))
-
-        if x < end_x:
-            delta_x = x_step
-        elif x > end_x:
-            delta_x = -x_step
-        else:
-            delta_x = 0
-
-        for i in range(0, steps):
-            self.screen.clear_screen()
-            self._zeichnen()
-            self.screen.write_to_screen(str_karte(karte), x, y)
-            self.screen.print()
-            sleep(0.2)
-            x += delta_x
-            y += delta_y
-
-    def _auto_anlegen(self):
-        for start_idx, s in enumerate(self.anlageStapel):
-            k = s.stapel.top()
-            if k:
-                for stop_idx, a in enumerate(self.ablagen):
-                    if a.anlegbar(k):
-                        kt = s.stapel.ziehen()
-                        self._auto_karte_zeichnen(
-                            kt, start_idx, stop_idx, s.stapel.karten_anzahl())
-                        a.anlegen(kt)
-                        self._punkte_hinzufügen(10)
-                        self.screen.clear_screen()
-                        self._zeichnen()
-                        sleep(0.2)
-                        return
+        return self.spiel.gewonnen()
+
+    def _auto_karte_zeichnen(self, karte: Karte, start_idx: int, stop_idx: int, anzahl_karten: int) -> bool:
+        """
+        Animiert die Karte `karte` vom Anlagestapel `start_idx` zur Ablage `stop_idx`. Das
+        Spielfeld wird einmal geschrieben, danach bewegt der `Animator` nur die Karte im
+        Overlay. Gibt `False` zurück wenn die Animation mit einer Taste abgebrochen wurde.
+        """
+        # bei hohen Stapeln darf die Karte nicht unter dem Bildschirm starten
+        start = (karten_breite()*start_idx+2,
+                 min(karten_hoehe()+2*anzahl_karten+6, self.screen.height - karten_hoehe()))
+        ziel = (karten_breite()*stop_idx+2, 1)
+        self._hintergrund_zeichnen()
+        self._spielfeld_zeichnen()
+        return self.animator.abspielen([Bewegung(karten_zeilen(karte), start, ziel, Solitair.ANIMATION_DAUER)])
+
+    def _abschliessen(self, zuege: list):
+        """
+        Führt die Züge `zuege` aus mit denen alle Karten abgelegt werden. Ist `self.animation`
+        gesetzt, wird jede Karte zur Ablage animiert. Mit einer beliebigen Taste oder Strg+C
+        wird die Animation übersprungen und die restlichen Züge sofort ausgeführt.
+
+        zuege - `list[Zug]` die Züge aus `Spiel.abschluss_zuege()`
+        """
+        idx = 0
+        try:
+            while idx < len(zuege) and self.animation:
+                von = zuege[idx].von
+                k = self.spiel.anlageStapel[von].top()
+                self.spiel.ausfuehren(zuege[idx])
+                idx += 1
+                stop_idx = [a.farbe for a in self.ablagen].index(k.farbe)
+                if not self._auto_karte_zeichnen(k, von, stop_idx, self.spiel.anlageStapel[von].karten_anzahl()):
+                    break
+        except KeyboardInterrupt:
+            pass
+        for zug in zuege[idx:]:
+            self.spiel.ausfuehren(zug)
 
     def _beenden(self):
-        sichtbareKarten = [
-            k.visible for s in self.anlageStapel for k in s.stapel.karten]
-        if (all(sichtbareKarten) and s.ziehStapel.leer() and s.ablageStapel.leer()):
-            if self._ja_nein_frage("Sie haben das Spiel gewonnen, wollen sie das Spiel automatisch beenden?"):
-                while not self._gewonnen():
-                    self._auto_anlegen()
-                    sleep(0.5)
+        if self.spiel.alle_aufgedeckt():
+            zuege = self.spiel.abschluss_zuege()
+            if zuege is not None and self._ja_nein_frage(
+                    "Sie haben das Spiel gewonnen, wollen sie das Spiel automatisch beenden?"):
+                self._abschliessen(zuege)
 
     def starten(self):
         """
@@ -609,8 +779,9 @@ class Solitair(object):
         * Die Spielschleife führt folgende Kommandos der Reiche nach aus:
             * Zunächst wird der Statusnachrichtenpuffer gelöscht
             * Dann wird die Eingabe des Spielers verarbeitet
-            * Anschliessend wird der Bildschirm gelöscht
-            * um dann den neuen Zustand des Spiels anzuzeigen
+            * Anschliessend wird der neue Zustand des Spiels angezeigt, dabei werden nur
+              Spielfeld und Overlay neu geschrieben. Hat das Kommando das Spiel nicht
+              verändert, wird nur das Overlay neu geschrieben
         * wenn die Schleife durch einen Sieg beendet wird wird der Siegerbildschirm angezeigt
         * und das Spiel beendet
         """
@@ -618,25 +789,110 @@ class Solitair(object):
         input()
         self.screen.clear_screen()
         self._zeichnen()
-        # the game loop
-        while not self._gewonnen():
-            self.status_msg = ""
-            self._eingabe()
-            self.screen.clear_screen()
-            self._zeichnen()
-            self._beenden()
+        try:
+            # the game loop
+            while not self._gewonnen():
+                self.status_msg = ""
+                if self._eingabe():
+                    self._stellung = None
+                    self._zeichnen()
+                    self._beenden()
+                else:
+                    self._zeichnen(spielfeld=False)
+        finally:
+            self._speicher_schliessen()
 
         self._gewonnen_zeichnen()
         input()
 
+    def _skript_befehl(self, befehl: str) -> bool:
+        """
+        Führt einen Befehl eines Skripts aus und gibt `True` zurück wenn er ausgeführt wurde.
+        Wirft einen `ValueError` wenn der Befehl unbekannt ist.
+        """
+        if befehl == "u":
+            return self.spiel.rueckgaengig()
+        elif befehl == "r":
+            return self.spiel.wiederholen()
+        elif befehl == "m":
+            self.spiel.neu_mischen()
+            return True
+        return self.spiel.ausfuehren(Zug.aus_text(befehl))
+
+    def skript_ausfuehren(self, zeilen) -> dict:
+        """
+        Führt die Befehle aus den Zeilen `zeilen` ohne Anzeige und ohne Rückfragen aus, z.B. für
+        Lasttests oder um einen Fehler nachzustellen. Befehle sind die Züge wie im Menü (`z`, `g`,
+        `a3`, `b8`, `v25`) sowie `u` (undo), `r` (redo) und `m` (neu mischen). Mehrere Befehle
+        in einer Zeile werden durch Leerzeichen getrennt, ab `#` ist der Rest der Zeile ein
+        Kommentar. Unbekannte und nicht mögliche Befehle werden übersprungen.
+        Gibt die Anzahl der Befehle, der ausgeführten Befehle, die Fehler und die Dauer als
+        `dict` zurück.
+
+        zeilen - die Zeilen des Skripts, z.B. eine geöffnete Datei
+        """
+        ergebnis = {"befehle": 0, "ausgefuehrt": 0, "fehler": [], "sekunden": 0.0}
+        start = perf_counter()
+        for nr, zeile in enumerate(zeilen, start=1):
+            for befehl in zeile.split("#", 1)[0].lower().split():
+                ergebnis["befehle"] += 1
+                try:
+                    if self._skript_befehl(befehl):
+                        ergebnis["ausgefuehrt"] += 1
+                    else:
+                        ergebnis["fehler"].append(f"Zeile {nr}: {befehl} nicht möglich")
+                except ValueError as ex:
+                    ergebnis["fehler"].append(f"Zeile {nr}: {ex}")
+        ergebnis["sekunden"] = perf_counter() - start
+        LOG.info(f"Skript mit {ergebnis['befehle']} Befehlen in {ergebnis['sekunden']:.3f}s ausgeführt")
+        return ergebnis
+
+    def spielfeld_text(self) -> str:
+        """
+        Gibt das Spielfeld als Text ohne Steuerzeichen zurück, z.B. für die Ausgabe am Ende
+        eines Skripts.
+        """
+        self._hintergrund_zeichnen()
+        self._spielfeld_zeichnen()
+        self._overlay_zeichnen()
+        return "\n".join([z.rstrip() for z in self.screen.render().splitlines()]).rstrip() + "\n"
+
+
+def main(argv: list[str] = None):
+    parser = ArgumentParser(description="Spielt Solitair im Terminal.")
+    parser.add_argument("nummer", type=int, nargs="?",
+                        help="Nummer des Spiels, Default: eine zufällige Nummer")
+    parser.add_argument("--skript",
+                        help="Datei mit Befehlen die ohne Anzeige ausgeführt werden, - für stdin")
+    args = parser.parse_args(argv)
+
+    s = Solitair(args.nummer, animation=args.skript is None)
+    if args.skript is None:
+        s.starten()
+        return
+
+    datei = sys.stdin if args.skript == "-" else open(args.skript, mode="r", encoding="utf-8")
+    try:
+        ergebnis = s.skript_ausfuehren(datei)
+    finally:
+        if datei is not sys.stdin:
+            datei.close()
+    print(s.spielfeld_text(), end="")
+    for fehler in ergebnis["fehler"]:
+        print(fehler, file=sys.stderr)
+    sekunden = ergebnis["sekunden"]
+    print(f"Spiel Nr. {s.spiel.nummer}: {ergebnis['befehle']} Befehle, {ergebnis['ausgefuehrt']} ausgeführt, "
+          f"{s.punkte} Punkte, {'gewonnen' if s._gewonnen() else 'nicht gewonnen'}", file=sys.stderr)
+    print(f"{sekunden:.4f}s, {ergebnis['befehle'] / sekunden if sekunden > 0 else 0:.0f} Befehle/s",
+          file=sys.stderr)
+
 
 if __name__ == "__main__":
     with open(file="logging.json", mode="r", encoding="utf-8") as logconfig:
         configDict = jload(logconfig)
         dictConfig(configDict)
     try:
-        s = Solitair()
-        s.starten()
+        main()
     except Exception as ex:
         LOG.error(f"Exception {ex}")
         raise ex
@@ -1,7 +1,35 @@
 import unittest
-from solitair import Solitair
-from cards import AblageStapel, Karte, Farbe, KartenTyp
+from solitair import Solitair, main
+from cards import AblageStapel, Stapel, Karte, Farbe, KartenTyp
 from copy import deepcopy
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+import io
+import tempfile
+from unittest.mock import patch
+from loesungsspeicher import LoesungsSpeicher
+from spiel import Spiel, ZugTyp
+
+class Tasten(object):
+    """
+    Tastatur für die Tests, die beim Warten der Reihe nach die Folgen aus `folgen` liefert.
+    """
+
+    def __init__(self, folgen: list[str]) -> None:
+        self.folgen = list(folgen)
+
+    def interaktiv(self) -> bool:
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def warten(self, sekunden: float) -> str:
+        return self.folgen.pop(0)
+
 
 class SolitairTest(unittest.TestCase):
 
@@ -19,33 +47,41 @@ class SolitairTest(unittest.TestCase):
                 farbe=Farbe.KREUZ, typ=t) for t in list(KartenTyp)])]
         self.assertTrue(s._gewonnen())
 
-    def test_undo_after_last_returns_none(self):
+    def test_undo_on_empty_returns_false(self):
         s1 = Solitair()
-        s1._spielstand_sichern(s1._spielstand_erzeugen())
-        self.assertEqual(1, len(s1.speicher))
-        s1._spielzug_zurueck_nehmen()
-        self.assertEqual(0, len(s1.speicher))
-        self.assertIsNone(s1._spielzug_zurueck_nehmen())
+        self.assertFalse(s1.spiel.rueckgaengig())
+        self.assertFalse(s1.spiel.wiederholen())
 
-    def test_undo_on_empty_return_none(self):
+    def test_undo_unbegrenzt(self):
         s1 = Solitair()
-        self.assertEqual(0, len(s1.speicher))
-        self.assertIsNone(s1._letzter_gesicherter_spielstand())
-        self.assertIsNone(s1._spielzug_zurueck_nehmen())
+        stande = [s1._spielstand_erzeugen()]
+        while s1.spiel.ziehen():
+            stande.append(s1._spielstand_erzeugen())
+        s1.spiel.umdrehen()
+        stande.append(s1._spielstand_erzeugen())
+        s1.spiel.neu_mischen()
+        stande.append(s1._spielstand_erzeugen())
+        self.assertEqual(len(stande)-1, len(s1.spiel.journal))
 
-    def test_undo_over_max_replaces_first(self):
+        for sp in reversed(stande[:-1]):
+            self.assertTrue(s1.spiel.rueckgaengig())
+            self.assertEqual(sp, s1._spielstand_erzeugen())
+            self.assertEqual(sp.zobrist(), s1.spiel.zobrist())
+        self.assertFalse(s1.spiel.rueckgaengig())
+
+        for sp in stande[1:]:
+            self.assertTrue(s1.spiel.wiederholen())
+            self.assertEqual(sp, s1._spielstand_erzeugen())
+        self.assertFalse(s1.spiel.wiederholen())
+
+    def test_neuer_zug_verwirft_redo(self):
         s1 = Solitair()
-        start = s1.ziehStapel.karten_anzahl()
-        for i in range(0, 10):
-            s1._spielstand_sichern(s1._spielstand_erzeugen())
-            s1.ziehStapel.ziehen()
-        self.assertEqual(Solitair.MAX_UNDOS, len(s1.speicher))
-        self.assertEqual(start, s1.speicher[0].ziehStapel.karten_anzahl())
-        s1.ziehStapel.ziehen()
-        s1._spielstand_sichern(s1._spielstand_erzeugen())
-        self.assertEqual(Solitair.MAX_UNDOS, len(s1.speicher))
-        self.assertEqual(start-1, s1.speicher[0].ziehStapel.karten_anzahl())
-        self.assertEqual(start-11, s1.speicher[-1].ziehStapel.karten_anzahl())
+        s1.spiel.ziehen()
+        s1.spiel.ziehen()
+        s1.spiel.rueckgaengig()
+        s1.spiel.ziehen()
+        self.assertFalse(s1.spiel.wiederholen())
+        self.assertEqual(2, len(s1.spiel.journal))
 
     def test_spielstand_wiederherstellen(self):
         def spielzug1():
@@ -57,11 +93,6 @@ class SolitairTest(unittest.TestCase):
                 s1.ablagen[i].karten = [
                     Karte(farbe=s1.ablagen[i].farbe, typ=KartenTyp.AS)]
 
-        def spielzug2():
-            for i in range(0, 4):
-                s1.ablagen[i].karten.append(
-                    Karte(farbe=s1.ablagen[i].farbe, typ=KartenTyp.ZWEI))
-
         s1 = Solitair()
         anlagen = [deepcopy(s.stapel) for s in s1.anlageStapel]
         ablagen = [deepcopy(a) for a in s1.ablagen]
@@ -70,15 +101,10 @@ class SolitairTest(unittest.TestCase):
         ziehen = deepcopy(s1.ziehStapel)
 
         sp1 = s1._spielstand_erzeugen()
-        s1._spielstand_sichern(sp1)
         spielzug1()
         sp2 = s1._spielstand_erzeugen()
         self.assertNotEqual(sp1, sp2)
-        self.assertEqual(1, len(s1.speicher))
-        sp3 = s1._spielzug_zurueck_nehmen()
-        self.assertEqual(sp1, sp3)
-        s1._spielstand_herstellen(sp3)
-        self.assertEqual(0, len(s1.speicher))
+        s1._spielstand_herstellen(sp1)
 
         self.assertEqual(anlagen, [s.stapel for s in s1.anlageStapel])
         self.assertEqual(ablagen, s1.ablagen)
@@ -86,19 +112,171 @@ class SolitairTest(unittest.TestCase):
         self.assertEqual(punkte, s1.punkte)
         self.assertEqual(ziehen, s1.ziehStapel)
 
-        s1._spielstand_sichern(s1._spielstand_erzeugen())
-        spielzug1()
-        s1._spielstand_sichern(s1._spielstand_erzeugen())
-        spielzug2()
-        s1._spielzug_zurueck_nehmen()
-        sp4 = s1._spielzug_zurueck_nehmen()
-        s1._spielstand_herstellen(sp4)
+    def test_beenden(self):
+        s1 = Solitair(animation=False)
+        s1._ja_nein_frage = lambda frage: True
+        s1._beenden()
+        self.assertFalse(s1._gewonnen())
+        s1.ziehStapel = Stapel()
+        s1.ablageStapel = Stapel()
+        s1.ablagen = [AblageStapel(farbe=f, karten=[Karte(farbe=f, typ=t, visible=True)
+                                                    for t in list(KartenTyp)[:-1]])
+                      for f in list(Farbe)]
+        for idx, a in enumerate(s1.spiel.anlageStapel):
+            a.karten = [Karte(list(Farbe)[idx], KartenTyp.KOENIG, visible=True)] if idx < 4 else []
+        s1._beenden()
+        self.assertTrue(s1._gewonnen())
 
-        self.assertEqual(anlagen, [s.stapel for s in s1.anlageStapel])
-        self.assertEqual(ablagen, s1.ablagen)
-        self.assertEqual(ablage, s1.ablageStapel)
-        self.assertEqual(punkte, s1.punkte)
-        self.assertEqual(ziehen, s1.ziehStapel)
+    def test_abschliessen_hoher_stapel(self):
+        s1 = Solitair(animation=True)
+        s1.screen.ausgabe = io.StringIO()
+        s1.animator.tastatur = Tasten([])
+        s1.ziehStapel = Stapel()
+        s1.ablageStapel = Stapel()
+        s1.ablagen = [AblageStapel(farbe=f, karten=[Karte(farbe=f, typ=t, visible=True) for t in list(KartenTyp)])
+                      if f in (Farbe.KARO, Farbe.KREUZ) else AblageStapel(farbe=f) for f in list(Farbe)]
+        for idx, a in enumerate(s1.spiel.anlageStapel):
+            farben = [Farbe.PIK, Farbe.HERZ] if idx == 0 else [Farbe.HERZ, Farbe.PIK]
+            a.karten = [Karte(farben[n % 2], t, visible=True)
+                        for n, t in enumerate(reversed(list(KartenTyp)))] if idx < 2 else []
+        self.assertEqual(13, s1.spiel.anlageStapel[0].karten_anzahl())
+        with patch.object(Solitair, "ANIMATION_DAUER", 0):
+            self.assertTrue(s1._auto_karte_zeichnen(Karte(Farbe.PIK, KartenTyp.AS), 0, 0, 30))
+            s1._abschliessen(s1.spiel.abschluss_zuege())
+        self.assertTrue(s1._gewonnen())
+
+    def test_ja_nein_frage(self):
+        s1 = Solitair(animation=False)
+        antworten = iter(["x", "J"])
+        s1._lesen = lambda msg: next(antworten)
+        self.assertTrue(s1._ja_nein_frage("Wirklich?"))
+        s1._lesen = lambda msg: "n"
+        self.assertFalse(s1._ja_nein_frage("Wirklich?"))
+
+    def test_eingabe_zug(self):
+        s1 = Solitair(nummer=17)
+        zug = [z for z in s1.spiel.zuege() if z.typ != ZugTyp.ZIEHEN][0]
+        erwartet = Spiel(nummer=17)
+        erwartet.ausfuehren(zug)
+        s1._lesen = lambda msg: str(zug)
+        s1._eingabe()
+        self.assertEqual(erwartet.spielstand(), s1.spiel.spielstand())
+        self.assertEqual("", s1.status_msg)
+        s1._lesen = lambda msg: "a0"
+        s1._eingabe()
+        self.assertIn("Ungültiger Zug", s1.status_msg)
+        s1._lesen = lambda msg: "v99"
+        s1._eingabe()
+        self.assertIn("nicht möglich", s1.status_msg)
+        self.assertEqual(erwartet.spielstand(), s1.spiel.spielstand())
+
+    def test_registrieren(self):
+        s1 = Solitair(nummer=1)
+        aufrufe = []
+        s1.registrieren("x", "[x]test", lambda: aufrufe.append("x"), veraendernd=False)
+        self.assertIn("[x]test", s1._menue())
+        s1._lesen = lambda msg: "x"
+        self.assertFalse(s1._eingabe())
+        self.assertEqual(["x"], aufrufe)
+        stellung = s1._stellung_erzeugen()
+        s1._lesen = lambda msg: "z"
+        self.assertTrue(s1._eingabe())
+        self.assertEqual(1, len(s1.spiel.journal))
+        s1._lesen = lambda msg: "y"
+        self.assertFalse(s1._eingabe())
+        self.assertIs(stellung, s1._stellung_erzeugen())
+
+    def test_skript_ausfuehren(self):
+        s1 = Solitair(nummer=17)
+        ergebnis = s1.skript_ausfuehren(["z z # Kommentar", "", "v99 x", "u r"])
+        self.assertEqual(6, ergebnis["befehle"])
+        self.assertEqual(4, ergebnis["ausgefuehrt"])
+        self.assertEqual(["Zeile 3: v99 nicht möglich", "Zeile 3: Ungültiger Zug x"], ergebnis["fehler"])
+        self.assertEqual(2, len(s1.spiel.journal))
+        self.assertIn("Spiel Nr. 17", s1.spielfeld_text())
+        self.assertNotIn("\x1b", s1.spielfeld_text())
+
+    def test_main_skript(self):
+        with tempfile.TemporaryDirectory() as verzeichnis:
+            pfad = Path(verzeichnis, "skript.txt")
+            pfad.write_text("z\nz\n", encoding="utf-8")
+            ausgabe, fehler = io.StringIO(), io.StringIO()
+            with redirect_stdout(ausgabe), redirect_stderr(fehler):
+                main(["17", "--skript", str(pfad)])
+        self.assertIn("Spiel Nr. 17", ausgabe.getvalue())
+        self.assertIn("2 Befehle, 2 ausgeführt", fehler.getvalue())
+
+    def test_befehl_lesen_rest(self):
+        s1 = Solitair(nummer=17, animation=False)
+        s1.tastatur = Tasten(["v25z", "v", "1\r\nz", "V25"])
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual("v25", s1._befehl_lesen("Option: "))
+            self.assertEqual("z", s1._befehl_lesen("Option: "))
+            self.assertEqual("v1", s1._befehl_lesen("Option: "))
+            self.assertEqual("z", s1._befehl_lesen("Option: "))
+            self.assertEqual("v25", s1._befehl_lesen("Option: "))
+        self.assertEqual([], s1.tastatur.folgen)
+
+    def test_nur_geaenderte_stapel_zeichnen(self):
+        s1 = Solitair(nummer=17, animation=False)
+        s1.spielfeld_text()
+        geschrieben = []
+        schreiben = s1.screen.write_to_screen
+        s1.screen.write_to_screen = lambda text, x=0, y=0, *args: geschrieben.append((x, y)) or schreiben(text, x, y, *args)
+        s1._spielfeld_zeichnen()
+        self.assertEqual([], geschrieben)
+        s1.spiel.ziehen()
+        s1._spielfeld_zeichnen()
+        self.assertEqual(2, len(geschrieben))
+        s1.screen.write_to_screen = schreiben
+        for runde in range(40):
+            zuege = [z for z in s1.spiel.zuege() if z.typ != ZugTyp.ZIEHEN] or s1.spiel.zuege()
+            if not zuege:
+                break
+            s1.spiel.ausfuehren(zuege[runde % len(zuege)])
+            s2 = Solitair(animation=False)
+            s2._spielstand_herstellen(s1._spielstand_erzeugen())
+            with self.subTest(runde=runde):
+                # ohne die erste Zeile mit der Nummer des Spiels
+                self.assertEqual(s2.spielfeld_text().split("\n", 1)[1], s1.spielfeld_text().split("\n", 1)[1])
+                self.assertIn(f"Punkte: {s1.punkte:>4}", s1.spielfeld_text().split("\n", 1)[0])
+
+    def test_lesen_invalidate(self):
+        s1 = Solitair(nummer=17, animation=False)
+        s1.screen.previous = []
+        with patch("builtins.input", return_value="z"):
+            self.assertEqual("z", s1._lesen("Option: "))
+        self.assertIsNone(s1.screen.previous)
+
+    def test_lesen_rest(self):
+        s1 = Solitair(nummer=17, animation=False)
+        s1.tastatur = Tasten(["v\n2\n5\n", "\x1b[Az"])
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual("v", s1._befehl_lesen("Option: "))
+            self.assertEqual(2, s1._lese_nummer("Von: ", range(1, 8)))
+            with patch("builtins.input", return_value="") as eingabe:
+                self.assertEqual(5, s1._lese_nummer("Zu: ", range(1, 8)))
+                eingabe.assert_not_called()
+            self.assertEqual("z", s1._befehl_lesen("Option: "))
+        s1._tasten_rest = "1"
+        with patch("builtins.input", return_value="2") as eingabe:
+            self.assertEqual("12", s1._lesen("Zahl: "))
+            eingabe.assert_called_once_with("Zahl: 1")
+
+    def test_tipp_speicher(self):
+        with tempfile.TemporaryDirectory() as verzeichnis:
+            pfad = Path(verzeichnis, "loesungen.db")
+            LoesungsSpeicher(pfad).schliessen()
+            s1 = Solitair(nummer=17, animation=False)
+            with patch("solitair.SPEICHER_PFAD", pfad):
+                s1._tipp()
+                speicher = s1.tipp_geber.speicher
+                self.assertIsNotNone(speicher)
+                s1._tipp()
+                self.assertIs(speicher, s1.tipp_geber.speicher)
+                self.assertIn("Tipp", s1.status_msg)
+            s1._speicher_schliessen()
+            self.assertIsNone(s1.tipp_geber.speicher)
 
 
 if __name__ == "__main__":
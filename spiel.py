@@ -0,0 +1,547 @@
+from cards import (Karte, Stapel, AnlageStapel, AblageStapel, Farbe, KartenTyp, KARTE_FARBE,
+                   NACHFOLGER, ABLAGE_ANFANG, ANZAHL_KARTEN)
+from spielstand import Spielstand, spielstand_hash
+from enum import Enum
+from random import Random, randrange
+import logging
+
+LOG = logging.getLogger("solitair")
+
+
+class ZugTyp(Enum):
+    """
+    Enum für die Arten von Spielzügen.
+    Jeder Enum beinhaltet den Buchstaben des Kommandos im Menü.
+    """
+    ZIEHEN = "z"
+    ANLEGEN = "a"
+    ABLEGEN = "b"
+    VERSCHIEBEN = "v"
+    UMDREHEN = "g"
+
+
+class Zug(object):
+    # Anzahl der Stapel die im Text eines Zuges nach dem Buchstaben folgen
+    STAPEL_ANZAHL = {ZugTyp.ZIEHEN: 0, ZugTyp.UMDREHEN: 0, ZugTyp.ANLEGEN: 1,
+                     ZugTyp.ABLEGEN: 1, ZugTyp.VERSCHIEBEN: 2}
+
+    def __init__(self, typ: ZugTyp, von: int = None, zu: int = None) -> None:
+        """
+        Erstellt einen Spielzug.
+
+        typ - `ZugTyp` die Art des Zuges
+        von - `int` der Index des Stapels von dem genommen wird (ABLEGEN, VERSCHIEBEN)
+              Default: None
+        zu - `int` der Index des Anlagestapels an den angelegt wird (ANLEGEN, VERSCHIEBEN)
+             Default: None
+        """
+        self.typ = typ
+        self.von = von
+        self.zu = zu
+
+    @classmethod
+    def aus_text(cls, text: str):
+        """
+        Erzeugt den Zug aus seiner textuellen Darstellung wie sie `str()` liefert, z.B. `v25`.
+        Wirft einen `ValueError` wenn der Text kein Zug ist.
+
+        text - `str` der Zug wie er im Menü eingegeben wird
+        """
+        text = text.strip()
+        try:
+            typ = ZugTyp(text[:1])
+            stapel = [int(c)-1 for c in text[1:]]
+        except ValueError:
+            raise ValueError(f"Ungültiger Zug {text}")
+        if len(stapel) != Zug.STAPEL_ANZAHL[typ] or any([i < 0 for i in stapel]):
+            raise ValueError(f"Ungültiger Zug {text}")
+        if typ == ZugTyp.ANLEGEN:
+            return cls(typ, zu=stapel[0])
+        elif typ == ZugTyp.ABLEGEN:
+            return cls(typ, von=stapel[0])
+        elif typ == ZugTyp.VERSCHIEBEN:
+            return cls(typ, von=stapel[0], zu=stapel[1])
+        return cls(typ)
+
+    @staticmethod
+    def text_vollstaendig(text: str) -> bool:
+        """
+        Gibt `True` zurück wenn nach dem Text `text` keine weiteren Zeichen zu einem Zug
+        gehören, z.B. für `v25`, `z` oder `a` gefolgt von einem Buchstaben, ansonsten `False`.
+        Damit kann ein Zug Taste für Taste gelesen und ohne Enter ausgeführt werden.
+
+        text - `str` der bisher gelesene Text
+        """
+        if len(text) == 0:
+            return False
+        if text[1:] and not text[1:].isdigit():
+            return True
+        try:
+            return len(text) > Zug.STAPEL_ANZAHL[ZugTyp(text[0])]
+        except ValueError:
+            return True
+
+    def __repr__(self) -> str:
+        return f"Zug({self.typ},{self.von},{self.zu})"
+
+    def __str__(self) -> str:
+        """
+        textuelle Darstellung des Zuges wie er im Menü eingegeben wird, z.B. `v25`.
+        Die Stapel werden ab 1 gezählt.
+        """
+        return self.typ.value + "".join([str(i+1) for i in (self.von, self.zu) if i is not None])
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) == Zug:
+            return self.typ == other.typ and self.von == other.von and self.zu == other.zu
+        return False
+
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash((self.typ, self.von, self.zu))
+
+
+class Spiel(object):
+    """
+    Die Spiellogik von Solitair ohne Ein- und Ausgabe.
+
+    Die Klasse hält den Ziehstapel, den Ablagestapel, die 4 Ablagen und die 7 Anlagestapel
+    und wendet die Spielzüge darauf an. Jeder Spielzug gibt `True` zurück wenn er ausgeführt
+    wurde ansonsten `False`. Es wird weder gezeichnet noch von der Tastatur gelesen, so dass
+    das Spiel auch von Programmen (Bots, Löser, Benchmarks) gespielt werden kann.
+    """
+
+    ANZAHL_ANLAGEN = 7
+    # Index des Ablagestapels bei `ablegen()`, die Anlagestapel haben die Indizes 0-6
+    ABLAGE = ANZAHL_ANLAGEN
+    # Index des Ziehstapels und der ersten Ablage, siehe `von_stapel()`
+    ZIEHEN = ABLAGE + 1
+    ABLAGEN = ZIEHEN + 1
+    # Reihenfolge der Ablagen auf dem Spielfeld
+    ABLAGEN_FARBEN = (Farbe.HERZ, Farbe.KARO, Farbe.KREUZ, Farbe.PIK)
+    # Spiele ohne vorgegebene Nummer bekommen eine zufällige Nummer 1 bis MAX_NUMMER-1
+    MAX_NUMMER = 1000000
+
+    def __init__(self, nummer: int = None) -> None:
+        """
+        Erzeugt ein neues, gemischtes Spiel.
+        1. Der Stapel von dem Karten gezogen werden
+        2. Die Ablagestapel wo die Karten final abgelegt werden
+        3. Die 7 Anlagestapel wo die Karten während des Spiels sortiert werden
+
+        Jedes Spiel hat einen eigenen Zufallsgenerator `zufall` der mit der Nummer des Spiels
+        initialisiert wird. Das Geben, Umdrehen und neu Mischen nutzt nur diesen Generator,
+        so dass ein Spiel mit seiner Nummer und seinen Zügen genau wiederholt werden kann.
+
+        nummer - `int` die Nummer des Spiels, gleiche Nummern ergeben die gleiche Auslage.
+                 Bei `None` wird eine zufällige Nummer gewählt.
+                 Default: None
+        """
+        self.nummer = nummer if nummer is not None else randrange(1, Spiel.MAX_NUMMER)
+        self.zufall = Random(self.nummer)
+        self.ziehStapel = Stapel(karten=[Karte(col, type) for col in list(Farbe)
+                                         for type in list(KartenTyp)])
+        self.ziehStapel.shuffle(self.zufall)
+        self.ablageStapel = Stapel()
+        self.ablagen = [AblageStapel(farbe=f) for f in Spiel.ABLAGEN_FARBEN]
+        self.punkte = 0
+        self.anlageStapel = [AnlageStapel(karten=self._anlage_geben(i+1))
+                             for i in range(Spiel.ANZAHL_ANLAGEN)]
+        self.journal = []
+        self.position = 0
+
+    def _anlage_geben(self, kartenZiehen: int) -> list[Karte]:
+        """
+        Zieht die angegebenen Anzahl von Karten vom Ziehstapel und gibt sie als list[Karte] zurück.
+        Die letzte Karte wird aufgedeckt. Sind weniger Karten auf dem Ziehstapel werden nur diese
+        zurückgegeben.
+
+        kartenZiehen - `int` die Anzahl der Karten die gezogen werden
+        """
+        karten = []
+        for i in range(min(kartenZiehen, self.ziehStapel.karten_anzahl())):
+            karten.append(self.ziehStapel.ziehen())
+        if len(karten) > 0:
+            karten[-1].aufdecken()
+        return karten
+
+    @classmethod
+    def aus_spielstand(cls, spielstand: Spielstand):
+        """
+        Erzeugt ein Spiel aus dem Spielstand `spielstand`.
+        Das Spiel hat keine Nummer und einen zufällig initialisierten Zufallsgenerator.
+
+        spielstand - `Spielstand` der Spielstand der übernommen wird
+        """
+        spiel = cls.__new__(cls)
+        spiel.zufall = Random()
+        spiel.herstellen(spielstand)
+        return spiel
+
+    def spielstand(self) -> Spielstand:
+        """
+        Gibt eine Kopie des aktuellen Spiels als `Spielstand` zurück.
+        """
+        return Spielstand(self.anlageStapel, self.ziehStapel,
+                          self.ablageStapel, self.ablagen, self.punkte)
+
+    def herstellen(self, spielstand: Spielstand):
+        """
+        Übernimmt die Stapel und Punkte aus dem Spielstand `spielstand`.
+        Die Zughistorie und die Nummer des Spiels werden dabei gelöscht.
+
+        spielstand - `Spielstand` der Spielstand der hergestellt wird
+        """
+        self.nummer = None
+        self.ablagen = spielstand.ablagen
+        self.ablageStapel = spielstand.ablageStapel
+        self.anlageStapel = spielstand.anlageStapel
+        self.ziehStapel = spielstand.ziehStapel
+        self.punkte = spielstand.punkte
+        self.journal = []
+        self.position = 0
+
+    def zobrist(self) -> int:
+        """
+        Gibt den Zobrist Hash der aktuellen Stellung zurück. Der Wert ist gleich
+        `self.spielstand().zobrist()`, ohne dass der Spielstand erzeugt werden muss.
+        """
+        return spielstand_hash(self.anlageStapel, self.ziehStapel, self.ablageStapel, self.ablagen)
+
+    def von_stapel(self, von: int) -> Stapel:
+        """
+        Gibt den Stapel mit dem Index `von` zurück. Die Indizes 0-6 sind die Anlagestapel,
+        `Spiel.ABLAGE` ist der Ablagestapel, `Spiel.ZIEHEN` der Ziehstapel und ab
+        `Spiel.ABLAGEN` folgen die 4 Ablagen.
+
+        von - `int` der Index des Stapels
+        """
+        if von < Spiel.ABLAGE:
+            return self.anlageStapel[von]
+        elif von == Spiel.ABLAGE:
+            return self.ablageStapel
+        elif von == Spiel.ZIEHEN:
+            return self.ziehStapel
+        return self.ablagen[von-Spiel.ABLAGEN]
+
+    # Die Spielzüge verändern das Spiel nur über die folgenden Operationen. Jede Operation
+    # wird als Tupel im aktuellen Eintrag des Journals vermerkt und kann umgekehrt werden:
+    #   ("bewegen", von, zu, anzahl) - die obersten `anzahl` Karten von Stapel `von` nach `zu`
+    #   ("aufdecken", idx) / ("zudecken", idx) - die oberste Karte des Stapels `idx`
+    #   ("punkte", punkte) - Punkte hinzufügen
+    #   ("ersetzen", idx, alt, neu) - die Karten des Stapels `idx` austauschen, die Karten
+    #                                 sind als `code*2+aufgedeckt` gespeichert
+    #   ("zufall", alt, neu) - den Zustand des Zufallsgenerators setzen, damit nach einem
+    #                          Undo erneut genauso gemischt wird
+
+    def _anwenden(self, op: tuple):
+        """
+        Wendet die Operation `op` auf das Spiel an ohne sie aufzuzeichnen.
+        """
+        if op[0] == "bewegen":
+            self.von_stapel(op[2]).auflegen(self.von_stapel(op[1]).abheben(op[3]))
+        elif op[0] == "aufdecken":
+            self.von_stapel(op[1]).aufdecken()
+        elif op[0] == "zudecken":
+            self.von_stapel(op[1]).zudecken()
+        elif op[0] == "punkte":
+            self.punkte += op[1]
+        elif op[0] == "ersetzen":
+            self.von_stapel(op[1]).karten = [Karte.aus_code(c >> 1, c & 1 == 1) for c in op[3]]
+        elif op[0] == "zufall":
+            self.zufall.setstate(op[2])
+
+    @staticmethod
+    def _umkehrung(op: tuple) -> tuple:
+        """
+        Gibt die Operation zurück die `op` rückgängig macht.
+        """
+        if op[0] == "bewegen":
+            return ("bewegen", op[2], op[1], op[3])
+        elif op[0] == "aufdecken":
+            return ("zudecken", op[1])
+        elif op[0] == "zudecken":
+            return ("aufdecken", op[1])
+        elif op[0] == "punkte":
+            return ("punkte", -op[1])
+        elif op[0] == "zufall":
+            return ("zufall", op[2], op[1])
+        return ("ersetzen", op[1], op[3], op[2])
+
+    def _aufzeichnen(self, *ops: tuple, angewendet: tuple = ()):
+        """
+        Wendet die Operationen `ops` an und speichert sie zusammen mit den bereits
+        angewendeten Operationen `angewendet` als einen Eintrag im Journal.
+        Züge die nach der aktuellen Position im Journal stehen (Redo) werden verworfen.
+        """
+        for op in ops:
+            self._anwenden(op)
+        del self.journal[self.position:]
+        self.journal.append(angewendet + ops)
+        self.position += 1
+
+    def _aufdecken_nach(self, idx: int, anzahl: int) -> tuple:
+        """
+        Gibt die Operation zurück die den Stapel `idx` aufdeckt nachdem `anzahl` Karten
+        abgehoben wurden, oder ein leeres Tupel wenn die Karte darunter schon offen ist.
+        """
+        karten = self.von_stapel(idx).karten
+        if len(karten) > anzahl and not karten[-anzahl-1].aufgedeckt():
+            return (("aufdecken", idx),)
+        return ()
+
+    def _ersetzen(self, indizes: list[int], aktion) -> tuple:
+        """
+        Führt `aktion()` aus und gibt für jeden der Stapel `indizes` eine bereits angewendete
+        "ersetzen" Operation mit den Karten vor und nach der Aktion zurück, gefolgt von
+        einer "zufall" Operation mit dem Zustand des Zufallsgenerators.
+        """
+        def codes(idx: int) -> tuple:
+            return tuple(k.code*2+k.visible for k in self.von_stapel(idx).karten)
+        alt = [codes(idx) for idx in indizes]
+        zustand = self.zufall.getstate()
+        aktion()
+        return tuple(("ersetzen", idx, a, codes(idx)) for idx, a in zip(indizes, alt)) + \
+            (("zufall", zustand, self.zufall.getstate()),)
+
+    def rueckgaengig(self) -> bool:
+        """
+        Nimmt den letzten Zug zurück. Gibt `False` zurück wenn es keinen Zug gibt.
+        """
+        if self.position == 0:
+            return False
+        self.position -= 1
+        for op in reversed(self.journal[self.position]):
+            self._anwenden(self._umkehrung(op))
+        LOG.info("Zug %s zurück genommen!", self.position+1)
+        return True
+
+    def wiederholen(self) -> bool:
+        """
+        Führt den zuletzt zurückgenommenen Zug erneut aus. Gibt `False` zurück wenn es
+        keinen Zug gibt.
+        """
+        if self.position >= len(self.journal):
+            return False
+        for op in self.journal[self.position]:
+            self._anwenden(op)
+        self.position += 1
+        LOG.info("Zug %s wiederholt!", self.position)
+        return True
+
+    def ziehen(self) -> bool:
+        """
+        Zieht eine Karte vom Ziehstapel und legt sie aufgedeckt auf den Ablagestapel.
+        Gibt `False` zurück wenn der Ziehstapel leer ist.
+        """
+        if self.ziehStapel.leer():
+            return False
+        LOG.debug("Karte %s gezogen und abgelegt", self.ziehStapel.top())
+        self._aufzeichnen(("bewegen", Spiel.ZIEHEN, Spiel.ABLAGE, 1),
+                          ("aufdecken", Spiel.ABLAGE))
+        return True
+
+    def anlegen(self, zu: int) -> bool:
+        """
+        Legt die oberste Karte des Ablagestapels an den Anlagestapel mit dem Index `zu` an.
+        Gibt `False` zurück wenn die Karte nicht angelegt werden kann.
+
+        zu - `int` der Index des Anlagestapels
+        """
+        k = self.ablageStapel.top()
+        stapel = self.anlageStapel[zu]
+        if k and stapel.anlegbar(k):
+            self._aufzeichnen(("bewegen", Spiel.ABLAGE, zu, 1), ("punkte", 2))
+            LOG.info("Karte %s an Stapel %s angelegt!", k, stapel)
+            return True
+        return False
+
+    def ablegen(self, von: int) -> bool:
+        """
+        Legt die oberste Karte des Stapels mit dem Index `von` auf die passende Ablage.
+        Gibt `False` zurück wenn die Karte nicht abgelegt werden kann.
+
+        von - `int` der Index des Anlagestapels oder `Spiel.ABLAGE` für den Ablagestapel
+        """
+        k = self.von_stapel(von).top()
+        ablage = self._ablage_index(k) if k else None
+        if ablage is not None:
+            self._aufzeichnen(("bewegen", von, Spiel.ABLAGEN+ablage, 1),
+                              *self._aufdecken_nach(von, 1), ("punkte", 10))
+            LOG.info("Karte %s abgelegt!", k)
+            return True
+        return False
+
+    def verschieben(self, von: int, zu: int, ab: int = None) -> bool:
+        """
+        Verschiebt die aufgedeckten Karten vom Anlagestapel `von` zum Anlagestapel `zu`.
+        Siehe `AnlageStapel.verschieben_nach()`.
+
+        von - `int` der Index des Anlagestapels von dem verschoben wird
+        zu - `int` der Index des Anlagestapels zu dem verschoben wird
+        ab - `int` der Index der untersten zu verschiebenden Karte oder `None` für die erste anlegbare Karte
+             Default: None
+        """
+        vonStapel = self.anlageStapel[von]
+        zuStapel = self.anlageStapel[zu]
+        anzahl = vonStapel.verschiebbar_nach(zuStapel, ab) if von != zu else 0
+        if anzahl > 0:
+            self._aufzeichnen(("bewegen", von, zu, anzahl), *self._aufdecken_nach(von, anzahl))
+            LOG.info("Karten von Stapel %s zu %s verschoben!", vonStapel, zuStapel)
+            return True
+        return False
+
+    def umdrehen(self) -> bool:
+        """
+        Legt die Karten des Ablagestapels verdeckt und neu gemischt auf den Ziehstapel
+        wenn der Ziehstapel leer ist. Gibt `False` zurück wenn noch Karten auf dem
+        Ziehstapel liegen.
+        """
+        if not self.ziehStapel.leer():
+            return False
+
+        def mischen():
+            k = self.ablageStapel.ziehen()
+            while k:
+                self.ziehStapel.anlegen(k.zudecken())
+                k = self.ablageStapel.ziehen()
+            self.ziehStapel.shuffle(self.zufall)
+
+        self._aufzeichnen(("punkte", -20),
+                          angewendet=self._ersetzen([Spiel.ABLAGE, Spiel.ZIEHEN], mischen))
+        LOG.info("Ziehstapel neu gemischt!")
+        return True
+
+    def neu_mischen(self):
+        """
+        Mischt alle Karten der Anlagestapel und des Ablagestapels neu und verteilt sie
+        wieder auf die Anlagestapel.
+        """
+        def mischen():
+            for a in self.anlageStapel + [self.ablageStapel]:
+                while not a.leer():
+                    self.ziehStapel.anlegen(a.ziehen().zudecken())
+            self.ziehStapel.shuffle(self.zufall)
+            for i, a in enumerate(self.anlageStapel):
+                a.karten = self._anlage_geben(i+1)
+
+        stapel = list(range(Spiel.ANZAHL_ANLAGEN)) + [Spiel.ABLAGE, Spiel.ZIEHEN]
+        self._aufzeichnen(("punkte", -100), angewendet=self._ersetzen(stapel, mischen))
+        LOG.info("Spielfeld neu ausgelegt!")
+
+    def ausfuehren(self, zug: Zug) -> bool:
+        """
+        Führt den Spielzug `zug` aus.
+        Gibt `True` zurück wenn der Zug ausgeführt wurde ansonsten `False`, auch wenn ein
+        Stapel des Zuges nicht existiert.
+
+        zug - `Zug` der auszuführende Zug
+        """
+        if zug.typ == ZugTyp.ZIEHEN:
+            return self.ziehen()
+        elif zug.typ == ZugTyp.ANLEGEN:
+            return zug.zu < Spiel.ANZAHL_ANLAGEN and self.anlegen(zug.zu)
+        elif zug.typ == ZugTyp.ABLEGEN:
+            return zug.von <= Spiel.ABLAGE and self.ablegen(zug.von)
+        elif zug.typ == ZugTyp.VERSCHIEBEN:
+            return (zug.von < Spiel.ANZAHL_ANLAGEN and zug.zu < Spiel.ANZAHL_ANLAGEN and
+                    self.verschieben(zug.von, zug.zu))
+        elif zug.typ == ZugTyp.UMDREHEN:
+            return self.umdrehen()
+        return False
+
+    def _ablage_index(self, karte: Karte) -> int:
+        """
+        Gibt den Index der Ablage zurück auf die die Karte `karte` abgelegt werden kann
+        oder `None`.
+        """
+        for idx, a in enumerate(self.ablagen):
+            if a.farbe == karte.farbe:
+                return idx if a.anlegbar(karte) else None
+        return None
+
+    def zuege(self) -> list[Zug]:
+        """
+        Gibt alle erlaubten Züge der aktuellen Stellung als `list[Zug]` zurück.
+        Umdrehen wird nur angeboten wenn auf dem Ablagestapel Karten liegen, da es sonst
+        nur Punkte kostet.
+        Je Paar von Anlagestapeln gibt es höchstens eine Verschiebung ab der ersten anlegbaren
+        Karte. Da die aufgedeckten Karten eine Folge mit abwechselnden Farben bilden, passt auf
+        einen Stapel höchstens eine von ihnen, so dass auch Teilfolgen angeboten werden.
+        """
+        zuege = []
+        if not self.ziehStapel.leer():
+            zuege.append(Zug(ZugTyp.ZIEHEN))
+        elif not self.ablageStapel.leer():
+            zuege.append(Zug(ZugTyp.UMDREHEN))
+
+        k = self.ablageStapel.top()
+        if k:
+            if self._ablage_index(k) is not None:
+                zuege.append(Zug(ZugTyp.ABLEGEN, von=Spiel.ABLAGE))
+            for idx, a in enumerate(self.anlageStapel):
+                if a.anlegbar(k):
+                    zuege.append(Zug(ZugTyp.ANLEGEN, zu=idx))
+
+        for von, a in enumerate(self.anlageStapel):
+            k = a.top()
+            if k is None:
+                continue
+            if self._ablage_index(k) is not None:
+                zuege.append(Zug(ZugTyp.ABLEGEN, von=von))
+            for zu, z in enumerate(self.anlageStapel):
+                if zu != von and a.verschiebbar_nach(z) > 0:
+                    zuege.append(Zug(ZugTyp.VERSCHIEBEN, von=von, zu=zu))
+        return zuege
+
+    def abgelegt(self) -> int:
+        """
+        Gibt die Anzahl der Karten auf den Ablagen zurück.
+        """
+        return sum([a.karten_anzahl() for a in self.ablagen])
+
+    def verdeckt(self) -> int:
+        """
+        Gibt die Anzahl der verdeckten Karten auf den Anlagestapeln zurück. Die Stapel
+        zählen ihre verdeckten Karten selbst mit, daher wird keine Karte durchlaufen.
+        """
+        return sum([a.verdeckt_anzahl() for a in self.anlageStapel])
+
+    def gewonnen(self) -> bool:
+        """
+        Gibt `True` zurück wenn alle Ablagestapel komplett sind ansonsten `False`.
+        """
+        return self.abgelegt() == ANZAHL_KARTEN
+
+    def alle_aufgedeckt(self) -> bool:
+        """
+        Gibt `True` zurück wenn Zieh- und Ablagestapel leer und alle Karten auf den
+        Anlagestapeln aufgedeckt sind. Das Spiel kann dann automatisch beendet werden.
+        """
+        return self.ziehStapel.leer() and self.ablageStapel.leer() and self.verdeckt() == 0
+
+    def abschluss_zuege(self) -> list[Zug]:
+        """
+        Berechnet alle Züge mit denen die Karten der Anlagestapel abgelegt werden ohne das
+        Spiel zu verändern. Gibt `None` zurück wenn nicht alle Karten abgelegt werden können.
+        Jeder Anlagestapel wird so lange abgelegt wie seine oberste Karte passt, danach wird
+        der nächste Stapel probiert bis kein Stapel mehr passt.
+        """
+        stapel = [[k.code for k in s.karten] for s in self.anlageStapel]
+        naechste = {a.farbe.value-1: NACHFOLGER[a.top().code] if a.top() else ABLAGE_ANFANG[a.farbe.value-1]
+                    for a in self.ablagen}
+        zuege = []
+        weiter = True
+        while weiter:
+            weiter = False
+            for idx, s in enumerate(stapel):
+                while s and naechste[KARTE_FARBE[s[-1]].value-1] == s[-1]:
+                    code = s.pop()
+                    naechste[KARTE_FARBE[code].value-1] = NACHFOLGER[code]
+                    zuege.append(Zug(ZugTyp.ABLEGEN, von=idx))
+                    weiter = True
+        if any(stapel) or not self.ziehStapel.leer() or not self.ablageStapel.leer():
+            return None
+        return zuege
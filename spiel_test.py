@@ -0,0 +1,268 @@
+import unittest
+from spiel import Spiel, Zug, ZugTyp
+from stellung import Stellung
+from cards import AblageStapel, AnlageStapel, Stapel, Karte, Farbe, KartenTyp
+
+
+class SpielTest(unittest.TestCase):
+
+    def test_neues_spiel(self):
+        s = Spiel()
+        self.assertEqual(Spiel.ANZAHL_ANLAGEN, len(s.anlageStapel))
+        for idx, a in enumerate(s.anlageStapel):
+            self.assertEqual(idx+1, a.karten_anzahl())
+            self.assertTrue(a.top().aufgedeckt())
+        self.assertEqual(52-28, s.ziehStapel.karten_anzahl())
+        self.assertTrue(s.ablageStapel.leer())
+        self.assertEqual(0, s.punkte)
+
+    def test_nummer(self):
+        s1 = Spiel(nummer=42)
+        s2 = Spiel(nummer=42)
+        self.assertEqual(42, s1.nummer)
+        self.assertEqual(s1.spielstand(), s2.spielstand())
+        self.assertNotEqual(s1.spielstand(), Spiel(nummer=43).spielstand())
+        self.assertIsNotNone(Spiel().nummer)
+        for s in (s1, s2):
+            while s.ziehen():
+                pass
+            s.umdrehen()
+            s.neu_mischen()
+        self.assertEqual(s1.spielstand(), s2.spielstand())
+
+    def test_umdrehen_rueckgaengig(self):
+        s = Spiel(nummer=7)
+        while s.ziehen():
+            pass
+        s.umdrehen()
+        gemischt = s.spielstand()
+        s.rueckgaengig()
+        s.umdrehen()
+        self.assertEqual(gemischt, s.spielstand())
+
+    def test_ziehen(self):
+        s = Spiel()
+        anzahl = s.ziehStapel.karten_anzahl()
+        for i in range(anzahl):
+            self.assertTrue(s.ziehen())
+            self.assertTrue(s.ablageStapel.top().aufgedeckt())
+        self.assertFalse(s.ziehen())
+        self.assertEqual(anzahl, s.ablageStapel.karten_anzahl())
+
+    def test_umdrehen(self):
+        s = Spiel()
+        self.assertFalse(s.umdrehen())
+        anzahl = s.ziehStapel.karten_anzahl()
+        while s.ziehen():
+            pass
+        self.assertTrue(s.umdrehen())
+        self.assertEqual(anzahl, s.ziehStapel.karten_anzahl())
+        self.assertTrue(s.ablageStapel.leer())
+        self.assertFalse(any([k.aufgedeckt() for k in s.ziehStapel.karten]))
+        self.assertEqual(-20, s.punkte)
+
+    def test_anlegen(self):
+        s = Spiel()
+        s.anlageStapel[0] = AnlageStapel(
+            karten=[Karte(Farbe.PIK, KartenTyp.ACHT, visible=True)])
+        s.anlageStapel[1] = AnlageStapel(
+            karten=[Karte(Farbe.KARO, KartenTyp.ACHT, visible=True)])
+        s.ablageStapel = Stapel(
+            karten=[Karte(Farbe.HERZ, KartenTyp.SIEBEN, visible=True)])
+        self.assertFalse(s.anlegen(1))
+        self.assertTrue(s.anlegen(0))
+        self.assertEqual(2, s.anlageStapel[0].karten_anzahl())
+        self.assertTrue(s.ablageStapel.leer())
+        self.assertFalse(s.anlegen(0))
+        self.assertEqual(2, s.punkte)
+
+    def test_ablegen(self):
+        s = Spiel()
+        s.anlageStapel[0] = AnlageStapel(
+            karten=[Karte(Farbe.PIK, KartenTyp.ACHT),
+                    Karte(Farbe.KARO, KartenTyp.AS, visible=True)])
+        s.ablageStapel = Stapel(
+            karten=[Karte(Farbe.KARO, KartenTyp.ZWEI, visible=True)])
+        self.assertFalse(s.ablegen(Spiel.ABLAGE))
+        self.assertTrue(s.ablegen(0))
+        self.assertTrue(s.anlageStapel[0].top().aufgedeckt())
+        self.assertTrue(s.ablegen(Spiel.ABLAGE))
+        self.assertEqual(20, s.punkte)
+
+    def test_verschieben(self):
+        s = Spiel()
+        s.anlageStapel[0] = AnlageStapel(
+            karten=[Karte(Farbe.PIK, KartenTyp.ACHT, visible=True)])
+        s.anlageStapel[1] = AnlageStapel(
+            karten=[Karte(Farbe.KREUZ, KartenTyp.DAME),
+                    Karte(Farbe.HERZ, KartenTyp.SIEBEN, visible=True)])
+        self.assertFalse(s.verschieben(0, 1))
+        self.assertFalse(s.verschieben(1, 1))
+        self.assertTrue(s.verschieben(1, 0))
+        self.assertEqual(2, s.anlageStapel[0].karten_anzahl())
+        self.assertTrue(s.anlageStapel[1].top().aufgedeckt())
+
+    def test_neu_mischen(self):
+        s = Spiel()
+        s.ziehen()
+        s.neu_mischen()
+        self.assertTrue(s.ablageStapel.leer())
+        self.assertEqual(52-28, s.ziehStapel.karten_anzahl())
+        self.assertEqual(-100, s.punkte)
+
+    def test_gewonnen(self):
+        s = Spiel()
+        self.assertFalse(s.gewonnen())
+        s.ablagen = [AblageStapel(farbe=f, karten=[Karte(farbe=f, typ=t) for t in list(KartenTyp)])
+                     for f in list(Farbe)]
+        self.assertTrue(s.gewonnen())
+
+    def test_zaehler(self):
+        s = Spiel()
+        self.assertEqual(21, s.verdeckt())
+        self.assertEqual(0, s.abgelegt())
+        for runde in range(100):
+            zuege = s.zuege()
+            if len(zuege) == 0:
+                break
+            s.ausfuehren(zuege[(runde * 3) % len(zuege)])
+            self.assertEqual(sum([1 for a in s.anlageStapel for k in a.karten if not k.aufgedeckt()]),
+                             s.verdeckt())
+            self.assertEqual(sum([len(a.karten) for a in s.ablagen]), s.abgelegt())
+
+    def test_alle_aufgedeckt(self):
+        s = Spiel()
+        self.assertFalse(s.alle_aufgedeckt())
+        s.ziehStapel = Stapel()
+        s.anlageStapel = [AnlageStapel(karten=[Karte(Farbe.PIK, KartenTyp.ACHT, visible=True)])] + \
+            [AnlageStapel() for i in range(Spiel.ANZAHL_ANLAGEN-1)]
+        self.assertTrue(s.alle_aufgedeckt())
+
+    def test_abschluss_zuege(self):
+        s = Spiel()
+        self.assertIsNone(s.abschluss_zuege())
+        s.ziehStapel = Stapel()
+        s.ablageStapel = Stapel()
+        s.ablagen = [AblageStapel(farbe=f, karten=[Karte(f, t, visible=True) for t in list(KartenTyp)[:10]])
+                     for f in Spiel.ABLAGEN_FARBEN]
+        s.anlageStapel = [AnlageStapel(karten=[Karte(Farbe.PIK, KartenTyp.KOENIG, visible=True),
+                                               Karte(Farbe.HERZ, KartenTyp.DAME, visible=True),
+                                               Karte(Farbe.KREUZ, KartenTyp.BUBE, visible=True)]),
+                          AnlageStapel(karten=[Karte(Farbe.KARO, KartenTyp.KOENIG, visible=True),
+                                               Karte(Farbe.KREUZ, KartenTyp.DAME, visible=True),
+                                               Karte(Farbe.HERZ, KartenTyp.BUBE, visible=True)]),
+                          AnlageStapel(karten=[Karte(Farbe.KREUZ, KartenTyp.KOENIG, visible=True),
+                                               Karte(Farbe.KARO, KartenTyp.DAME, visible=True),
+                                               Karte(Farbe.PIK, KartenTyp.BUBE, visible=True)]),
+                          AnlageStapel(karten=[Karte(Farbe.HERZ, KartenTyp.KOENIG, visible=True),
+                                               Karte(Farbe.PIK, KartenTyp.DAME, visible=True),
+                                               Karte(Farbe.KARO, KartenTyp.BUBE, visible=True)])] + \
+            [AnlageStapel() for i in range(Spiel.ANZAHL_ANLAGEN-4)]
+        self.assertTrue(s.alle_aufgedeckt())
+        zuege = s.abschluss_zuege()
+        self.assertEqual(12, len(zuege))
+        self.assertFalse(s.gewonnen())
+        for zug in zuege:
+            self.assertTrue(s.ausfuehren(zug))
+        self.assertTrue(s.gewonnen())
+
+    def test_spielstand(self):
+        s = Spiel()
+        s.ziehen()
+        s2 = Spiel.aus_spielstand(s.spielstand())
+        self.assertEqual(s.spielstand(), s2.spielstand())
+
+    def _alle_zuege(self) -> list[Zug]:
+        zuege = [Zug(ZugTyp.ZIEHEN), Zug(ZugTyp.UMDREHEN)]
+        zuege += [Zug(ZugTyp.ANLEGEN, zu=i) for i in range(Spiel.ANZAHL_ANLAGEN)]
+        zuege += [Zug(ZugTyp.ABLEGEN, von=i) for i in range(Spiel.ANZAHL_ANLAGEN+1)]
+        zuege += [Zug(ZugTyp.VERSCHIEBEN, von=v, zu=z) for v in range(Spiel.ANZAHL_ANLAGEN)
+                  for z in range(Spiel.ANZAHL_ANLAGEN)]
+        return zuege
+
+    def test_zuege_teilfolge(self):
+        s = Spiel()
+        s.anlageStapel[0] = AnlageStapel(
+            karten=[Karte(Farbe.PIK, KartenTyp.ACHT, visible=True),
+                    Karte(Farbe.HERZ, KartenTyp.SIEBEN, visible=True),
+                    Karte(Farbe.KREUZ, KartenTyp.SECHS, visible=True)])
+        s.anlageStapel[1] = AnlageStapel(
+            karten=[Karte(Farbe.KARO, KartenTyp.SIEBEN, visible=True)])
+        zug = Zug(ZugTyp.VERSCHIEBEN, von=0, zu=1)
+        self.assertIn(zug, s.zuege())
+        self.assertIn(zug, Stellung.aus_spiel(s).zuege())
+        self.assertTrue(s.ausfuehren(zug))
+        self.assertEqual(2, s.anlageStapel[0].karten_anzahl())
+        self.assertEqual(Karte(Farbe.KREUZ, KartenTyp.SECHS), s.anlageStapel[1].top())
+
+    def test_zuege_sind_erlaubt(self):
+        s = Spiel()
+        for runde in range(60):
+            erlaubt = s.zuege()
+            with self.subTest(runde=runde):
+                for zug in self._alle_zuege():
+                    if zug.typ == ZugTyp.UMDREHEN and s.ablageStapel.leer():
+                        # ist erlaubt, wird aber nicht angeboten
+                        continue
+                    kopie = Spiel.aus_spielstand(s.spielstand())
+                    self.assertEqual(zug in erlaubt, kopie.ausfuehren(zug), msg=str(zug))
+            if len(erlaubt) == 0:
+                break
+            s.ausfuehren(erlaubt[runde % len(erlaubt)])
+
+    def test_zobrist(self):
+        s = Spiel()
+        for runde in range(100):
+            self.assertEqual(s.spielstand().zobrist(), s.zobrist())
+            zuege = s.zuege()
+            if len(zuege) == 0:
+                break
+            vorher = s.zobrist()
+            s.ausfuehren(zuege[runde % len(zuege)])
+            self.assertNotEqual(vorher, s.zobrist())
+
+    def test_rueckgaengig_wiederholen(self):
+        s = Spiel()
+        stande = [s.spielstand()]
+        for runde in range(150):
+            zuege = s.zuege()
+            if len(zuege) == 0:
+                break
+            s.ausfuehren(zuege[(runde * 7) % len(zuege)])
+            stande.append(s.spielstand())
+        for sp in reversed(stande[:-1]):
+            self.assertTrue(s.rueckgaengig())
+            self.assertEqual(sp, s.spielstand())
+            self.assertEqual(sp.zobrist(), s.zobrist())
+        self.assertFalse(s.rueckgaengig())
+        for sp in stande[1:]:
+            self.assertTrue(s.wiederholen())
+            self.assertEqual(sp, s.spielstand())
+        self.assertFalse(s.wiederholen())
+
+    def test_zug_str(self):
+        self.assertEqual("z", str(Zug(ZugTyp.ZIEHEN)))
+        self.assertEqual("a3", str(Zug(ZugTyp.ANLEGEN, zu=2)))
+        self.assertEqual("b8", str(Zug(ZugTyp.ABLEGEN, von=Spiel.ABLAGE)))
+        self.assertEqual("v25", str(Zug(ZugTyp.VERSCHIEBEN, von=1, zu=4)))
+
+    def test_zug_aus_text(self):
+        for text in ("z", "g", "a3", "b8", "v25"):
+            self.assertEqual(text, str(Zug.aus_text(text)))
+        for text in ("", "x", "z1", "a", "a0", "v2", "vab"):
+            self.assertRaises(ValueError, Zug.aus_text, text)
+
+    def test_zug_text_vollstaendig(self):
+        for text in ("z", "g", "a3", "b8", "v25", "u", "vx", "a0"):
+            self.assertTrue(Zug.text_vollstaendig(text), msg=text)
+        for text in ("", "a", "b", "v", "v2"):
+            self.assertFalse(Zug.text_vollstaendig(text), msg=text)
+
+    def test_ausfuehren_ungueltiger_stapel(self):
+        s = Spiel(nummer=1)
+        for text in ("a9", "b9", "v18", "v81"):
+            self.assertFalse(s.ausfuehren(Zug.aus_text(text)), msg=text)
+
+
+if __name__ == "__main__":
+    unittest.main()
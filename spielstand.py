@@ -4,6 +4,34 @@ from ascii import AsciiStapel
 from copy import deepcopy
 from json import dump, load
 
+# Ungerade 64 bit Faktoren mit denen der Hash eines Stapels je nach seiner Rolle im Spiel
+# gemischt wird. Alle Ablagen teilen sich einen Faktor, da ihre Karten die Farbe festlegen.
+HASH_MASKE = (1 << 64) - 1
+HASH_FAKTOR_ABLAGEN = 0x9E3779B97F4A7C15
+HASH_FAKTOR_ABLAGE_STAPEL = 0xC2B2AE3D27D4EB4F
+HASH_FAKTOR_ZIEH_STAPEL = 0x165667B19E3779F9
+HASH_FAKTOR_ANLAGEN = (0xD6E8FEB86659FD93, 0xA0761D6478BD642F, 0xE7037ED1A0B428DB,
+                       0x8EBC6AF09C88C6E3, 0x589965CC75374CC3, 0x1D8E4E27C47D124F,
+                       0xFF51AFD7ED558CCD)
+
+
+def spielstand_hash(anlageStapel: list[AnlageStapel], ziehStapel: Stapel, ablageStapel: Stapel, ablagen: list[AblageStapel]) -> int:
+    """
+    Berechnet den 64 bit Zobrist Hash einer Stellung aus den Hashes der einzelnen Stapel.
+    Da die Stapel ihren Hash bei jeder Änderung nachführen, müssen dafür keine Karten
+    durchlaufen werden. Die Punkte gehören nicht zur Stellung und fließen nicht ein.
+    """
+    h = 0
+    for a in ablagen:
+        h ^= (a.zobrist() * HASH_FAKTOR_ABLAGEN) & HASH_MASKE
+    for idx, a in enumerate(anlageStapel):
+        h ^= (a.zobrist() * HASH_FAKTOR_ANLAGEN[idx]) & HASH_MASKE
+    if ablageStapel is not None:
+        h ^= (ablageStapel.zobrist() * HASH_FAKTOR_ABLAGE_STAPEL) & HASH_MASKE
+    if ziehStapel is not None:
+        h ^= (ziehStapel.zobrist() * HASH_FAKTOR_ZIEH_STAPEL) & HASH_MASKE
+    return h
+
 
 class SpielstandDeSerializer(object):
 
@@ -22,26 +50,27 @@ class SpielstandDeSerializer(object):
         return res
 
     def deserialize(self, data: dict[str:str]) -> Spielstand:
-        s = Spielstand(
-            ablagen=self._ablagen_lesen(data["ablagen"]),
-            anlageStapel=self._anlagen_lesen(data["anlagen"]),
-            ablageStapel=Stapel(self._karten_lesen(data["ablage"])),
-            ziehStapel=Stapel(karten=[Karte(col, type) for col in list(Farbe)
-                                      for type in list(KartenTyp)]),
+        ablagen = self._ablagen_lesen(data["ablagen"])
+        anlageStapel = self._anlagen_lesen(data["anlagen"])
+        ablageStapel = Stapel(self._karten_lesen(data["ablage"]))
+        zieh = [Karte(col, type) for col in list(Farbe)
+                for type in list(KartenTyp)]
+        for a in anlageStapel:
+            self._karten_vom_ziehstapel_entfernen(a.karten, zieh)
+        for a in ablagen:
+            self._karten_vom_ziehstapel_entfernen(a.karten, zieh)
+        self._karten_vom_ziehstapel_entfernen(ablageStapel.karten, zieh)
+        return Spielstand(
+            ablagen=ablagen,
+            anlageStapel=anlageStapel,
+            ablageStapel=ablageStapel,
+            ziehStapel=Stapel(karten=zieh),
             punkte=int(data["punkte"]))
-        for a in s.anlageStapel:
-            self._karten_vom_ziehstapel_entfernen(
-                a.karten, s.ziehStapel)
-        for a in s.ablagen:
-            self._karten_vom_ziehstapel_entfernen(a.karten, s.ziehStapel)
-        self._karten_vom_ziehstapel_entfernen(
-            s.ablageStapel.karten, s.ziehStapel)
-        return s
-
-    def _karten_vom_ziehstapel_entfernen(self, karten: list[Karte], zieh: Stapel):
+
+    def _karten_vom_ziehstapel_entfernen(self, karten: list[Karte], zieh: list[Karte]):
         for k in karten:
             try:
-                zieh.karten.remove(k)
+                zieh.remove(k)
             except:
                 raise ValueError(
                     f"Karte {k} ist nicht mehr im Ziehstapel wahrscheinlich doppelt vergeben!")
@@ -141,6 +170,17 @@ class Spielstand(object):
     def __ne__(self, other: object) -> bool:
         return not self.__eq__(other)
 
+    def __hash__(self) -> int:
+        return self.zobrist()
+
+    def zobrist(self) -> int:
+        """
+        Gibt den 64 bit Zobrist Hash der Stellung zurück, siehe `spielstand_hash()`.
+        Gleiche Spielstände haben den gleichen Hash, ungleiche mit sehr hoher
+        Wahrscheinlichkeit nicht.
+        """
+        return spielstand_hash(self.anlageStapel, self.ziehStapel, self.ablageStapel, self.ablagen)
+
     def __str__(self) -> str:
         return f"Sp:{self.id}({','.join([str(a) for a in self.ablagen])},{','.join([str(a) for a in self.anlageStapel])},{str(self.ablageStapel)},{str(self.ziehStapel)},{str(self.punkte)})"
 
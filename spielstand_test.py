@@ -119,6 +119,18 @@ class SpielstandDeSerializerTest(unittest.TestCase):
         sd = SpielstandDeSerializer()
         sd.serialize(sd.deserialize(self.spielstandDict))
 
+    def test_hash(self):
+        sd = SpielstandDeSerializer()
+        s1 = sd.deserialize(self.spielstandDict)
+        s2 = sd.deserialize(self.spielstandDict)
+        self.assertEqual(hash(s1), hash(s2))
+        self.assertEqual(hash(self.spielstand), hash(s1))
+        s2.anlageStapel[4].ziehen()
+        self.assertNotEqual(hash(s1), hash(s2))
+        s3 = sd.deserialize(self.spielstandDict)
+        s3.anlageStapel[0], s3.anlageStapel[2] = s3.anlageStapel[2], s3.anlageStapel[0]
+        self.assertNotEqual(hash(s1), hash(s3))
+
 class SpielstandTest(unittest.TestCase):
     def _gen_ablage(self, farbe: Farbe, zahl: int = len(list(KartenTyp))) -> AblageStapel:
         karten = [Karte(farbe=farbe, typ=t)
@@ -191,3 +203,4 @@ class SpielstandTest(unittest.TestCase):
 
         self.assertEqual(s1, s2)
         self.assertEqual(s2, s1)
+        self.assertEqual(hash(s1), hash(s2))
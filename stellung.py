@@ -0,0 +1,347 @@
+from __future__ import annotations
+from cards import (Karte, AblageStapel, AnlageStapel, Stapel, Farbe, ZOBRIST, ANLEGBAR_AUF,
+                   ANLEGBAR_LEER, KARTEN_PRO_FARBE, ANZAHL_KARTEN)
+from spielstand import (Spielstand, HASH_MASKE, HASH_FAKTOR_ABLAGEN, HASH_FAKTOR_ABLAGE_STAPEL,
+                        HASH_FAKTOR_ZIEH_STAPEL, HASH_FAKTOR_ANLAGEN)
+from spiel import Spiel, Zug, ZugTyp
+from random import shuffle, Random
+
+ABLAGE = Spiel.ABLAGE
+ZIEHEN = Spiel.ZIEHEN
+
+# Faktoren der Stapel in der Reihenfolge von `Stellung.stapel`, siehe `spielstand_hash()`
+_FAKTOREN = HASH_FAKTOR_ANLAGEN + (HASH_FAKTOR_ABLAGE_STAPEL, HASH_FAKTOR_ZIEH_STAPEL)
+
+
+def _ablage_hashes(farbe: Farbe) -> tuple:
+    hashes = [0]
+    for tiefe in range(KARTEN_PRO_FARBE):
+        code = (farbe.value-1) * KARTEN_PRO_FARBE + tiefe
+        hashes.append(hashes[-1] ^ ZOBRIST[tiefe][code*2+1])
+    return tuple(hashes)
+
+
+# ABLAGE_HASH[Farbe.value-1][hoehe] ist der Zobrist Hash einer Ablage mit `hoehe` Karten
+ABLAGE_HASH = tuple(_ablage_hashes(f) for f in Farbe)
+
+
+def _stapel_hash(karten: tuple) -> int:
+    h = 0
+    for tiefe, c in enumerate(karten):
+        h ^= ZOBRIST[tiefe][c]
+    return h
+
+
+class Stellung(object):
+    """
+    Eine unveränderliche Spielstellung für Suche und Simulation.
+
+    Die Karten werden als `int` mit dem Wert `code*2+aufgedeckt` gespeichert. `stapel` ist ein
+    Tupel aus 9 Tupeln mit den Indizes von `Spiel.von_stapel()`: 0-6 die Anlagestapel,
+    `Spiel.ABLAGE` der Ablagestapel und `Spiel.ZIEHEN` der Ziehstapel. Die Ablagen sind durch
+    ihre Höhe je Farbe festgelegt. Ein Zug erzeugt eine neue Stellung, die alle nicht
+    veränderten Stapel mit ihrer Elternstellung teilt. Der Zobrist Hash ist derselbe wie der
+    von `Spiel.zobrist()` und wird je Zug nachgeführt.
+    `zufall` ist der Zustand des Zufallsgenerators des Spiels, so dass `umdrehen()` genauso
+    mischt wie `Spiel.umdrehen()`. Er gehört nicht zum Hash. `verdeckt` ist die Anzahl der
+    verdeckten Karten auf den Anlagestapeln und wird wie der Hash je Zug nachgeführt.
+    Die Stellung darf nach dem Erzeugen nicht verändert werden.
+    """
+    __slots__ = ("stapel", "hashes", "ablagen", "punkte", "zufall", "verdeckt", "_zobrist")
+
+    def __init__(self, stapel: tuple, ablagen: tuple, punkte: int = 0, zufall: tuple = None) -> None:
+        """
+        Erstellt eine Stellung.
+
+        stapel - `tuple[tuple[int]]` die 7 Anlagestapel, der Ablagestapel und der Ziehstapel
+        ablagen - `tuple[int]` die Anzahl der abgelegten Karten je Farbe (Index Farbe.value-1)
+        punkte - `int` die Punkte
+                 Default: 0
+        zufall - `tuple` der Zustand (`Random.getstate()`) mit dem gemischt wird oder `None`
+                 für den globalen Zufallsgenerator
+                 Default: None
+        """
+        self.stapel = stapel
+        self.hashes = tuple(_stapel_hash(s) for s in stapel)
+        self.ablagen = ablagen
+        self.punkte = punkte
+        self.zufall = zufall
+        self.verdeckt = sum([1 for s in stapel[:ABLAGE] for c in s if not c & 1])
+        z = 0
+        for f, hoehe in enumerate(ablagen):
+            z ^= (ABLAGE_HASH[f][hoehe] * HASH_FAKTOR_ABLAGEN) & HASH_MASKE
+        for idx, h in enumerate(self.hashes):
+            z ^= (h * _FAKTOREN[idx]) & HASH_MASKE
+        self._zobrist = z
+
+    @classmethod
+    def aus_spiel(cls, spiel: Spiel) -> Stellung:
+        """
+        Erzeugt die Stellung eines `Spiel` oder `Spielstand`.
+
+        spiel - `Spiel` das Spiel dessen Stellung übernommen wird
+        """
+        def codes(s: Stapel) -> tuple:
+            return tuple(k.code*2+k.visible for k in s.karten)
+        stapel = tuple(codes(s) for s in spiel.anlageStapel) + \
+            (codes(spiel.ablageStapel), codes(spiel.ziehStapel))
+        ablagen = [0] * len(Farbe)
+        for a in spiel.ablagen:
+            ablagen[a.farbe.value-1] = a.karten_anzahl()
+        zufall = getattr(spiel, "zufall", None)
+        return cls(stapel, tuple(ablagen), spiel.punkte,
+                   zufall.getstate() if zufall is not None else None)
+
+    def spielstand(self) -> Spielstand:
+        """
+        Gibt die Stellung als `Spielstand` zurück.
+        """
+        def stapel(idx: int) -> list[Karte]:
+            return [Karte.aus_code(c >> 1, c & 1 == 1) for c in self.stapel[idx]]
+        ablagen = [AblageStapel(f, [Karte.aus_code((f.value-1) * KARTEN_PRO_FARBE + i, True)
+                                    for i in range(self.ablagen[f.value-1])])
+                   for f in Spiel.ABLAGEN_FARBEN]
+        return Spielstand(anlageStapel=[AnlageStapel(stapel(i)) for i in range(Spiel.ANZAHL_ANLAGEN)],
+                          ziehStapel=Stapel(stapel(ZIEHEN)),
+                          ablageStapel=Stapel(stapel(ABLAGE)),
+                          ablagen=ablagen,
+                          punkte=self.punkte)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) == Stellung:
+            return (self._zobrist == other._zobrist and self.stapel == other.stapel and
+                    self.ablagen == other.ablagen and self.punkte == other.punkte)
+        return False
+
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return self._zobrist
+
+    def __repr__(self) -> str:
+        return f"Stellung({repr(self.stapel)},{repr(self.ablagen)},{repr(self.punkte)})"
+
+    def zobrist(self) -> int:
+        """
+        Gibt den 64 bit Zobrist Hash der Stellung zurück.
+        """
+        return self._zobrist
+
+    def gewonnen(self) -> bool:
+        """
+        Gibt `True` zurück wenn alle Karten abgelegt sind ansonsten `False`.
+        """
+        return sum(self.ablagen) == ANZAHL_KARTEN
+
+    def _kind(self, von: int, anzahl: int, zu: int, punkte: int) -> Stellung:
+        """
+        Erzeugt die Stellung in der die obersten `anzahl` Karten vom Stapel `von` auf den
+        Stapel `zu` gelegt wurden. Ist `zu` `None` wird die Karte abgelegt. Karten die auf
+        den Ablagestapel kommen werden aufgedeckt, ein Anlagestapel deckt seine neue oberste
+        Karte auf. Nur die beiden veränderten Stapel werden neu erzeugt.
+        """
+        stapel = list(self.stapel)
+        hashes = list(self.hashes)
+        z = self._zobrist
+        quelle = stapel[von]
+        n = len(quelle) - anzahl
+        h = hashes[von]
+        for tiefe in range(n, len(quelle)):
+            h ^= ZOBRIST[tiefe][quelle[tiefe]]
+        karten = quelle[n:]
+        rest = quelle[:n]
+        verdeckt = self.verdeckt
+        if von < ABLAGE and n > 0 and not rest[-1] & 1:
+            h ^= ZOBRIST[n-1][rest[-1]] ^ ZOBRIST[n-1][rest[-1] | 1]
+            rest = rest[:-1] + (rest[-1] | 1,)
+            verdeckt -= 1
+        z ^= ((hashes[von] * _FAKTOREN[von]) ^ (h * _FAKTOREN[von])) & HASH_MASKE
+        stapel[von] = rest
+        hashes[von] = h
+
+        ablagen = self.ablagen
+        if zu is None:
+            farbe, hoehe = divmod(karten[0] >> 1, KARTEN_PRO_FARBE)
+            z ^= ((ABLAGE_HASH[farbe][hoehe] * HASH_FAKTOR_ABLAGEN) ^
+                  (ABLAGE_HASH[farbe][hoehe+1] * HASH_FAKTOR_ABLAGEN)) & HASH_MASKE
+            ablagen = ablagen[:farbe] + (hoehe+1,) + ablagen[farbe+1:]
+        else:
+            if zu == ABLAGE:
+                karten = tuple(c | 1 for c in karten)
+            ziel = stapel[zu]
+            h = hashes[zu]
+            for tiefe, c in enumerate(karten, len(ziel)):
+                h ^= ZOBRIST[tiefe][c]
+            z ^= ((hashes[zu] * _FAKTOREN[zu]) ^ (h * _FAKTOREN[zu])) & HASH_MASKE
+            stapel[zu] = ziel + karten
+            hashes[zu] = h
+
+        kind = Stellung.__new__(Stellung)
+        kind.stapel = tuple(stapel)
+        kind.hashes = tuple(hashes)
+        kind.ablagen = ablagen
+        kind.punkte = self.punkte + punkte
+        kind.zufall = self.zufall
+        kind.verdeckt = verdeckt
+        kind._zobrist = z
+        return kind
+
+    def ablegbar(self, c: int) -> bool:
+        """
+        Gibt `True` zurück wenn die Karte `c` (`code*2+aufgedeckt`) abgelegt werden kann.
+        """
+        farbe, hoehe = divmod(c >> 1, KARTEN_PRO_FARBE)
+        return self.ablagen[farbe] == hoehe
+
+    def anlegbar(self, zu: int, c: int) -> bool:
+        """
+        Gibt `True` zurück wenn die Karte `c` (`code*2+aufgedeckt`) an den Anlagestapel `zu`
+        angelegt werden kann, siehe `AnlageStapel.anlegbar()`.
+        """
+        ziel = self.stapel[zu]
+        if len(ziel) == 0:
+            return ANLEGBAR_LEER >> (c >> 1) & 1 == 1
+        return ANLEGBAR_AUF[ziel[-1] >> 1] >> (c >> 1) & 1 == 1
+
+    def verschiebbar(self, von: int, zu: int) -> int:
+        """
+        Gibt die Anzahl der Karten zurück die wie bei `AnlageStapel.verschieben_nach()` vom
+        Stapel `von` zum Stapel `zu` verschoben werden, 0 wenn keine Karte anlegbar ist.
+        """
+        quelle = self.stapel[von]
+        for idx, c in enumerate(quelle):
+            if c & 1 and self.anlegbar(zu, c):
+                return len(quelle) - idx
+        return 0
+
+    def ziehen(self) -> Stellung:
+        """
+        Gibt die Stellung nach dem Ziehen einer Karte zurück oder `None` wenn der Ziehstapel
+        leer ist.
+        """
+        if len(self.stapel[ZIEHEN]) == 0:
+            return None
+        return self._kind(ZIEHEN, 1, ABLAGE, 0)
+
+    def anlegen(self, zu: int) -> Stellung:
+        """
+        Gibt die Stellung nach dem Anlegen der obersten Karte des Ablagestapels an den
+        Anlagestapel `zu` zurück oder `None` wenn der Zug nicht erlaubt ist.
+
+        zu - `int` der Index des Anlagestapels
+        """
+        ablage = self.stapel[ABLAGE]
+        if len(ablage) == 0 or not self.anlegbar(zu, ablage[-1]):
+            return None
+        return self._kind(ABLAGE, 1, zu, 2)
+
+    def ablegen(self, von: int) -> Stellung:
+        """
+        Gibt die Stellung nach dem Ablegen der obersten Karte des Stapels `von` zurück
+        oder `None` wenn der Zug nicht erlaubt ist.
+
+        von - `int` der Index des Anlagestapels oder `Spiel.ABLAGE`
+        """
+        quelle = self.stapel[von]
+        if len(quelle) == 0 or not self.ablegbar(quelle[-1]):
+            return None
+        return self._kind(von, 1, None, 10)
+
+    def verschieben(self, von: int, zu: int) -> Stellung:
+        """
+        Gibt die Stellung nach dem Verschieben vom Anlagestapel `von` zum Anlagestapel `zu`
+        zurück oder `None` wenn der Zug nicht erlaubt ist.
+
+        von - `int` der Index des Anlagestapels von dem verschoben wird
+        zu - `int` der Index des Anlagestapels zu dem verschoben wird
+        """
+        anzahl = self.verschiebbar(von, zu) if von != zu else 0
+        if anzahl == 0:
+            return None
+        return self._kind(von, anzahl, zu, 0)
+
+    def umdrehen(self) -> Stellung:
+        """
+        Gibt die Stellung zurück in der die Karten des Ablagestapels verdeckt und gemischt
+        auf dem Ziehstapel liegen oder `None` wenn der Ziehstapel nicht leer ist.
+        """
+        if len(self.stapel[ZIEHEN]) > 0:
+            return None
+        zieh = [c & ~1 for c in reversed(self.stapel[ABLAGE])]
+        zustand = self.zufall
+        if zustand is None:
+            shuffle(zieh)
+        else:
+            zufall = Random(0)
+            zufall.setstate(zustand)
+            zufall.shuffle(zieh)
+            zustand = zufall.getstate()
+        zieh = tuple(zieh)
+        stapel = self.stapel[:ABLAGE] + ((), zieh)
+        kind = Stellung.__new__(Stellung)
+        kind.stapel = stapel
+        kind.hashes = self.hashes[:ABLAGE] + (0, _stapel_hash(zieh))
+        kind.ablagen = self.ablagen
+        kind.punkte = self.punkte - 20
+        kind.zufall = zustand
+        kind.verdeckt = self.verdeckt
+        z = self._zobrist
+        for idx in (ABLAGE, ZIEHEN):
+            z ^= ((self.hashes[idx] * _FAKTOREN[idx]) ^ (kind.hashes[idx] * _FAKTOREN[idx])) & HASH_MASKE
+        kind._zobrist = z
+        return kind
+
+    def ausfuehren(self, zug: Zug) -> Stellung:
+        """
+        Gibt die Stellung nach dem Zug `zug` zurück oder `None` wenn der Zug nicht erlaubt ist.
+
+        zug - `Zug` der auszuführende Zug
+        """
+        if zug.typ == ZugTyp.ZIEHEN:
+            return self.ziehen()
+        elif zug.typ == ZugTyp.ANLEGEN:
+            return self.anlegen(zug.zu)
+        elif zug.typ == ZugTyp.ABLEGEN:
+            return self.ablegen(zug.von)
+        elif zug.typ == ZugTyp.VERSCHIEBEN:
+            return self.verschieben(zug.von, zug.zu)
+        elif zug.typ == ZugTyp.UMDREHEN:
+            return self.umdrehen()
+        return None
+
+    def zuege(self) -> list[Zug]:
+        """
+        Gibt alle erlaubten Züge als `list[Zug]` in der Reihenfolge von `Spiel.zuege()` zurück.
+        """
+        zuege = []
+        ablage = self.stapel[ABLAGE]
+        if len(self.stapel[ZIEHEN]) > 0:
+            zuege.append(Zug(ZugTyp.ZIEHEN))
+        elif len(ablage) > 0:
+            zuege.append(Zug(ZugTyp.UMDREHEN))
+
+        if len(ablage) > 0:
+            if self.ablegbar(ablage[-1]):
+                zuege.append(Zug(ZugTyp.ABLEGEN, von=ABLAGE))
+            for idx in range(Spiel.ANZAHL_ANLAGEN):
+                if self.anlegbar(idx, ablage[-1]):
+                    zuege.append(Zug(ZugTyp.ANLEGEN, zu=idx))
+
+        # Bitmasken der Karten die jeder Anlagestapel annimmt, siehe `anlegbar()`
+        annehmen = [ANLEGBAR_AUF[s[-1] >> 1] if s else ANLEGBAR_LEER
+                    for s in self.stapel[:Spiel.ANZAHL_ANLAGEN]]
+        for von in range(Spiel.ANZAHL_ANLAGEN):
+            quelle = self.stapel[von]
+            if len(quelle) == 0:
+                continue
+            if self.ablegbar(quelle[-1]):
+                zuege.append(Zug(ZugTyp.ABLEGEN, von=von))
+            offen = 0
+            for c in quelle:
+                if c & 1:
+                    offen |= 1 << (c >> 1)
+            for zu in range(Spiel.ANZAHL_ANLAGEN):
+                if zu != von and annehmen[zu] & offen:
+                    zuege.append(Zug(ZugTyp.VERSCHIEBEN, von=von, zu=zu))
+        return zuege
@@ -0,0 +1,78 @@
+import unittest
+from stellung import Stellung
+from spiel import Spiel, Zug, ZugTyp
+
+
+class StellungTest(unittest.TestCase):
+
+    def test_aus_spiel(self):
+        s = Spiel()
+        st = Stellung.aus_spiel(s)
+        self.assertEqual(s.zobrist(), st.zobrist())
+        self.assertEqual(s.spielstand(), st.spielstand())
+        self.assertEqual(st, Stellung.aus_spiel(st.spielstand()))
+
+    def test_wie_spiel(self):
+        s = Spiel()
+        st = Stellung.aus_spiel(s)
+        for runde in range(200):
+            zuege = [z for z in s.zuege() if z.typ != ZugTyp.UMDREHEN]
+            with self.subTest(runde=runde):
+                self.assertEqual(zuege, [z for z in st.zuege() if z.typ != ZugTyp.UMDREHEN])
+            if len(zuege) == 0:
+                break
+            zug = zuege[(runde * 5) % len(zuege)]
+            s.ausfuehren(zug)
+            st = st.ausfuehren(zug)
+            with self.subTest(runde=runde, zug=str(zug)):
+                self.assertEqual(s.spielstand(), st.spielstand())
+                self.assertEqual(s.zobrist(), st.zobrist())
+                self.assertEqual(s.verdeckt(), st.verdeckt)
+
+    def test_unveraendert(self):
+        st = Stellung.aus_spiel(Spiel())
+        kopie = Stellung.aus_spiel(st.spielstand())
+        for zug in st.zuege():
+            kind = st.ausfuehren(zug)
+            self.assertNotEqual(st, kind)
+            self.assertEqual(kopie, st)
+
+    def test_geteilte_stapel(self):
+        st = Stellung.aus_spiel(Spiel())
+        kind = st.ziehen()
+        for idx in range(Spiel.ANZAHL_ANLAGEN):
+            self.assertIs(st.stapel[idx], kind.stapel[idx])
+        self.assertIs(st.ablagen, kind.ablagen)
+
+    def test_umdrehen(self):
+        st = Stellung.aus_spiel(Spiel())
+        self.assertIsNone(st.umdrehen())
+        while st.ziehen():
+            st = st.ziehen()
+        kind = st.umdrehen()
+        self.assertEqual(len(st.stapel[Spiel.ABLAGE]), len(kind.stapel[Spiel.ZIEHEN]))
+        self.assertEqual(-20, kind.punkte)
+        self.assertEqual(Stellung.aus_spiel(kind.spielstand()).zobrist(), kind.zobrist())
+
+    def test_umdrehen_wie_spiel(self):
+        s = Spiel(nummer=3)
+        while s.ziehen():
+            pass
+        st = Stellung.aus_spiel(s)
+        for i in range(3):
+            s.umdrehen()
+            st = st.umdrehen()
+            self.assertEqual(s.spielstand(), st.spielstand())
+            while s.ziehen():
+                st = st.ziehen()
+
+    def test_ungueltige_zuege(self):
+        st = Stellung.aus_spiel(Spiel())
+        self.assertIsNone(st.anlegen(0))
+        self.assertIsNone(st.ablegen(Spiel.ABLAGE))
+        self.assertIsNone(st.verschieben(0, 0))
+        self.assertIsNone(st.ausfuehren(Zug(ZugTyp.UMDREHEN)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from time import sleep, perf_counter
+import os
+import sys
+
+try:
+    import termios
+    import tty
+    from select import select
+except ImportError:
+    termios = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+class Tastatur(object):
+    """
+    Liest einzelne Tasten ohne dass der Spieler Enter drücken muss.
+
+    Auf Unix wird das Terminal solange die Tastatur mit `with` geöffnet ist in den cbreak
+    Modus geschaltet, unter Windows wird `msvcrt` verwendet. Ist die Eingabe kein Terminal,
+    z.B. in Tests oder wenn die Eingabe umgeleitet ist, wird keine Taste erkannt.
+    """
+
+    # Pause in Sekunden zwischen zwei Abfragen unter Windows
+    ABFRAGE_PAUSE = 0.01
+
+    def __init__(self, eingabe=None) -> None:
+        """
+        Erstellt eine Tastatur.
+
+        eingabe - die Datei von der gelesen wird oder `None` für `sys.stdin`
+                  Default: None
+        """
+        self.eingabe = eingabe if eingabe is not None else sys.stdin
+        self._einstellungen = None
+
+    def interaktiv(self) -> bool:
+        """
+        Gibt `True` zurück wenn einzelne Tasten gelesen werden können ansonsten `False`.
+        """
+        try:
+            terminal = self.eingabe.isatty()
+        except (AttributeError, ValueError):
+            return False
+        return terminal and (termios is not None or msvcrt is not None)
+
+    def __enter__(self):
+        if termios is not None and self.interaktiv():
+            fd = self.eingabe.fileno()
+            self._einstellungen = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+        return self
+
+    def __exit__(self, *args):
+        if self._einstellungen is not None:
+            termios.tcsetattr(self.eingabe.fileno(), termios.TCSADRAIN, self._einstellungen)
+            self._einstellungen = None
+
+    def warten(self, sekunden: float) -> str:
+        """
+        Wartet höchstens `sekunden` auf einen Tastendruck und gibt die Taste zurück oder
+        `None` wenn keine Taste gedrückt wurde. Auf Unix werden alle bereits vorliegenden
+        Zeichen zurückgegeben, z.B. die ganze Folge einer Pfeiltaste. Ohne Terminal wird nur
+        gewartet.
+
+        sekunden - `float` die maximale Wartezeit oder `None` um bis zum nächsten Tastendruck zu warten
+        """
+        if not self.interaktiv():
+            if sekunden is None:
+                raise ValueError("Ohne Terminal kann nicht auf eine Taste gewartet werden")
+            sleep(max(0.0, sekunden))
+            return None
+        if termios is not None:
+            if select([self.eingabe], [], [], None if sekunden is None else max(0.0, sekunden))[0]:
+                return os.read(self.eingabe.fileno(), 16).decode(errors="replace")
+            return None
+        ende = None if sekunden is None else perf_counter() + sekunden
+        while not msvcrt.kbhit():
+            if ende is not None and perf_counter() >= ende:
+                return None
+            sleep(Tastatur.ABFRAGE_PAUSE)
+        return msvcrt.getwch()
@@ -0,0 +1,20 @@
+import unittest
+import io
+from time import perf_counter
+from tastatur import Tastatur
+
+
+class TastaturTest(unittest.TestCase):
+
+    def test_ohne_terminal(self):
+        tastatur = Tastatur(io.StringIO("abc"))
+        self.assertFalse(tastatur.interaktiv())
+        start = perf_counter()
+        with tastatur:
+            self.assertIsNone(tastatur.warten(0.02))
+        self.assertGreaterEqual(perf_counter() - start, 0.02)
+        self.assertRaises(ValueError, tastatur.warten, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+from loeser import Loeser, Ergebnis
+from stellung import Stellung
+from spiel import Spiel, Zug, ZugTyp
+from time import perf_counter
+from threading import Thread, Event
+import logging
+
+LOG = logging.getLogger("solitair")
+
+
+class _Zeitende(Exception):
+    pass
+
+
+class Tipp(object):
+    def __init__(self, zuege: list[Zug], wert: int, knoten: int, tiefe: int, sekunden: float) -> None:
+        """
+        Das Ergebnis des `TippGeber`.
+
+        zuege - `list[Zug]` die beste gefundene Zugfolge, leer wenn es keinen Zug gibt
+        wert - `int` die Bewertung der Stellung am Ende der Zugfolge
+        knoten - `int` die Anzahl der untersuchten Stellungen
+        tiefe - `int` die Tiefe der letzten vollständigen Suche
+        sekunden - `float` die Dauer der Suche
+        """
+        self.zuege = zuege
+        self.wert = wert
+        self.knoten = knoten
+        self.tiefe = tiefe
+        self.sekunden = sekunden
+
+    def __repr__(self) -> str:
+        return f"Tipp({' '.join([str(z) for z in self.zuege])},{self.wert},{self.knoten} Knoten,Tiefe {self.tiefe})"
+
+    def zug(self) -> Zug:
+        """
+        Gibt den empfohlenen Zug zurück oder `None` wenn es keinen Zug gibt.
+        """
+        return self.zuege[0] if self.zuege else None
+
+
+class TippGeber(object):
+    """
+    Sucht den besten nächsten Zug innerhalb einer festen Zeit.
+
+    Die Suche vertieft iterativ: erst werden alle Zugfolgen der Länge 1 bewertet, dann der
+    Länge 2 usw. bis die Zeit abgelaufen ist. Das Ergebnis ist die beste Zugfolge der letzten
+    vollständigen Suche, so dass jederzeit ein Tipp vorliegt. Die Züge werden wie beim
+    `Loeser` sortiert und beschnitten. Ist das Spiel im `LoesungsSpeicher` als gewonnen
+    vermerkt, wird die gespeicherte Lösung ohne Suche verwendet.
+
+    Mit `nachdenken()` wird die Suche ohne Zeitbegrenzung in einem Hintergrund-Thread
+    gestartet, z.B. während der Spieler überlegt. Die Transpositionstabelle bleibt nach
+    `anhalten()` erhalten, so dass ein folgender Tipp auf die Ergebnisse zurückgreift.
+    Das Event `gedacht` wird gesetzt sobald die erste Tiefe vollständig durchsucht ist.
+    """
+
+    # Bewertung einer gewonnenen Stellung
+    GEWONNEN = 1000000
+    # maximale Suchtiefe, begrenzt die Rekursion
+    MAX_TIEFE = 200
+    # maximale Größe der Transpositionstabelle, ist sie voll wird sie vor der nächsten Suche geleert
+    MAX_TABELLE = 200000
+
+    def __init__(self, max_sekunden: float = 0.2, speicher=None, uhr=perf_counter) -> None:
+        """
+        Erstellt einen TippGeber.
+
+        max_sekunden - `float` die maximale Dauer der Suche
+                       Default: 0.2
+        speicher - `LoesungsSpeicher` mit bekannten Lösungen oder `None`
+                   Default: None
+        uhr - Funktion die die aktuelle Zeit in Sekunden zurückgibt
+              Default: perf_counter
+        """
+        self.max_sekunden = max_sekunden
+        self.speicher = speicher
+        self.uhr = uhr
+        # wird gesetzt sobald eine Tiefe vollständig durchsucht ist
+        self.gedacht = Event()
+        self.tabelle = {}
+        self._loeser = Loeser()
+        self._knoten = 0
+        self._ende = 0.0
+        self._stopp = Event()
+        self._denker = None
+
+    @staticmethod
+    def bewertung(stellung: Stellung) -> int:
+        """
+        Bewertet die Stellung: abgelegte Karten zählen positiv, verdeckte Karten auf den
+        Anlagestapeln negativ.
+        """
+        if stellung.gewonnen():
+            return TippGeber.GEWONNEN
+        return 100 * sum(stellung.ablagen) - 50 * stellung.verdeckt
+
+    def _suchen(self, stellung: Stellung, tiefe: int) -> tuple[int, list[Zug]]:
+        """
+        Gibt die beste Bewertung und Zugfolge mit höchstens `tiefe` Zügen zurück. Jeder Zug
+        kostet einen Punkt, so dass kürzere Zugfolgen bevorzugt werden.
+        Die Einträge der Transpositionstabelle sind `(tiefe, wert, linie, abgeschnitten)`,
+        `abgeschnitten` ist `True` wenn die Suche unterhalb der Stellung durch die Tiefe
+        begrenzt wurde.
+        """
+        self._knoten += 1
+        if self._stopp.is_set() or self.uhr() > self._ende:
+            raise _Zeitende()
+        if stellung.gewonnen():
+            return TippGeber.bewertung(stellung), []
+        if tiefe == 0:
+            self._abgeschnitten = True
+            return TippGeber.bewertung(stellung), []
+        bekannt = self.tabelle.get(stellung.zobrist())
+        if bekannt is not None and bekannt[0] >= tiefe:
+            self._abgeschnitten |= bekannt[3]
+            return bekannt[1], bekannt[2]
+        kinder = self._loeser.kinder(stellung)
+        if not kinder:
+            return TippGeber.bewertung(stellung), []
+        abgeschnitten, self._abgeschnitten = self._abgeschnitten, False
+        wert, linie = None, []
+        for zug, kind in kinder:
+            w, l = self._suchen(kind, tiefe-1)
+            if wert is None or w - 1 > wert:
+                wert, linie = w - 1, [zug] + l
+        if len(self.tabelle) < TippGeber.MAX_TABELLE:
+            # auch beim Nachdenken ohne Zeitbegrenzung wächst die Tabelle nicht weiter
+            self.tabelle[stellung.zobrist()] = (tiefe, wert, linie, self._abgeschnitten)
+        self._abgeschnitten |= abgeschnitten
+        return wert, linie
+
+    def _vertiefen(self, stellung: Stellung) -> Tipp:
+        """
+        Vertieft die Suche bis ein Sieg gefunden wurde, die Suche vollständig ist oder die
+        Zeit abgelaufen ist und gibt das Ergebnis der letzten vollständigen Tiefe zurück.
+        """
+        if len(self.tabelle) >= TippGeber.MAX_TABELLE:
+            self.tabelle = {}
+        bester = Tipp([], TippGeber.bewertung(stellung), 0, 0, 0.0)
+        self._abgeschnitten = True
+        try:
+            while (self._abgeschnitten and bester.wert < TippGeber.GEWONNEN // 2 and
+                   bester.tiefe < TippGeber.MAX_TIEFE):
+                self._abgeschnitten = False
+                wert, linie = self._suchen(stellung, bester.tiefe + 1)
+                bester = Tipp(linie, wert, 0, bester.tiefe + 1, 0.0)
+                self.gedacht.set()
+        except _Zeitende:
+            pass
+        return bester
+
+    def nachdenken(self, spiel: Spiel):
+        """
+        Startet die Suche für das Spiel ohne Zeitbegrenzung in einem Hintergrund-Thread.
+        Eine laufende Suche wird vorher angehalten.
+
+        spiel - `Spiel`, `Spielstand` oder `Stellung` für die ein Zug gesucht wird
+        """
+        self.anhalten()
+        stellung = spiel if isinstance(spiel, Stellung) else Stellung.aus_spiel(spiel)
+        self._ende = float("inf")
+        self.gedacht.clear()
+        self._denker = Thread(target=self._vertiefen, args=(stellung,), daemon=True)
+        self._denker.start()
+
+    def anhalten(self):
+        """
+        Hält die Suche im Hintergrund an und wartet bis sie beendet ist.
+        """
+        if self._denker is not None:
+            self._stopp.set()
+            self._denker.join()
+            self._denker = None
+            self._stopp.clear()
+
+    def tipp(self, spiel: Spiel) -> Tipp:
+        """
+        Gibt den besten gefundenen Zug für das Spiel als `Tipp` zurück.
+
+        spiel - `Spiel`, `Spielstand` oder `Stellung` für die ein Zug gesucht wird
+        """
+        self.anhalten()
+        start = self.uhr()
+        self._ende = start + self.max_sekunden
+        self._knoten = 0
+        stellung = spiel if isinstance(spiel, Stellung) else Stellung.aus_spiel(spiel)
+
+        if self.speicher is not None:
+            loesung = self.speicher.lesen(self._loeser.schluessel(stellung))
+            if loesung is not None and loesung.ergebnis == Ergebnis.GEWONNEN and loesung.zuege:
+                return Tipp(loesung.zuege, TippGeber.GEWONNEN, 0, len(loesung.zuege),
+                            self.uhr() - start)
+
+        bester = self._vertiefen(stellung)
+        if not bester.zuege and len(stellung.stapel[Spiel.ZIEHEN]) == 0 and stellung.stapel[Spiel.ABLAGE]:
+            bester.zuege = [Zug(ZugTyp.UMDREHEN)]
+        bester.knoten = self._knoten
+        bester.sekunden = self.uhr() - start
+        LOG.info("Tipp: %s in %.3fs", bester, bester.sekunden)
+        return bester
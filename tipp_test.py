@@ -0,0 +1,88 @@
+import unittest
+from itertools import count
+from time import perf_counter
+from tipp import TippGeber
+from loeser import Loeser, Loesung, Ergebnis
+from loesungsspeicher import LoesungsSpeicher
+from stellung import Stellung
+from spiel import Spiel, Zug, ZugTyp
+from cards import KARTEN_PRO_FARBE
+
+
+class TippGeberTest(unittest.TestCase):
+
+    def test_ablegen(self):
+        pik_koenig = 3 * KARTEN_PRO_FARBE + 12
+        stapel = ((pik_koenig*2+1,),) + ((),) * (Spiel.ANZAHL_ANLAGEN-1) + ((), ())
+        tipp = TippGeber().tipp(Stellung(stapel, (13, 13, 13, 12)))
+        self.assertEqual("b1", str(tipp.zug()))
+        self.assertEqual(TippGeber.GEWONNEN - 1, tipp.wert)
+
+    def test_kein_zug(self):
+        pik_koenig = 3 * KARTEN_PRO_FARBE + 12
+        stapel = ((pik_koenig*2+1,),) + ((),) * (Spiel.ANZAHL_ANLAGEN-1) + ((), ())
+        tipp = TippGeber().tipp(Stellung(stapel, (13, 13, 13, 11)))
+        self.assertIsNone(tipp.zug())
+
+    def test_zeit(self):
+        spiel = Spiel(nummer=5)
+        tipp = TippGeber(max_sekunden=0.05).tipp(spiel)
+        self.assertIn(tipp.zug(), spiel.zuege())
+        self.assertGreater(tipp.knoten, 0)
+        self.assertGreater(tipp.tiefe, 0)
+        self.assertLess(tipp.sekunden, 5.0)
+
+    def test_uhr(self):
+        # jede Abfrage der Uhr dauert eine Millisekunde
+        ticks = count()
+        spiel = Spiel(nummer=5)
+        start = perf_counter()
+        tipp = TippGeber(max_sekunden=0.5, uhr=lambda: next(ticks) / 1000).tipp(spiel)
+        self.assertLess(perf_counter() - start, 5.0)
+        self.assertIn(tipp.zug(), spiel.zuege())
+        self.assertGreater(tipp.tiefe, 0)
+        # die Uhr hat die Suche beendet, nicht das Ende der Suche
+        self.assertAlmostEqual(500, tipp.knoten, delta=50)
+        self.assertGreaterEqual(tipp.sekunden, 0.5)
+
+    def test_max_tabelle(self):
+        ticks = count()
+        spiel = Spiel(nummer=5)
+        groesse = TippGeber.MAX_TABELLE
+        TippGeber.MAX_TABELLE = 50
+        try:
+            tg = TippGeber(max_sekunden=5.0, uhr=lambda: next(ticks) / 1000)
+            tipp = tg.tipp(spiel)
+            self.assertGreater(tipp.knoten, 1000)
+            self.assertEqual(50, len(tg.tabelle))
+            tg.tipp(spiel)
+            self.assertLessEqual(len(tg.tabelle), 50)
+        finally:
+            TippGeber.MAX_TABELLE = groesse
+
+    def test_nachdenken(self):
+        spiel = Spiel(nummer=5)
+        tg = TippGeber(max_sekunden=0.05)
+        tg.nachdenken(spiel)
+        self.assertTrue(tg.gedacht.wait(10))
+        tg.anhalten()
+        self.assertGreater(len(tg.tabelle), 0)
+        vorgedacht = max([e[0] for e in tg.tabelle.values()])
+        tipp = tg.tipp(spiel)
+        self.assertGreaterEqual(tipp.tiefe, vorgedacht)
+        self.assertIn(tipp.zug(), spiel.zuege())
+
+    def test_speicher(self):
+        spiel = Spiel(nummer=5)
+        with LoesungsSpeicher(":memory:") as speicher:
+            loeser = Loeser()
+            zuege = [Zug(ZugTyp.ZIEHEN)]
+            speicher.schreiben(loeser.schluessel(Stellung.aus_spiel(spiel)),
+                               Loesung(Ergebnis.GEWONNEN, zuege, 1, 0.1))
+            tipp = TippGeber(speicher=speicher).tipp(spiel)
+        self.assertEqual(zuege, tipp.zuege)
+        self.assertEqual(0, tipp.knoten)
+
+
+if __name__ == "__main__":
+    unittest.main()